@@ -0,0 +1,239 @@
+# backend/core/cache.py
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+from backend.core.config import CACHE_ENABLED, CACHE_DIR, CACHE_MAX_MB, CACHE_REMOTE, UPLOAD_CHUNK_SIZE
+from backend.core.executor import run_conversion
+from backend.core.jobs import OPERATION_VERSIONS, render_filename, run_operation_template
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+def cache_key(operation: str, input_hashes: list[str], params: dict | None = None) -> str:
+    """
+    Content address of a conversion: inputs, operation, normalized params and
+    the operation's version.
+    """
+    material = json.dumps(
+        {
+            "operation": operation,
+            "version": OPERATION_VERSIONS.get(operation, "1"),
+            "inputs": input_hashes,
+            "params": params or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str | Path) -> str:
+    """
+    SHA-256 of a file already on disk, read in chunks.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path):
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+class ResultCache:
+    """
+    Conversion outputs on local disk, one directory per key, evicted
+    least-recently-used once the total size exceeds `max_bytes`.
+    Entries can optionally be mirrored to the job object store.
+    """
+
+    def __init__(self, root: str, max_bytes: int, remote=None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.remote = remote
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _entries(self):
+        for meta in self.root.glob(f"*/*/{META_FILE}"):
+            entry = meta.parent
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                yield meta.stat().st_mtime, entry, size
+            except FileNotFoundError:
+                continue
+
+    def _pull(self, key: str, entry: Path) -> bool:
+        """
+        Fetch an entry from the remote store into the local cache.
+        """
+        tmp = entry.with_name(f"{entry.name}.{uuid.uuid4().hex}.tmp")
+        tmp.mkdir(parents=True)
+        try:
+            self.remote.get(f"cache/{key}/{META_FILE}", str(tmp / META_FILE))
+            info = json.loads((tmp / META_FILE).read_text())
+            self.remote.get(f"cache/{key}/{info['file']}", str(tmp / info["file"]))
+            os.replace(tmp, entry)
+            return True
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+
+    def get(self, key: str, dest_dir: str) -> tuple[str, str] | None:
+        """
+        Materialize a cached output in `dest_dir`.
+        Returns (path, filename template) or None on a miss.
+        """
+        entry = self._entry(key)
+        meta = entry / META_FILE
+        if not meta.exists() and self.remote is not None:
+            self._pull(key, entry)
+
+        try:
+            info = json.loads(meta.read_text())
+            Path(dest_dir).mkdir(parents=True, exist_ok=True)
+            dest = Path(dest_dir) / info["file"]
+            _link_or_copy(entry / info["file"], dest)
+            os.utime(meta)  # LRU touch
+        except (FileNotFoundError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return str(dest), info["filename"]
+
+    def put(self, key: str, path: str, filename: str):
+        entry = self._entry(key)
+        if entry.exists():
+            return
+
+        file_name = "output" + Path(path).suffix
+        tmp = entry.with_name(f"{entry.name}.{uuid.uuid4().hex}.tmp")
+        tmp.mkdir(parents=True)
+        try:
+            shutil.copyfile(path, tmp / file_name)
+            (tmp / META_FILE).write_text(json.dumps({"file": file_name, "filename": filename}))
+            size = sum(f.stat().st_size for f in tmp.iterdir())
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process stored the same key first, or the disk is full
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        if self.remote is not None:
+            try:
+                self.remote.put(str(entry / file_name), f"cache/{key}/{file_name}")
+                self.remote.put(str(entry / META_FILE), f"cache/{key}/{META_FILE}")
+            except Exception:
+                logger.exception("Failed to mirror cache entry %s", key)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(s for _, _, s in self._entries())
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        entries = sorted(self._entries())
+        total = sum(s for _, _, s in entries)
+        for _, entry, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": CACHE_ENABLED,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _remote_store():
+    if not CACHE_REMOTE:
+        return None
+    from backend.core.job_backends import get_store
+    return get_store()
+
+
+result_cache = ResultCache(CACHE_DIR, CACHE_MAX_MB * 1024 * 1024, remote=_remote_store())
+
+
+def run_cached_operation(
+    operation: str, inputs: list[str], out_dir: str, name: str, params: dict | None = None,
+    input_hashes: list[str] | None = None,
+) -> tuple[str, str]:
+    """
+    Synchronous cached conversion (used by the job worker).
+    Returns (output path, output filename).
+    """
+    if not CACHE_ENABLED:
+        path, template = run_operation_template(operation, inputs, out_dir, Path(name).suffix, params)
+        return path, render_filename(template, name)
+
+    key = cache_key(operation, input_hashes or [hash_file(p) for p in inputs], params)
+    hit = result_cache.get(key, out_dir)
+    if hit:
+        return hit[0], render_filename(hit[1], name)
+
+    path, template = run_operation_template(operation, inputs, out_dir, Path(name).suffix, params)
+    result_cache.put(key, path, template)
+    return path, render_filename(template, name)
+
+
+async def cached_conversion(
+    operation: str, uploads: list, out_dir: str, name: str, params: dict | None = None
+) -> tuple[str, str]:
+    """
+    Serve a conversion from the cache, or run it in the conversion pool and
+    cache the output. `uploads` are SpooledUpload objects (path + sha256).
+    Returns (output path, output filename).
+    """
+    paths = [u.path for u in uploads]
+    key = cache_key(operation, [u.sha256 for u in uploads], params) if CACHE_ENABLED else None
+
+    if key:
+        hit = await asyncio.to_thread(result_cache.get, key, out_dir)
+        if hit:
+            return hit[0], render_filename(hit[1], name)
+
+    path, template = await run_conversion(
+        operation, run_operation_template, operation, paths, out_dir, Path(name).suffix, params
+    )
+
+    if key:
+        await asyncio.to_thread(result_cache.put, key, path, template)
+    return path, render_filename(template, name)
@@ -1,6 +1,6 @@
 import os
+import tempfile
 from dotenv import load_dotenv
-import pytesseract
 
 # Load the .env file
 load_dotenv()  # loads .env from project root
@@ -8,7 +8,9 @@ load_dotenv()  # loads .env from project root
 # ---------- Tesseract / Poppler ----------
 POPPLER_PATH = os.getenv("POPPLER_PATH")
 TESSERACT_CMD = os.getenv("TESSERACT_CMD", "tesseract")
-pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+# Size of the shared OCR pool (pages OCR'd concurrently). Each tesseract run is
+# limited to one OpenMP thread (OMP_THREAD_LIMIT) so the pool does not oversubscribe.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", os.cpu_count() or 1))
 
 # ---------- AWS / S3 / SQS ----------
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
@@ -30,3 +32,110 @@ DB_PORT = int(os.getenv("DB_PORT", 5432))
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
+
+# ---------- Async jobs ----------
+# "aws" uses SQS + the jobs S3 bucket; "local" uses SQLite + the filesystem (dev/tests)
+JOB_BACKEND = os.getenv("JOB_BACKEND", "aws" if SQS_QUEUE_URL else "local")
+LOCAL_JOBS_DIR = os.getenv("LOCAL_JOBS_DIR", os.path.join(tempfile.gettempdir(), "pdfconverter-jobs"))
+# Seconds a received job stays hidden from other workers; extended while it runs
+JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", 300))
+JOB_POLL_SECONDS = int(os.getenv("JOB_POLL_SECONDS", 20))
+
+DATABASE_URL = os.getenv("DATABASE_URL") or (
+    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    if DB_HOST
+    else f"sqlite:///{os.path.join(LOCAL_JOBS_DIR, 'jobs.sqlite3')}"
+)
+
+# ---------- Uploads ----------
+# Per-endpoint upload limits (MB); uploads are spooled to disk and aborted at the limit
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", 200))
+MAX_IMAGE_UPLOAD_MB = int(os.getenv("MAX_IMAGE_UPLOAD_MB", 25))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+# ---------- Conversion workers ----------
+# Size of the process pool for CPU-bound conversions (0 = run in the thread pool instead)
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", os.cpu_count() or 1))
+# Modules imported once in the pool's forkserver so children start warm
+CONVERSION_PRELOAD = [
+    m.strip() for m in os.getenv("CONVERSION_PRELOAD", "fitz,pikepdf,pdfplumber").split(",") if m.strip()
+]
+# Per-operation concurrency caps, e.g. "pdf-to-powerpoint=1,pdf-compress=2"
+CONVERSION_LIMITS = os.getenv("CONVERSION_LIMITS", "")
+
+# ---------- Watermarks ----------
+# Rasterized watermark tiles kept per process (LRU)
+WATERMARK_TILE_CACHE_SIZE = int(os.getenv("WATERMARK_TILE_CACHE_SIZE", 64))
+
+# ---------- Startup ----------
+# Heavy modules are imported on first use. Modules listed here are imported in
+# the background right after startup, e.g. "backend.services.pdf_to_word,cv2"
+IMPORT_WARMUP = [
+    m.strip() for m in os.getenv("IMPORT_WARMUP", "").split(",") if m.strip()
+]
+
+# ---------- OCR models ----------
+# PaddleOCR / PPStructure models kept loaded per process (LRU past the budget)
+OCR_MODEL_BUDGET_MB = int(os.getenv("OCR_MODEL_BUDGET_MB", 2048))
+# Assumed footprint when a model's memory use can't be measured
+OCR_MODEL_DEFAULT_MB = int(os.getenv("OCR_MODEL_DEFAULT_MB", 512))
+# Models loaded when a conversion process starts, e.g. "paddleocr:ch,ppstructure"
+OCR_MODEL_PRELOAD = [
+    m.strip() for m in os.getenv("OCR_MODEL_PRELOAD", "").split(",") if m.strip()
+]
+
+# ---------- PDF merge ----------
+# Inputs open at once while merging; after each batch the merged pages so far are
+# written to a temporary file and reopened, so the sources can be closed
+MERGE_BATCH_SIZE = int(os.getenv("MERGE_BATCH_SIZE", 32))
+
+# ---------- PDF to Excel ----------
+# Extra processes a conversion process may use to extract one large document's pages.
+# Conversions already run in parallel in the conversion pool, so the default (0) extracts
+# in-process; when set, each conversion process keeps one pool of this size and reuses it
+EXCEL_WORKERS = int(os.getenv("EXCEL_WORKERS", 0))
+# Documents with fewer pages are extracted in-process
+EXCEL_PARALLEL_MIN_PAGES = int(os.getenv("EXCEL_PARALLEL_MIN_PAGES", 16))
+
+# ---------- Compression ----------
+# Processes one compression may use for images and Ghostscript chunks. Compressions
+# already run in the conversion pool, so the default (0) is each conversion worker's
+# share of the cores: 1 (in-process) while CONVERSION_WORKERS is the core count
+COMPRESS_WORKERS = int(os.getenv("COMPRESS_WORKERS", 0)) or max(
+    1, (os.cpu_count() or 1) // max(CONVERSION_WORKERS, 1)
+)
+# Images smaller than this (width * height) are left alone
+COMPRESS_MIN_IMAGE_PIXELS = int(os.getenv("COMPRESS_MIN_IMAGE_PIXELS", 64 * 64))
+# Images are downsampled to this resolution at their displayed size, per level
+COMPRESS_TARGET_DPI = os.getenv("COMPRESS_TARGET_DPI", "light=300,medium=150,max=96")
+# Large documents are split into page chunks and run through Ghostscript in parallel
+GS_CHUNKED = os.getenv("GS_CHUNKED", "true").lower() == "true"
+# Documents with fewer pages use a single Ghostscript pass
+GS_CHUNK_MIN_PAGES = int(os.getenv("GS_CHUNK_MIN_PAGES", 64))
+
+# ---------- PDF edit sessions ----------
+EDIT_SESSION_DIR = os.getenv("EDIT_SESSION_DIR", os.path.join(tempfile.gettempdir(), "pdfconverter-edit"))
+# Documents kept open in memory; older sessions are written to disk and reopened on use
+EDIT_SESSION_MAX_OPEN = int(os.getenv("EDIT_SESSION_MAX_OPEN", 8))
+# Idle sessions are deleted after this many seconds
+EDIT_SESSION_TTL = int(os.getenv("EDIT_SESSION_TTL", 3600))
+# How often the API process looks for idle sessions to delete
+EDIT_SESSION_SWEEP_INTERVAL = int(os.getenv("EDIT_SESSION_SWEEP_INTERVAL", 300))
+
+# ---------- Text extraction ----------
+# Pages of extracted text spans kept in memory, keyed by document hash. The limit is
+# per API process, and a dense page's spans can take 100 KB or more
+TEXT_CACHE_PAGES = int(os.getenv("TEXT_CACHE_PAGES", 300))
+
+# ---------- Search indexes ----------
+SEARCH_INDEX_DIR = os.getenv("SEARCH_INDEX_DIR", os.path.join(tempfile.gettempdir(), "pdfconverter-search"))
+# Parsed indexes kept in memory for querying
+SEARCH_INDEX_MEMORY = int(os.getenv("SEARCH_INDEX_MEMORY", 16))
+
+# ---------- Result cache ----------
+# Content-addressed cache of conversion outputs (LRU-evicted past CACHE_MAX_MB)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "pdfconverter-cache"))
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", 2048))
+# Also mirror entries to the job object store (S3 bucket or local stand-in)
+CACHE_REMOTE = os.getenv("CACHE_REMOTE", "false").lower() == "true"
@@ -0,0 +1,111 @@
+# backend/core/delivery.py
+
+import mimetypes
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+
+from backend.utils.file_utils import encode_file_to_base64
+
+DELIVERY_JSON = "json"
+DELIVERY_BINARY = "binary"
+DELIVERY_ZIP = "zip"
+
+BINARY_MEDIA_TYPE = "application/octet-stream"
+ZIP_MEDIA_TYPE = "application/zip"
+
+MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".png": "image/png",
+    ".zip": "application/zip",
+}
+
+
+def media_type_for(filename: str) -> str:
+    """
+    Content-Type for an output file, based on its extension.
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix in MEDIA_TYPES:
+        return MEDIA_TYPES[suffix]
+    return mimetypes.guess_type(filename)[0] or BINARY_MEDIA_TYPE
+
+
+def wants_binary(request: Request, delivery: str | None = None) -> bool:
+    """
+    Decide whether the client asked for raw bytes instead of JSON/base64.
+    An explicit ?delivery= flag wins; otherwise `Accept: application/octet-stream`
+    (without application/json) selects binary. JSON stays the default.
+    """
+    if delivery:
+        return delivery.lower() == DELIVERY_BINARY
+
+    accept = request.headers.get("accept", "").lower()
+    return BINARY_MEDIA_TYPE in accept and "application/json" not in accept
+
+
+def wants_archive(request: Request, delivery: str | None = None) -> bool:
+    """
+    Multi-file variant of `wants_binary`: ?delivery=zip|binary, or an Accept
+    header asking for application/zip or application/octet-stream.
+    """
+    if delivery:
+        return delivery.lower() in (DELIVERY_ZIP, DELIVERY_BINARY)
+
+    accept = request.headers.get("accept", "").lower()
+    return ZIP_MEDIA_TYPE in accept or wants_binary(request)
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _remove(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def stream_file(file_path: str, filename: str, headers: dict | None = None) -> FileResponse:
+    """
+    Stream a file to the client in chunks.
+    The file is first moved out of the request's temporary directory (which is
+    removed as soon as the handler returns) and deleted once it has been sent.
+    """
+    fd, spooled = tempfile.mkstemp(suffix=Path(filename).suffix)
+    os.close(fd)
+    shutil.move(str(file_path), spooled)
+
+    return FileResponse(
+        spooled,
+        filename=filename,
+        media_type=media_type_for(filename),
+        headers=headers,
+        background=BackgroundTask(_remove, spooled),
+    )
+
+
+def deliver_file(request: Request, delivery: str | None, file_path: str, filename: str):
+    """
+    Return an output file either as the standard JSON/base64 payload or,
+    when negotiated, as a streamed binary response.
+    """
+    if wants_binary(request, delivery):
+        return stream_file(file_path, filename)
+
+    return {
+        "success": True,
+        "filename": filename,
+        "file": encode_file_to_base64(file_path),
+    }
@@ -0,0 +1,221 @@
+# backend/core/edit_sessions.py
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from backend.core.config import EDIT_SESSION_DIR, EDIT_SESSION_MAX_OPEN, EDIT_SESSION_TTL
+
+if TYPE_CHECKING:
+    import fitz
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_NAME = "document.pdf"
+
+
+def _open_pdf(path: str) -> "fitz.Document":
+    # PyMuPDF is only loaded once a session is used, not at app import
+    import fitz
+    return fitz.open(path)
+
+
+@dataclass
+class EditSession:
+    id: str
+    workdir: str
+    filename: str
+    doc: "fitz.Document | None" = None
+    # Changes not yet written to `path`
+    dirty: bool = False
+    version: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.workdir, DOCUMENT_NAME)
+
+
+class EditSessionStore:
+    """
+    Uploaded PDFs kept parsed between edit requests.
+
+    A session's document lives in `<root>/<id>/document.pdf`. At most
+    `max_open` documents stay open in memory (LRU); the least recently used
+    ones are written back with an incremental save and closed, then reopened
+    on their next use. Idle sessions are removed after `ttl` seconds, when
+    next accessed or by the periodic expire() sweep, whichever comes first.
+
+    Sessions belong to the process that created them, so with several
+    server workers the edit routes need sticky routing (or one worker).
+    PyMuPDF is not thread-safe: the store's lock lets only one call at a time
+    touch any session document. It does not cover PyMuPDF work outside the
+    store (conversions, search indexing), which runs in the conversion pool
+    or, with CONVERSION_WORKERS=0, on other threads.
+    """
+
+    def __init__(self, root: str, max_open: int, ttl: int):
+        self.root = root
+        self.max_open = max(1, max_open)
+        self.ttl = ttl
+        self._sessions: dict[str, EditSession] = {}
+        self._open: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ---------- lifecycle ----------
+    def reserve(self) -> tuple[str, str]:
+        """
+        A new session id and the path its upload should be written to.
+        """
+        session_id = uuid.uuid4().hex
+        workdir = os.path.join(self.root, session_id)
+        os.makedirs(workdir, exist_ok=True)
+        return session_id, os.path.join(workdir, DOCUMENT_NAME)
+
+    def register(self, session_id: str, filename: str) -> dict:
+        """
+        Open the reserved upload and start the session.
+        Raises ValueError (and discards the upload) if it isn't a PDF.
+        """
+        self.expire()
+        session = EditSession(id=session_id, workdir=os.path.join(self.root, session_id), filename=filename)
+        with self._lock:
+            try:
+                doc = _open_pdf(session.path)
+                if not doc.is_pdf:
+                    doc.close()
+                    raise ValueError("Not a PDF")
+            except Exception as e:
+                shutil.rmtree(session.workdir, ignore_errors=True)
+                raise ValueError(f"Could not open PDF: {e}")
+
+            session.doc = doc
+            self._sessions[session_id] = session
+            self._touch(session)
+            return self._info(session)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._open.pop(session_id, None)
+            if session.doc is not None:
+                session.doc.close()
+        shutil.rmtree(session.workdir, ignore_errors=True)
+        return True
+
+    def expire(self):
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            idle = [s.id for s in self._sessions.values() if s.last_used < cutoff]
+        for session_id in idle:
+            logger.info("Expiring idle edit session %s", session_id)
+            self.delete(session_id)
+
+    def close_all(self):
+        for session_id in list(self._sessions):
+            self.delete(session_id)
+
+    # ---------- document access ----------
+    def read(self, session_id: str, fn, *args, **kwargs):
+        """
+        Call fn(doc, ...) on the session's document.
+        """
+        with self._lock:
+            session = self._get(session_id)
+            return fn(self._document(session), *args, **kwargs)
+
+    def edit(self, session_id: str, fn, *args, **kwargs) -> tuple[object, int]:
+        """
+        Call fn(doc, ...) to modify the document; returns (result, new version).
+        """
+        with self._lock:
+            session = self._get(session_id)
+            doc = self._document(session)
+            # Set first: a failed batch may still have changed the document
+            session.dirty = True
+            result = fn(doc, *args, **kwargs)
+            session.version += 1
+            return result, session.version
+
+    def export(self, session_id: str, out_path: str) -> str:
+        """
+        Write the current state of the document to `out_path`.
+        Returns the session's original filename.
+        """
+        with self._lock:
+            session = self._get(session_id)
+            self._flush(session)
+            shutil.copyfile(session.path, out_path)
+            return session.filename
+
+    def info(self, session_id: str) -> dict:
+        with self._lock:
+            session = self._get(session_id)
+            self._document(session)
+            return self._info(session)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._sessions), "open": len(self._open), "max_open": self.max_open}
+
+    # ---------- internals ----------
+    def _get(self, session_id: str) -> EditSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        if session.last_used < time.monotonic() - self.ttl:
+            # Idle past the TTL but not swept yet
+            logger.info("Expiring idle edit session %s", session_id)
+            self.delete(session_id)
+            raise KeyError(session_id)
+        return session
+
+    def _info(self, session: EditSession) -> dict:
+        return {
+            "session_id": session.id,
+            "filename": session.filename,
+            "page_count": session.doc.page_count,
+            "version": session.version,
+        }
+
+    def _touch(self, session: EditSession):
+        session.last_used = time.monotonic()
+        self._open[session.id] = None
+        self._open.move_to_end(session.id)
+        while len(self._open) > self.max_open:
+            evicted, _ = self._open.popitem(last=False)
+            self._spill(self._sessions[evicted])
+
+    def _document(self, session: EditSession) -> "fitz.Document":
+        if session.doc is None:
+            session.doc = _open_pdf(session.path)
+        self._touch(session)
+        return session.doc
+
+    def _flush(self, session: EditSession):
+        if not session.dirty or session.doc is None:
+            return
+        from backend.utils.pdf_utils import save_document
+
+        doc = session.doc
+        # Appends only the changed objects to the session file when it can
+        if save_document(doc, session.path, incremental=doc.can_save_incrementally(), garbage=1):
+            session.doc = _open_pdf(session.path)
+        session.dirty = False
+
+    def _spill(self, session: EditSession):
+        self._flush(session)
+        if session.doc is not None:
+            session.doc.close()
+            session.doc = None
+
+
+edit_sessions = EditSessionStore(EDIT_SESSION_DIR, EDIT_SESSION_MAX_OPEN, EDIT_SESSION_TTL)
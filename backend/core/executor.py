@@ -0,0 +1,115 @@
+# backend/core/executor.py
+
+import asyncio
+import functools
+import importlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.core.config import CONVERSION_WORKERS, CONVERSION_PRELOAD, CONVERSION_LIMITS
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _parse_limits(spec: str) -> dict[str, int]:
+    """
+    Parse "op=n,op2=m" into {"op": n, "op2": m}.
+    """
+    limits = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        op, value = part.split("=", 1)
+        try:
+            limits[op.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid conversion limit %r", part)
+    return limits
+
+
+OPERATION_LIMITS = _parse_limits(CONVERSION_LIMITS)
+
+
+def _init_child(modules: list[str]):
+    """
+    Pool initializer: import heavy libraries (already imported when forked
+    from the forkserver) and warm the configured OCR models once per child.
+    """
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    from backend.core.model_registry import preload_models
+    preload_models()
+
+
+def _mp_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Children are forked from a server that already imported these
+        ctx.set_forkserver_preload(CONVERSION_PRELOAD)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def start_pool() -> ProcessPoolExecutor | None:
+    """
+    Create the shared conversion pool (idempotent).
+    Returns None when CONVERSION_WORKERS is 0.
+    """
+    global _pool
+    if CONVERSION_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=CONVERSION_WORKERS,
+            mp_context=_mp_context(),
+            initializer=_init_child,
+            initargs=(CONVERSION_PRELOAD,),
+        )
+        logger.info("Started conversion pool with %d workers", CONVERSION_WORKERS)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _semaphore(operation: str) -> asyncio.Semaphore:
+    if operation not in _semaphores:
+        limit = OPERATION_LIMITS.get(operation, max(CONVERSION_WORKERS, 1))
+        _semaphores[operation] = asyncio.Semaphore(limit)
+    return _semaphores[operation]
+
+
+async def run_conversion(operation: str, fn, *args, **kwargs):
+    """
+    Run a (module-level, picklable) service function in the conversion pool
+    and await its result without blocking the event loop.
+    Concurrency per operation is capped by CONVERSION_LIMITS.
+    """
+    call = functools.partial(fn, *args, **kwargs)
+
+    async with _semaphore(operation):
+        pool = start_pool()
+        if pool is None:
+            return await asyncio.to_thread(call)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, call)
+        except BrokenProcessPool:
+            # A child died (e.g. OOM-killed); replace the pool for later requests
+            logger.error("Conversion pool broke while running %s; restarting it", operation)
+            shutdown_pool()
+            raise RuntimeError(f"{operation} worker crashed")
@@ -0,0 +1,164 @@
+# backend/core/job_backends.py
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from backend.core.config import JOB_BACKEND, LOCAL_JOBS_DIR
+
+
+@dataclass
+class QueueMessage:
+    body: dict
+    receipt: str
+
+
+# ----------------------
+# AWS: SQS queue + S3 object store
+# ----------------------
+class SQSJobQueue:
+    def send(self, job: dict):
+        from backend.utils.sqs_client import send_job
+        send_job(job)
+
+    def receive(self, wait_seconds: int, visibility_timeout: int) -> list[QueueMessage]:
+        from backend.utils.sqs_client import receive_jobs
+        return [
+            QueueMessage(json.loads(m["Body"]), m["ReceiptHandle"])
+            for m in receive_jobs(wait_seconds, visibility_timeout)
+        ]
+
+    def extend(self, message: QueueMessage, seconds: int):
+        from backend.utils.sqs_client import extend_visibility
+        extend_visibility(message.receipt, seconds)
+
+    def delete(self, message: QueueMessage):
+        from backend.utils.sqs_client import delete_job
+        delete_job(message.receipt)
+
+
+class S3ObjectStore:
+    def put(self, local_path: str, key: str):
+        from backend.utils.s3_utils import upload_file_to_s3
+        upload_file_to_s3(local_path, key)
+
+    def get(self, key: str, local_path: str) -> str:
+        from backend.utils.s3_utils import download_file_to
+        return download_file_to(key, local_path)
+
+
+# ----------------------
+# Local: SQLite queue + filesystem object store
+# ----------------------
+class LocalJobQueue:
+    """
+    Minimal SQS stand-in: messages become invisible while received and
+    reappear after the visibility timeout unless deleted.
+    """
+
+    def __init__(self, db_path: str | None = None):
+        self.db_path = db_path or os.path.join(LOCAL_JOBS_DIR, "queue.sqlite3")
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL, "
+                "visible_at REAL NOT NULL, receipt TEXT)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # BEGIN IMMEDIATE takes the write lock up front so two workers never claim the same row
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def send(self, job: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (body, visible_at) VALUES (?, ?)",
+                (json.dumps(job), time.time()),
+            )
+
+    def _claim(self, visibility_timeout: int) -> QueueMessage | None:
+        with self._connect() as conn:
+            now = time.time()
+            row = conn.execute(
+                "SELECT id, body FROM messages WHERE visible_at <= ? ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            receipt = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE messages SET visible_at = ?, receipt = ? WHERE id = ?",
+                (now + visibility_timeout, receipt, row[0]),
+            )
+            return QueueMessage(json.loads(row[1]), receipt)
+
+    def receive(self, wait_seconds: int, visibility_timeout: int) -> list[QueueMessage]:
+        deadline = time.time() + wait_seconds
+        while True:
+            message = self._claim(visibility_timeout)
+            if message is not None:
+                return [message]
+            if time.time() >= deadline:
+                return []
+            time.sleep(0.5)
+
+    def extend(self, message: QueueMessage, seconds: int):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE messages SET visible_at = ? WHERE receipt = ?",
+                (time.time() + seconds, message.receipt),
+            )
+
+    def delete(self, message: QueueMessage):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM messages WHERE receipt = ?", (message.receipt,))
+
+
+class LocalObjectStore:
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or os.path.join(LOCAL_JOBS_DIR, "objects"))
+
+    def put(self, local_path: str, key: str):
+        dest = self.root / key
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, dest)
+
+    def get(self, key: str, local_path: str) -> str:
+        shutil.copyfile(self.root / key, local_path)
+        return local_path
+
+
+_queue = None
+_store = None
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = SQSJobQueue() if JOB_BACKEND == "aws" else LocalJobQueue()
+    return _queue
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = S3ObjectStore() if JOB_BACKEND == "aws" else LocalObjectStore()
+    return _store
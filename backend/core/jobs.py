@@ -0,0 +1,268 @@
+# backend/core/jobs.py
+
+import asyncio
+import os
+import uuid
+import zipfile
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+
+from backend.core.job_backends import get_queue, get_store
+
+MODE_SYNC = "sync"
+MODE_ASYNC = "async"
+
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def wants_async(mode: str | None) -> bool:
+    return (mode or MODE_SYNC).lower() == MODE_ASYNC
+
+
+# ----------------------
+# Operation registry
+# ----------------------
+# Each runner takes (input paths, output dir, original filename, params) and
+# returns (output path, output filename). Runners are called with a placeholder
+# name ("{stem}.pdf") so the returned filename is a template that can be reused
+# for any upload of the same content. Services are imported lazily so the
+# worker only loads the stacks it actually runs.
+
+NAME_PLACEHOLDER = "{stem}"
+
+
+def _from_result(result: dict) -> tuple[str, str]:
+    if not result.get("success"):
+        raise RuntimeError(result.get("error") or result.get("message") or "Conversion failed")
+    return result["path"], result["filename"]
+
+
+def _zip_outputs(paths: list[str], out_path: str) -> str:
+    with zipfile.ZipFile(out_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for p in paths:
+            zf.write(p, arcname=Path(p).name)
+    return out_path
+
+
+def _word_to_pdf(inputs, out_dir, name, params):
+    from backend.services.word_to_pdf import convert_word_to_pdf
+    return _from_result(convert_word_to_pdf(inputs[0], os.path.join(out_dir, "out.pdf"), name, encode=False))
+
+
+def _pdf_to_word(inputs, out_dir, name, params):
+    from backend.services.pdf_to_word import convert_pdf_to_word
+    return _from_result(convert_pdf_to_word(inputs[0], os.path.join(out_dir, "out.docx"), name, encode=False))
+
+
+def _word_to_excel(inputs, out_dir, name, params):
+    from backend.services.word_to_excel import convert_word_to_excel
+    return _from_result(convert_word_to_excel(inputs[0], os.path.join(out_dir, "out.xlsx"), name, encode=False))
+
+
+def _pdf_to_powerpoint(inputs, out_dir, name, params):
+    from backend.services.pdf_to_powerpoint import convert_pdf_to_powerpoint
+    return _from_result(
+        convert_pdf_to_powerpoint(inputs[0], os.path.join(out_dir, "out.pptx"), name, encode=False)
+    )
+
+
+def _pdf_to_excel(inputs, out_dir, name, params):
+    from backend.services.pdf_to_excel import convert_pdf_to_excel
+    return _from_result(convert_pdf_to_excel(inputs[0], os.path.join(out_dir, "out.xlsx"), name, encode=False))
+
+
+def _image_to_word(inputs, out_dir, name, params):
+    from backend.services.image_to_word import image_to_word
+    out = os.path.join(out_dir, "output.docx")
+    image_to_word(inputs[0], out)
+    return out, Path(name).stem + ".docx"
+
+
+def _image_to_excel(inputs, out_dir, name, params):
+    from backend.services.image_to_excel import image_to_excel
+    out = os.path.join(out_dir, "output.xlsx")
+    image_to_excel(inputs[0], out)
+    return out, Path(name).stem + ".xlsx"
+
+
+def _images_to_pdf(inputs, out_dir, name, params):
+    from backend.services.images_to_pdf import convert_images_to_pdf
+    out = convert_images_to_pdf(inputs, os.path.join(out_dir, "output.pdf"), encode=False)
+    return out, params.get("pdf_name", "images.pdf")
+
+
+def _pdf_to_images(inputs, out_dir, name, params):
+    from backend.services.pdf_to_images import convert_pdf_to_images
+    pages = convert_pdf_to_images(inputs[0], out_dir, encode=False)
+    return _zip_outputs(pages, os.path.join(out_dir, "images.zip")), Path(name).stem + "_images.zip"
+
+
+def _pdf_split(inputs, out_dir, name, params):
+    from backend.services.pdf_split import split_pdf
+    pages_dir = os.path.join(out_dir, "pages")
+    pages, _ = split_pdf(inputs[0], pages_dir, params.get("start", 1), params.get("end"))
+    return _zip_outputs(pages, os.path.join(out_dir, "split.zip")), Path(name).stem + "_pages.zip"
+
+
+def _pdf_merge(inputs, out_dir, name, params):
+    from backend.services.pdf_merge import merge_pdfs
+    out = os.path.join(out_dir, "merged.pdf")
+    merge_pdfs(inputs, out)
+    return out, "merged.pdf"
+
+
+def _pdf_rotate(inputs, out_dir, name, params):
+    from backend.services.pdf_rotate import rotate_pdf
+    out = os.path.join(out_dir, "rotated.pdf")
+    rotate_pdf(inputs[0], out, int(params.get("angle", 90)), pages=params.get("pages"))
+    return out, "rotated.pdf"
+
+
+def _pdf_compress(inputs, out_dir, name, params):
+    from backend.services.pdf_compress import compress_pdf
+    out = os.path.join(out_dir, "compressed.pdf")
+    compressed, _ = compress_pdf(
+        inputs[0],
+        out,
+        select_pages=params.get("select_pages", ""),
+        compression_level=params.get("compression_level", "max"),
+        recompress_images=params.get("recompress_images", True),
+        target_bytes=params.get("target_bytes"),
+    )
+    # compress_pdf hands back the original when it could not make it smaller
+    return compressed, (name if Path(compressed) == Path(inputs[0]) else f"compressed_{name}")
+
+
+def _pdf_watermark(inputs, out_dir, name, params):
+    from backend.schemas.pdf_watermark import parse_watermark_payload
+    from backend.services.pdf_watermark import add_watermark_to_pdf
+    watermark, placement = parse_watermark_payload(params["payload"])
+    out = os.path.join(out_dir, "watermarked.pdf")
+    add_watermark_to_pdf(
+        input_pdf=inputs[0],
+        output_pdf=out,
+        watermark=watermark,
+        placement=placement,
+        image_path=inputs[1] if len(inputs) > 1 else None,
+    )
+    return out, f"watermarked_{name}"
+
+
+OPERATIONS = {
+    "word-to-pdf": _word_to_pdf,
+    "pdf-to-word": _pdf_to_word,
+    "word-to-excel": _word_to_excel,
+    "pdf-to-powerpoint": _pdf_to_powerpoint,
+    "pdf-to-excel": _pdf_to_excel,
+    "image-to-word": _image_to_word,
+    "image-to-excel": _image_to_excel,
+    "images-to-pdf": _images_to_pdf,
+    "pdf-to-images": _pdf_to_images,
+    "pdf-split": _pdf_split,
+    "pdf-merge": _pdf_merge,
+    "pdf-rotate": _pdf_rotate,
+    "pdf-compress": _pdf_compress,
+    "pdf-watermark": _pdf_watermark,
+}
+
+
+# Bump an operation's version when its output changes, to invalidate cached results
+OPERATION_VERSIONS = {operation: "1" for operation in OPERATIONS}
+OPERATION_VERSIONS.update({
+    "pdf-watermark": "2",  # shared Form XObject stamping, vector text
+    "pdf-compress": "4",  # target mode tries quality before the placement DPI cap
+    "pdf-rotate": "2",  # incremental save
+    "pdf-merge": "2",  # resource dedupe, outlines and named destinations
+    "pdf-to-excel": "3",  # single-pass extraction, pdfplumber only for failed or sparse tables
+})
+
+
+def render_filename(template: str, name: str) -> str:
+    return template.replace(NAME_PLACEHOLDER, Path(name).stem)
+
+
+def run_operation_template(
+    operation: str, inputs: list[str], out_dir: str, suffix: str, params: dict
+) -> tuple[str, str]:
+    """
+    Run a registered conversion and return (output path, output filename template).
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation}")
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    return OPERATIONS[operation](inputs, out_dir, NAME_PLACEHOLDER + suffix, params or {})
+
+
+def run_operation(operation: str, inputs: list[str], out_dir: str, name: str, params: dict) -> tuple[str, str]:
+    """
+    Run a registered conversion and return (output path, output filename).
+    """
+    path, template = run_operation_template(operation, inputs, out_dir, Path(name).suffix, params)
+    return path, render_filename(template, name)
+
+
+# ----------------------
+# Submission
+# ----------------------
+def input_key(job_id: str, index: int, filename: str) -> str:
+    return f"jobs/{job_id}/input/{index}_{Path(filename).name}"
+
+
+def output_key(job_id: str, filename: str) -> str:
+    return f"jobs/{job_id}/output/{Path(filename).name}"
+
+
+def submit_job(operation: str, input_paths: list[str], original_name: str, params: dict | None = None) -> str:
+    """
+    Store the inputs, record a queued Job and enqueue it for the worker.
+    Returns the job id.
+    """
+    from backend.db import SessionLocal
+    from backend.db.jobs import create_job
+
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation}")
+
+    job_id = uuid.uuid4().hex
+    store = get_store()
+    keys = []
+    for i, path in enumerate(input_paths):
+        key = input_key(job_id, i, path)
+        store.put(path, key)
+        keys.append(key)
+
+    db = SessionLocal()
+    try:
+        create_job(db, job_id=job_id, status=STATUS_QUEUED, input_s3_key=keys[0])
+    finally:
+        db.close()
+
+    get_queue().send({
+        "job_id": job_id,
+        "operation": operation,
+        "input_keys": keys,
+        "filename": original_name,
+        "params": params or {},
+    })
+    return job_id
+
+
+async def enqueue_conversion(operation: str, input_paths: list[str], original_name: str, params: dict | None = None):
+    """
+    Submit a job from a request handler and return the 202 response.
+    Storage and DB I/O run off the event loop.
+    """
+    job_id = await asyncio.to_thread(submit_job, operation, input_paths, original_name, params)
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "job_id": job_id,
+            "status": STATUS_QUEUED,
+            "status_url": f"/api/jobs/{job_id}",
+        },
+    )
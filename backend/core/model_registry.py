@@ -0,0 +1,204 @@
+# backend/core/model_registry.py
+
+import gc
+import inspect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from backend.core.config import OCR_MODEL_BUDGET_MB, OCR_MODEL_DEFAULT_MB, OCR_MODEL_PRELOAD
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------
+# Loaders
+# ----------------------
+# One loader per model kind; keyword options become part of the cache key.
+# paddleocr is imported here, on first load, not when the service is imported.
+
+def _load_paddleocr(lang: str = "ch"):
+    from paddleocr import PaddleOCR
+    return PaddleOCR(lang=lang)
+
+
+def _load_ppstructure(layout_score_threshold: float = 1.0):
+    from paddleocr import PPStructureV3
+    return PPStructureV3(layout_score_threshold=layout_score_threshold)
+
+
+LOADERS = {
+    "paddleocr": (_load_paddleocr, "lang"),
+    "ppstructure": (_load_ppstructure, "layout_score_threshold"),
+}
+
+
+def _rss_bytes() -> int | None:
+    """
+    Current resident set size (Linux only).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class _Entry:
+    model: object
+    size: int
+    # Paddle predictors are not thread-safe; inference holds this lock
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    users: int = 0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models, keyed by (kind, options).
+    Each combination is loaded once; least-recently-used models that are
+    not in use are dropped once the estimated footprint exceeds `max_bytes`.
+    Sizes are estimated from the RSS growth while loading.
+    """
+
+    def __init__(self, max_bytes: int, default_size: int):
+        self.max_bytes = max_bytes
+        self.default_size = default_size
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self._models: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._loading: dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind: str, options: dict) -> tuple:
+        if kind not in LOADERS:
+            raise ValueError(f"Unknown model kind: {kind}")
+        # Fill in the loader's defaults so get("ppstructure") and
+        # get("ppstructure", layout_score_threshold=1.0) share one model
+        loader, _ = LOADERS[kind]
+        bound = inspect.signature(loader).bind(**options)
+        bound.apply_defaults()
+        return kind, tuple(sorted(bound.arguments.items()))
+
+    def _load(self, key: tuple) -> _Entry:
+        kind, options = key
+        loader, _ = LOADERS[kind]
+        before = _rss_bytes()
+        model = loader(**dict(options))
+        after = _rss_bytes()
+        size = after - before if before is not None and after is not None and after > before else self.default_size
+        logger.info("Loaded %s %s (~%d MB)", kind, dict(options), size // (1024 * 1024))
+        return _Entry(model=model, size=size)
+
+    def _entry(self, key: tuple) -> _Entry:
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; others wait for it
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return entry
+
+            entry = self._load(key)
+
+            with self._lock:
+                self._models[key] = entry
+                self._loading.pop(key, None)
+                self.loads += 1
+                self._evict(keep=key)
+        return entry
+
+    def _evict(self, keep: tuple):
+        # Caller holds the lock
+        total = sum(e.size for e in self._models.values())
+        for key in list(self._models):
+            if total <= self.max_bytes:
+                break
+            entry = self._models[key]
+            if key == keep or entry.users:
+                continue
+            del self._models[key]
+            total -= entry.size
+            self.evictions += 1
+            logger.info("Evicted %s %s", key[0], dict(key[1]))
+        gc.collect()
+
+    def get(self, kind: str, **options):
+        """
+        Return the model, loading it on first use.
+        """
+        return self._entry(self._key(kind, options)).model
+
+    @contextmanager
+    def use(self, kind: str, **options):
+        """
+        Hold a model for inference: it cannot be evicted, and other threads
+        using the same model wait their turn.
+        """
+        entry = self._entry(self._key(kind, options))
+        with self._lock:
+            entry.users += 1
+        try:
+            with entry.lock:
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.users -= 1
+
+    def preload(self, specs: list[str]):
+        """
+        Load models from "kind[:option]" specs, e.g. ["paddleocr:en", "ppstructure"].
+        Failures are logged, not raised.
+        """
+        for spec in specs:
+            kind, _, value = spec.partition(":")
+            try:
+                if kind not in LOADERS:
+                    raise ValueError(f"Unknown model kind: {kind}")
+                loader, option = LOADERS[kind]
+                options = {}
+                if value:
+                    # Coerce to the type of the loader's default (e.g. a float threshold)
+                    default = inspect.signature(loader).parameters[option].default
+                    options[option] = type(default)(value) if default is not inspect.Parameter.empty else value
+                self.get(kind, **options)
+            except Exception:
+                logger.exception("Failed to preload model %s", spec)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "models": [
+                    {"kind": kind, "options": dict(options), "size_bytes": e.size, "in_use": e.users}
+                    for (kind, options), e in self._models.items()
+                ],
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "max_bytes": self.max_bytes,
+            }
+
+
+model_registry = ModelRegistry(OCR_MODEL_BUDGET_MB * 1024 * 1024, OCR_MODEL_DEFAULT_MB * 1024 * 1024)
+
+
+def preload_models():
+    """
+    Warm the models listed in OCR_MODEL_PRELOAD (no-op when empty).
+    """
+    if OCR_MODEL_PRELOAD:
+        model_registry.preload(OCR_MODEL_PRELOAD)
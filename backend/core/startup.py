@@ -0,0 +1,86 @@
+# backend/core/startup.py
+#
+# Import warm-up, plus an import-cost benchmark. Run with:
+#     python -m backend.core.startup [module ...]
+
+import importlib
+import logging
+import subprocess
+import sys
+import threading
+import time
+
+from backend.core.config import IMPORT_WARMUP
+
+logger = logging.getLogger(__name__)
+
+# What the benchmark measures by default: the app itself, then each stack it loads lazily
+BENCHMARK_MODULES = [
+    "backend.main",
+    "backend.services.word_to_pdf",
+    "backend.services.pdf_to_word",
+    "backend.services.word_to_excel",
+    "backend.services.pdf_to_excel",
+    "backend.services.pdf_to_powerpoint",
+    "backend.services.pdf_to_images",
+    "backend.services.images_to_pdf",
+    "backend.services.image_to_word",
+    "backend.services.image_to_excel",
+    "backend.services.pdf_split",
+    "backend.services.pdf_merge",
+    "backend.services.pdf_rotate",
+    "backend.services.pdf_compress",
+    "backend.services.pdf_watermark",
+    "backend.services.pdf_edit",
+    "backend.services.pdf_sign",
+]
+
+
+def _warm(modules: list[str]):
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            logger.exception("Warm-up import of %s failed", name)
+            continue
+        logger.info("Warmed %s in %.0f ms", name, (time.perf_counter() - start) * 1000)
+
+
+def warm_imports(modules: list[str] | None = None) -> threading.Thread | None:
+    """
+    Import the IMPORT_WARMUP modules on a background thread so the first
+    request doesn't pay for them, without delaying startup.
+    """
+    modules = IMPORT_WARMUP if modules is None else modules
+    if not modules:
+        return None
+    thread = threading.Thread(target=_warm, args=(modules,), name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_cost(module: str) -> float | None:
+    """
+    Seconds to import `module` in a fresh interpreter (None if it fails).
+    """
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - t)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(modules: list[str]) -> list[tuple[str, float | None]]:
+    return [(module, import_cost(module)) for module in modules]
+
+
+if __name__ == "__main__":
+    modules = sys.argv[1:] or BENCHMARK_MODULES
+    width = max(len(m) for m in modules)
+    for module, seconds in benchmark(modules):
+        cost = "failed" if seconds is None else f"{seconds * 1000:8.0f} ms"
+        print(f"{module:<{width}}  {cost}")
@@ -0,0 +1,72 @@
+# backend/core/text_cache.py
+
+import threading
+from collections import OrderedDict
+
+from backend.core.config import TEXT_CACHE_PAGES
+
+# Key under which a document's page count is stored (pages are 1-indexed)
+PAGE_COUNT = 0
+
+
+class PageTextCache:
+    """
+    Extracted text spans per (document sha256, page number), so an editor
+    scrolling through a document, or reopening it, only extracts each page
+    once. Least recently used pages are dropped beyond `max_pages`.
+    """
+
+    def __init__(self, max_pages: int):
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self._pages: OrderedDict[tuple[str, int], object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, doc_hash: str, first: int, last: int | None) -> tuple[int | None, dict[int, list]]:
+        """
+        (page count or None, {page: spans}) for the cached pages of the window.
+        `last` may be None (to the end) only when the page count is cached.
+        """
+        with self._lock:
+            page_count = self._get((doc_hash, PAGE_COUNT))
+            if page_count is None:
+                self.misses += 1
+                return None, {}
+            last = min(last or page_count, page_count)
+
+            found = {}
+            for page in range(first, last + 1):
+                spans = self._get((doc_hash, page))
+                if spans is not None:
+                    found[page] = spans
+            if len(found) == last - first + 1:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return page_count, found
+
+    def store(self, doc_hash: str, page_count: int, pages: dict[int, list]):
+        with self._lock:
+            self._put((doc_hash, PAGE_COUNT), page_count)
+            for page, spans in pages.items():
+                self._put((doc_hash, page), spans)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pages": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key):
+        value = self._pages.get(key)
+        if value is not None:
+            self._pages.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        self._pages[key] = value
+        self._pages.move_to_end(key)
+
+
+text_cache = PageTextCache(TEXT_CACHE_PAGES)
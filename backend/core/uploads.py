@@ -0,0 +1,71 @@
+# backend/core/uploads.py
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+
+from backend.core.config import MAX_UPLOAD_MB, MAX_IMAGE_UPLOAD_MB, UPLOAD_CHUNK_SIZE
+
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+MAX_IMAGE_UPLOAD_BYTES = MAX_IMAGE_UPLOAD_MB * 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """
+    An upload written to the request workspace.
+    `sha256` is the hex digest of the content, computed while spooling.
+    """
+    path: str
+    filename: str
+    size: int
+    sha256: str
+
+
+def _too_large(filename: str, max_bytes: int) -> HTTPException:
+    return HTTPException(
+        413,
+        f"{filename} exceeds the {max_bytes // (1024 * 1024)} MB upload limit",
+    )
+
+
+def _check_declared_size(file: UploadFile, max_bytes: int):
+    # Starlette records the parsed size; reject before copying anything
+    size = getattr(file, "size", None)
+    if size is not None and size > max_bytes:
+        raise _too_large(file.filename, max_bytes)
+
+
+def _abort(out, dest: Path, filename: str, max_bytes: int):
+    out.close()
+    dest.unlink(missing_ok=True)
+    raise _too_large(filename, max_bytes)
+
+
+async def spool_upload(
+    file: UploadFile,
+    dest: str | Path,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+) -> SpooledUpload:
+    """
+    Stream an UploadFile to `dest` in chunks, hashing it on the fly.
+    Raises HTTP 413 (and removes the partial file) as soon as `max_bytes` is exceeded.
+    """
+    _check_declared_size(file, max_bytes)
+
+    dest = Path(dest)
+    hasher = hashlib.sha256()
+    size = 0
+
+    with open(dest, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                _abort(out, dest, file.filename, max_bytes)
+            hasher.update(chunk)
+            out.write(chunk)
+
+    return SpooledUpload(str(dest), file.filename, size, hasher.hexdigest())
+
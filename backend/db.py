@@ -1,15 +0,0 @@
-# backend\db.py
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from backend.core.config import DATABASE_URL
-
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
@@ -0,0 +1,29 @@
+# backend/db/__init__.py
+
+import os
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.core.config import DATABASE_URL, LOCAL_JOBS_DIR
+
+connect_args = {}
+if DATABASE_URL.startswith("sqlite"):
+    # Local job store: needs its directory and cross-thread access from the threadpool
+    os.makedirs(LOCAL_JOBS_DIR, exist_ok=True)
+    connect_args = {"check_same_thread": False}
+
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+SessionLocal = sessionmaker(bind=engine)
+
+def init_db():
+    """
+    Create missing tables (no-op for existing ones).
+    """
+    from backend.db.models import Base
+    Base.metadata.create_all(engine)
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
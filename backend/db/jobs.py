@@ -35,3 +35,6 @@ def update_job(
         job.error_message = error
 
     db.commit()
+
+def get_job(db: Session, job_id: str) -> Job | None:
+    return db.query(Job).filter(Job.job_id == job_id).first()
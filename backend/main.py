@@ -1,11 +1,20 @@
 # backend/main.py
 
+import asyncio
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.middleware import SlowAPIMiddleware
 
 from backend.core.limiter import limiter
-from backend.routers import pdf, office, image, nutrient, pdf_edit, pdf_watermark
+from backend.core.executor import start_pool, shutdown_pool
+from backend.core.cache import result_cache
+from backend.core.config import EDIT_SESSION_SWEEP_INTERVAL
+from backend.core.edit_sessions import edit_sessions
+from backend.core.model_registry import model_registry, preload_models
+from backend.core.startup import warm_imports
+from backend.routers import pdf, office, image, nutrient, pdf_edit, pdf_watermark, jobs
 
 
 app = FastAPI(
@@ -31,6 +40,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ----------------------
+# Conversion process pool
+# ----------------------
+@app.on_event("startup")
+async def startup_pool():
+    if start_pool() is None:
+        # No pool: conversions run in this process, so warm the models here
+        asyncio.get_running_loop().run_in_executor(None, preload_models)
+
+@app.on_event("shutdown")
+async def stop_pool():
+    shutdown_pool()
+
+# ----------------------
+# PDF edit sessions
+# ----------------------
+async def sweep_edit_sessions():
+    while True:
+        await asyncio.sleep(EDIT_SESSION_SWEEP_INTERVAL)
+        try:
+            await asyncio.to_thread(edit_sessions.expire)
+        except Exception:
+            logging.exception("Edit session sweep failed")
+
+@app.on_event("startup")
+async def start_edit_sessions():
+    app.state.edit_session_sweeper = asyncio.create_task(sweep_edit_sessions())
+
+@app.on_event("shutdown")
+async def stop_edit_sessions():
+    app.state.edit_session_sweeper.cancel()
+    edit_sessions.close_all()
+
+# ----------------------
+# Import warm-up
+# ----------------------
+@app.on_event("startup")
+async def startup_warmup():
+    # Heavy stacks load on first use; IMPORT_WARMUP preloads some in the background
+    warm_imports()
+
+# ----------------------
+# Job store (async mode)
+# ----------------------
+@app.on_event("startup")
+async def startup_db():
+    try:
+        from backend.db import init_db
+        init_db()
+    except Exception:
+        # Sync conversions don't need the DB; only ?mode=async and /api/jobs do
+        logging.exception("Job database unavailable")
+
 # ----------------------
 # Routers
 # ----------------------
@@ -40,6 +102,7 @@ app.include_router(image.router)
 app.include_router(nutrient.router)
 app.include_router(pdf_watermark.router)
 app.include_router(pdf_edit.router)
+app.include_router(jobs.router)
 
 # ----------------------
 # Root + Health Endpoints
@@ -55,3 +118,12 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return result_cache.stats()
+
+@app.get("/models/stats")
+async def model_stats():
+    # Models loaded in this process (pool children keep their own)
+    return model_registry.stats()
@@ -1,14 +1,15 @@
 # backend\routers\image.py
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 from pathlib import Path
 from typing import List, Union
 import tempfile
 
-from backend.utils.file_utils import encode_file_to_base64
-from backend.services import image_to_word, image_to_excel
-from backend.services.pdf_to_images import convert_pdf_to_images
-from backend.services.images_to_pdf import convert_images_to_pdf
+from backend.core.delivery import deliver_file
+from backend.core.uploads import spool_upload, MAX_IMAGE_UPLOAD_BYTES
+from backend.core.executor import run_conversion
+from backend.core.cache import cached_conversion
+from backend.core.jobs import wants_async, enqueue_conversion
 from backend.schemas.common import FileResponse
 
 router = APIRouter(prefix="/api/convert", tags=["Image"])
@@ -17,7 +18,12 @@ router = APIRouter(prefix="/api/convert", tags=["Image"])
 # Image → Word
 # ----------------------
 @router.post("/image-to-word")
-async def convert_image_to_word(file: Union[UploadFile, List[UploadFile]] = File(...)):
+async def convert_image_to_word(
+    request: Request,
+    file: Union[UploadFile, List[UploadFile]] = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     """
     Convert a single image to a Word document using OCR.
     Accepts .png, .jpg, .jpeg, .tiff files.
@@ -36,18 +42,21 @@ async def convert_image_to_word(file: Union[UploadFile, List[UploadFile]] = File
     try:
         with tempfile.TemporaryDirectory() as tmp:
             img_path = Path(tmp) / file.filename
-            word_path = Path(tmp) / "output.docx"
 
-            # Write uploaded file to temp directory
-            img_path.write_bytes(await file.read())
+            # Stream uploaded file to temp directory
+            upload = await spool_upload(file, img_path, max_bytes=MAX_IMAGE_UPLOAD_BYTES)
 
-            # Convert image to Word
-            image_to_word.image_to_word(str(img_path), str(word_path))
+            if wants_async(mode):
+                return await enqueue_conversion("image-to-word", [str(img_path)], file.filename)
 
-            return FileResponse(
-                filename=img_path.stem + ".docx",
-                file=encode_file_to_base64(str(word_path))
+            # Convert image to Word
+            word_path, filename = await cached_conversion(
+                "image-to-word", [upload], str(Path(tmp) / "out"), file.filename
             )
+
+            return deliver_file(request, delivery, word_path, filename)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -56,21 +65,30 @@ async def convert_image_to_word(file: Union[UploadFile, List[UploadFile]] = File
 # Image → Excel
 # ----------------------
 @router.post("/image-to-excel")
-async def convert_image_to_excel(file: UploadFile = File(...)):
+async def convert_image_to_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.lower().endswith((".png", ".jpg", ".jpeg", ".tiff")):
         raise HTTPException(400, "File must be an image")
     try:
         with tempfile.TemporaryDirectory() as tmp:
             img_path = Path(tmp) / file.filename
-            xlsx_path = Path(tmp) / "output.xlsx"
 
-            img_path.write_bytes(await file.read())
-            image_to_excel.image_to_excel(str(img_path), str(xlsx_path))
+            upload = await spool_upload(file, img_path, max_bytes=MAX_IMAGE_UPLOAD_BYTES)
+
+            if wants_async(mode):
+                return await enqueue_conversion("image-to-excel", [str(img_path)], file.filename)
 
-            return FileResponse(
-                filename=img_path.stem + ".xlsx",
-                file=encode_file_to_base64(str(xlsx_path))
+            xlsx_path, filename = await cached_conversion(
+                "image-to-excel", [upload], str(Path(tmp) / "out"), file.filename
             )
+
+            return deliver_file(request, delivery, xlsx_path, filename)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, str(e))
 
@@ -80,8 +98,11 @@ async def convert_image_to_excel(file: UploadFile = File(...)):
 # ----------------------
 @router.post("/images-to-pdf", response_model=FileResponse)
 async def images_to_pdf(
+    request: Request,
     files: List[UploadFile] = File(...),
-    pdf_name: str = Form("images.pdf")
+    pdf_name: str = Form("images.pdf"),
+    delivery: str | None = None,
+    mode: str | None = None,
 ):
     """
     Convert uploaded images into a PDF.
@@ -90,6 +111,7 @@ async def images_to_pdf(
     try:
         with tempfile.TemporaryDirectory() as tmp:
             tmp_dir = Path(tmp)
+            uploads = []
             image_paths = []
 
             for file in files:
@@ -97,12 +119,19 @@ async def images_to_pdf(
                     raise HTTPException(400, f"{file.filename} is not a valid image")
 
                 img_path = tmp_dir / file.filename
-                img_path.write_bytes(await file.read())
+                uploads.append(await spool_upload(file, img_path, max_bytes=MAX_IMAGE_UPLOAD_BYTES))
                 image_paths.append(str(img_path))
 
-            base64_pdf = convert_images_to_pdf(image_paths, str(tmp_dir / "output.pdf"))
+            if wants_async(mode):
+                return await enqueue_conversion("images-to-pdf", image_paths, pdf_name, {"pdf_name": pdf_name})
+
+            pdf_path, filename = await cached_conversion(
+                "images-to-pdf", uploads, str(tmp_dir / "out"), pdf_name, {"pdf_name": pdf_name}
+            )
 
-            return FileResponse(filename=pdf_name, file=base64_pdf)
+            return deliver_file(request, delivery, pdf_path, filename)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -111,18 +140,25 @@ async def images_to_pdf(
 # PDF → Images
 # ----------------------
 @router.post("/pdf-to-images")
-async def pdf_to_images(file: UploadFile = File(...)):
+async def pdf_to_images(file: UploadFile = File(...), mode: str | None = None):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(400, "File must be a PDF")
     try:
         with tempfile.TemporaryDirectory() as tmp:
             pdf_path = Path(tmp) / file.filename
-            pdf_path.write_bytes(await file.read())
-            images = convert_pdf_to_images(str(pdf_path), tmp)
+            await spool_upload(file, pdf_path)
+
+            if wants_async(mode):
+                return await enqueue_conversion("pdf-to-images", [str(pdf_path)], file.filename)
+
+            from backend.services.pdf_to_images import convert_pdf_to_images
+            images = await run_conversion("pdf-to-images", convert_pdf_to_images, str(pdf_path), tmp)
 
             return {
                 "success": True,
                 "images": images,  # list of base64 PNGs
             }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, str(e))
@@ -0,0 +1,61 @@
+# backend/routers/jobs.py
+
+import tempfile
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request
+
+from backend.core.delivery import deliver_file
+from backend.core.job_backends import get_store
+from backend.core.jobs import STATUS_DONE
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+def _load_job(job_id: str):
+    # The job database (sqlalchemy) is only needed by async mode
+    from backend.db import SessionLocal
+    from backend.db.jobs import get_job
+
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+    finally:
+        db.close()
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+# ----------------------
+# Job status
+# ----------------------
+@router.get("/{job_id}")
+def job_status(job_id: str):
+    job = _load_job(job_id)
+    done = job.status == STATUS_DONE
+
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "error": job.error_message,
+        "filename": Path(job.output_s3_key).name if done else None,
+        "result_url": f"/api/jobs/{job.job_id}/result" if done else None,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+# ----------------------
+# Job result (JSON/base64 by default, binary on request)
+# ----------------------
+@router.get("/{job_id}/result")
+def job_result(request: Request, job_id: str, delivery: str | None = None):
+    job = _load_job(job_id)
+    if job.status != STATUS_DONE:
+        raise HTTPException(409, f"Job is {job.status}")
+
+    filename = Path(job.output_s3_key).name
+    with tempfile.TemporaryDirectory() as tmp:
+        local = get_store().get(job.output_s3_key, str(Path(tmp) / filename))
+        return deliver_file(request, delivery, local, filename)
@@ -3,19 +3,13 @@
 import os
 import tempfile
 import logging
-import uuid
-from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 
-from backend.services.word_to_pdf import convert_word_to_pdf
-from backend.services.pdf_to_word import convert_pdf_to_word
-from backend.services.word_to_excel import convert_word_to_excel
-from backend.services.pdf_to_excel import convert_pdf_to_excel
-
-from backend.utils.file_utils import encode_file_to_base64
-from backend.utils.sqs_client import send_job
-from backend.utils.s3_utils import upload_file_to_s3
+from backend.core.delivery import deliver_file
+from backend.core.uploads import spool_upload
+from backend.core.cache import cached_conversion
+from backend.core.jobs import wants_async, enqueue_conversion
 
 router = APIRouter(prefix="/api/convert", tags=["Office"])
 
@@ -23,116 +17,142 @@ router = APIRouter(prefix="/api/convert", tags=["Office"])
 # Word → PDF (SYNC)
 # ----------------------
 @router.post("/word-to-pdf")
-async def word_to_pdf(file: UploadFile = File(...)):
+async def word_to_pdf(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.endswith((".doc", ".docx")):
         raise HTTPException(status_code=400, detail="Word file required")
 
     with tempfile.TemporaryDirectory() as tmp:
         docx_path = os.path.join(tmp, "in.docx")
-        pdf_path = os.path.join(tmp, "out.pdf")
 
-        with open(docx_path, "wb") as f:
-            f.write(await file.read())
+        upload = await spool_upload(file, docx_path)
+
+        if wants_async(mode):
+            return await enqueue_conversion("word-to-pdf", [docx_path], file.filename)
 
-        convert_word_to_pdf(docx_path, pdf_path, file.filename)
+        pdf_path, filename = await cached_conversion(
+            "word-to-pdf", [upload], os.path.join(tmp, "out"), file.filename
+        )
 
-        return {
-            "filename": os.path.basename(pdf_path),
-            "file": encode_file_to_base64(pdf_path),
-            "success": True
-        }
+        return deliver_file(request, delivery, pdf_path, filename)
 
 
 # ----------------------
 # PDF → Word (SYNC)
 # ----------------------
 @router.post("/pdf-to-word")
-async def pdf_to_word(file: UploadFile = File(...)):
+async def pdf_to_word(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="PDF file required")
 
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = os.path.join(tmp, "in.pdf")
-        docx_path = os.path.join(tmp, "out.docx")
 
-        with open(pdf_path, "wb") as f:
-            f.write(await file.read())
+        upload = await spool_upload(file, pdf_path)
+
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-to-word", [pdf_path], file.filename)
 
-        return convert_pdf_to_word(pdf_path, docx_path, file.filename)
+        docx_path, filename = await cached_conversion(
+            "pdf-to-word", [upload], os.path.join(tmp, "out"), file.filename
+        )
+        return deliver_file(request, delivery, docx_path, filename)
 
 
 # ----------------------
 # Word → Excel (SYNC)
 # ----------------------
 @router.post("/word-to-excel")
-async def word_to_excel(file: UploadFile = File(...)):
+async def word_to_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.endswith((".doc", ".docx")):
         raise HTTPException(status_code=400, detail="Word file required")
 
     with tempfile.TemporaryDirectory() as tmp:
         docx_path = os.path.join(tmp, "in.docx")
-        output_filename = Path(file.filename).stem + ".xlsx"
-        excel_path = os.path.join(tmp, output_filename)
 
-        with open(docx_path, "wb") as f:
-            f.write(await file.read())
+        upload = await spool_upload(file, docx_path)
 
-        convert_word_to_excel(docx_path, excel_path, file.filename)
+        if wants_async(mode):
+            return await enqueue_conversion("word-to-excel", [docx_path], file.filename)
 
-        return {
-            "filename": output_filename,
-            "file": encode_file_to_base64(excel_path),
-            "success": True
-        }
+        excel_path, filename = await cached_conversion(
+            "word-to-excel", [upload], os.path.join(tmp, "out"), file.filename
+        )
+
+        return deliver_file(request, delivery, excel_path, filename)
 
 
 # ----------------------
 # PDF → PowerPoint (SYNC)
 # ----------------------
 @router.post("/pdf-to-powerpoint")
-def pdf_to_powerpoint(file: UploadFile = File(...)):
+async def pdf_to_powerpoint(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="PDF file required")
 
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = os.path.join(tmp, "in.pdf")
-        pptx_path = os.path.join(tmp, "out.pptx")
-        output_filename = Path(file.filename).stem + ".pptx"
 
-        # Write uploaded file
-        with open(pdf_path, "wb") as f:
-            f.write(file.file.read())
+        # Stream uploaded file to disk
+        upload = await spool_upload(file, pdf_path)
+
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-to-powerpoint", [pdf_path], file.filename)
 
-        # Convert PDF to PowerPoint synchronously
-        from backend.services.pdf_to_powerpoint import convert_pdf_to_powerpoint
-        convert_pdf_to_powerpoint(pdf_path, pptx_path, file.filename)
+        # Convert PDF to PowerPoint in the conversion pool (or serve it from the cache)
+        pptx_path, filename = await cached_conversion(
+            "pdf-to-powerpoint", [upload], os.path.join(tmp, "out"), file.filename
+        )
 
-        # Return base64-encoded file
-        return {
-            "filename": output_filename,
-            "file": encode_file_to_base64(pptx_path),
-            "success": True
-        }
+        # Return base64-encoded file (or stream it when binary delivery is requested)
+        return deliver_file(request, delivery, pptx_path, filename)
 
 # ----------------------
 # PDF → Excel (SYNC for now)
 # ----------------------
 @router.post("/pdf-to-excel")
-async def pdf_to_excel(file: UploadFile = File(...)):
+async def pdf_to_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="PDF file required")
 
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = os.path.join(tmp, "in.pdf")
-        excel_path = os.path.join(tmp, "out.xlsx")
 
-        with open(pdf_path, "wb") as f:
-            f.write(await file.read())
+        upload = await spool_upload(file, pdf_path)
+
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-to-excel", [pdf_path], file.filename)
 
         try:
-            result = convert_pdf_to_excel(pdf_path, excel_path, file.filename)
+            excel_path, filename = await cached_conversion(
+                "pdf-to-excel", [upload], os.path.join(tmp, "out"), file.filename
+            )
         except Exception as e:
             logging.exception("PDF → Excel conversion failed")
             return {"success": False, "error": str(e)}
 
-        return result
+        return deliver_file(request, delivery, excel_path, filename)
@@ -1,25 +1,21 @@
 #  backend\routers\pdf.py
 
+import asyncio
 import base64
 import os
 import tempfile
 from pathlib import Path
 from typing import List
 
-from fastapi import APIRouter, UploadFile, File, Request, Form
+from fastapi import APIRouter, UploadFile, File, Request, Form, HTTPException
 
 from backend.core.limiter import limiter
 from backend.schemas.common import FileResponse as ApiFileResponse, SplitPDFResponse
-from backend.utils.file_utils import encode_file_to_base64
-from backend.services.pdf_split import split_pdf_base64
-from backend.services.pdf_merge import merge_pdfs
-from backend.services.pdf_compress import compress_pdf
-from backend.services.pdf_overlay import overlay_pdf
-from backend.services.pdf_rotate import rotate_pdf
-from backend.services.pdf_sign import sign_pdf
-from fastapi import APIRouter, UploadFile, File, Form
-from tempfile import NamedTemporaryFile
-from backend.services.pdf_watermark import add_watermark_to_pdf
+from backend.core.delivery import deliver_file, wants_archive, stream_file
+from backend.core.uploads import spool_upload
+from backend.core.executor import run_conversion
+from backend.core.cache import cached_conversion
+from backend.core.jobs import wants_async, enqueue_conversion
 
 router = APIRouter(prefix="/api/convert", tags=["PDF"])
 
@@ -31,31 +27,67 @@ async def pdf_split(
     file: UploadFile = File(...),
     start: int = 1,
     end: int | None = None,
+    delivery: str | None = None,
+    mode: str | None = None,
 ):
+    if wants_archive(request, delivery) and not wants_async(mode):
+        return await _pdf_split_zip(file, start, end)
+
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = Path(tmp) / file.filename
-        pdf_path.write_bytes(await file.read())
-        return split_pdf_base64(str(pdf_path), tmp, start, end)
+        await spool_upload(file, pdf_path)
+
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-split", [str(pdf_path)], file.filename, {"start": start, "end": end})
+
+        from backend.services.pdf_split import split_pdf_base64
+        return await run_conversion("pdf-split", split_pdf_base64, str(pdf_path), tmp, start, end)
+
+async def _pdf_split_zip(file: UploadFile, start: int, end: int | None):
+    """
+    Return split pages as a ZIP. The archive is written in the conversion pool,
+    one page in memory at a time, then streamed from disk.
+    """
+    from backend.services.pdf_split import split_pdf_zip
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / Path(file.filename).name
+        zip_path = Path(tmp) / "pages.zip"
+        await spool_upload(file, pdf_path)
+        try:
+            total = await run_conversion("pdf-split", split_pdf_zip, str(pdf_path), str(zip_path), start, end)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+        return stream_file(
+            str(zip_path),
+            f"{Path(file.filename).stem}_pages.zip",
+            headers={"X-Total-Pages": str(total)},
+        )
 
 # ---------------------- PDF Merge ----------------------
 @router.post("/pdf-merge")
 @limiter.limit("10/minute")
-async def pdf_merge(request: Request, files: List[UploadFile] = File(...)):
+async def pdf_merge(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    delivery: str | None = None,
+    mode: str | None = None,
+):
     with tempfile.TemporaryDirectory() as tmp:
+        uploads = []
         paths = []
         for f in files:
             p = Path(tmp) / f.filename
-            p.write_bytes(await f.read())
+            uploads.append(await spool_upload(f, p))
             paths.append(str(p))
 
-        merged = Path(tmp) / "merged.pdf"
-        merge_pdfs(paths, str(merged))
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-merge", paths, "merged.pdf")
 
-        return {
-            "success": True,
-            "filename": "merged.pdf",
-            "file": encode_file_to_base64(str(merged)),
-        }
+        merged, filename = await cached_conversion("pdf-merge", uploads, str(Path(tmp) / "out"), "merged.pdf")
+
+        return deliver_file(request, delivery, merged, filename)
 
 # ---------------------- PDF Rotate ----------------------
 @router.post("/pdf-rotate")
@@ -64,19 +96,42 @@ async def pdf_rotate_endpoint(
     request: Request,
     file: UploadFile = File(...),
     angle: int = 90,
+    pages: str | None = None,
+    delivery: str | None = None,
+    mode: str | None = None,
 ):
+    """
+    Rotate every page by `angle`, or only the pages in `pages`,
+    a JSON object such as {"1-3": 90, "7": 180}.
+    """
+    from backend.services.pdf_rotate import parse_rotation_spec, check_rotation_pages
+
+    params = {"angle": int(angle)}
+    if pages:
+        try:
+            params["pages"] = parse_rotation_spec(pages)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = Path(tmp) / "in.pdf"
-        out_path = Path(tmp) / "rotated.pdf"
 
-        pdf_path.write_bytes(await file.read())
-        rotate_pdf(str(pdf_path), str(out_path), int(angle))
+        upload = await spool_upload(file, pdf_path)
 
-        return {
-            "success": True,
-            "filename": "rotated.pdf",
-            "file": encode_file_to_base64(str(out_path)),
-        }
+        if "pages" in params:
+            try:
+                await asyncio.to_thread(check_rotation_pages, params["pages"], str(pdf_path))
+            except ValueError as e:
+                raise HTTPException(400, str(e))
+
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-rotate", [str(pdf_path)], file.filename, params)
+
+        out_path, filename = await cached_conversion(
+            "pdf-rotate", [upload], str(Path(tmp) / "out"), file.filename, params
+        )
+
+        return deliver_file(request, delivery, out_path, filename)
 
 # ... keep all your existing imports and helper functions ...
 
@@ -91,12 +146,13 @@ async def pdf_sign_endpoint(
     file: UploadFile = File(...),
     signatureType: str = Form("cades"),
     cadesLevel: str = Form("b-lt"),
+    delivery: str | None = None,
 ):
     import requests, json
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-        tmp_pdf.write(await file.read())
         pdf_path = tmp_pdf.name
+    await spool_upload(file, pdf_path)
 
     try:
         with open(pdf_path, "rb") as f:
@@ -118,11 +174,7 @@ async def pdf_sign_endpoint(
             for chunk in response.iter_content(chunk_size=8192):
                 f_out.write(chunk)
 
-        return {
-            "success": True,
-            "filename": f"signed_{file.filename}",
-            "file": encode_file_to_base64(str(out_path)),
-        }
+        return deliver_file(request, delivery, str(out_path), f"signed_{file.filename}")
     finally:
         if os.path.exists(pdf_path):
             os.remove(pdf_path)
@@ -137,23 +189,32 @@ async def pdf_compress(
     select_pages: str = "",
     compression_level: str = "max",
     recompress_images: bool = True,
+    target_bytes: int | None = None,
+    delivery: str | None = None,
+    mode: str | None = None,
 ):
+    if target_bytes is not None and target_bytes <= 0:
+        raise HTTPException(400, "target_bytes must be positive")
+    if target_bytes is not None and not recompress_images:
+        raise HTTPException(400, "target_bytes works by recompressing images; it can't be combined with recompress_images=false")
+
     with tempfile.TemporaryDirectory() as tmp:
         pdf_path = Path(tmp) / file.filename
-        out_path = Path(tmp) / f"compressed_{file.filename}"
 
-        pdf_path.write_bytes(await file.read())
+        upload = await spool_upload(file, pdf_path)
+
+        params = {
+            "select_pages": select_pages,
+            "compression_level": compression_level,
+            "recompress_images": recompress_images,
+            "target_bytes": target_bytes,
+        }
 
-        compressed_file, _ = compress_pdf(
-            str(pdf_path),
-            str(out_path),
-            select_pages=select_pages,
-            compression_level=compression_level,
-            recompress_images=recompress_images,
+        if wants_async(mode):
+            return await enqueue_conversion("pdf-compress", [str(pdf_path)], file.filename, params)
+
+        compressed_file, filename = await cached_conversion(
+            "pdf-compress", [upload], str(Path(tmp) / "out"), file.filename, params
         )
 
-        return {
-            "success": True,
-            "filename": Path(compressed_file).name,
-            "file": encode_file_to_base64(str(compressed_file)),
-        }
+        return deliver_file(request, delivery, compressed_file, filename)
@@ -1,9 +1,15 @@
 # backend/routers/pdf_edit.py
 
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from ..services.pdf_edit import get_pdf_text, update_pdf_text
+from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException, Body
+from ..core.uploads import spool_upload
+from ..core.executor import run_conversion
+from ..core.delivery import deliver_file
+from ..core.edit_sessions import edit_sessions
+from ..core.text_cache import text_cache
 from typing import List
+from pathlib import Path
+import asyncio
+import re
 import tempfile
 import json
 import shutil
@@ -11,45 +17,69 @@ import os
 
 router = APIRouter(prefix="/pdf-edit", tags=["PDF Edit"])
 
+def _check_window(first_page: int, last_page: int | None):
+    if first_page < 1 or (last_page is not None and last_page < first_page):
+        raise HTTPException(400, "Invalid page window")
+
+
 @router.post("/extract")
-async def extract_text(file: UploadFile = File(...)):
+async def extract_text(
+    file: UploadFile = File(...),
+    first_page: int = 1,
+    last_page: int | None = None,
+    compact: bool = False,
+):
     """
     Extract text from the uploaded PDF file.
+
+    first_page / last_page: 1-indexed inclusive window (defaults to all pages),
+    so the editor can fetch pages as the user scrolls.
+    compact: return spans as [text, x0, y0, x1, y1, font, size] arrays.
+    Extracted pages are cached by document hash.
     """
-    # Use a temporary file safely
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_path = tmp_file.name
-        tmp_file.write(await file.read())
+    _check_window(first_page, last_page)
+    from ..services.pdf_edit import extract_page_spans, expand_spans
 
-    try:
-        # Call service to extract text blocks
-        pages = get_pdf_text(tmp_path)
-        return {"pages": pages}
-    finally:
-        # Cleanup temporary file
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = os.path.join(tmp, "in.pdf")
+        upload = await spool_upload(file, tmp_path)
+
+        page_count, pages = text_cache.lookup(upload.sha256, first_page, last_page)
+        wanted = None if page_count is None else min(last_page or page_count, page_count) - first_page + 1
+        if wanted is None or len(pages) < wanted:
+            page_count, extracted = await run_conversion(
+                "pdf-edit-extract", extract_page_spans, tmp_path, first_page, last_page, list(pages)
+            )
+            text_cache.store(upload.sha256, page_count, extracted)
+            pages.update(extracted)
+
+    last = min(last_page or page_count, page_count)
+    window = [pages[p] for p in range(first_page, last + 1)]
+    return {
+        "pages": window if compact else [expand_spans(spans) for spans in window],
+        "first_page": first_page,
+        "last_page": last,
+        "page_count": page_count,
+    }
 
 
 @router.post("/update")
 async def update_text(
+    request: Request,
     file: UploadFile = File(...),
     updates: str = Form(...),  # Receive JSON string from frontend form
+    delivery: str | None = None,
 ):
     """
-    Apply text updates to the uploaded PDF.
+    Apply text updates to the uploaded PDF and return the edited file.
 
     updates: JSON string list of updates, each with text and bbox info.
     """
-    # Temporary input and output files
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_input_file:
-        tmp_input_path = tmp_input_file.name
-        tmp_input_file.write(await file.read())
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_output_file:
-        tmp_output_path = tmp_output_file.name
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_input_path = os.path.join(tmp, "in.pdf")
+        tmp_output_path = os.path.join(tmp, "out.pdf")
+        await spool_upload(file, tmp_input_path)
 
-    try:
         # Parse updates JSON safely
         try:
             updates_list = json.loads(updates)
@@ -57,11 +87,125 @@ async def update_text(
             updates_list = []
 
         # Apply updates via service
-        update_pdf_text(tmp_input_path, updates_list, tmp_output_path)
-
-        # Return path or URL for frontend
-        return JSONResponse({"file_path": tmp_output_path})
-    finally:
-        # Cleanup input file
-        if os.path.exists(tmp_input_path):
-            os.remove(tmp_input_path)
+        from ..services.pdf_edit import update_pdf_text
+        try:
+            await run_conversion("pdf-edit-update", update_pdf_text, tmp_input_path, updates_list, tmp_output_path)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+        return deliver_file(request, delivery, tmp_output_path, f"edited_{Path(file.filename).name}")
+
+
+# ---------------------- Search ----------------------
+# Index a document once (by content hash), then query it by id.
+
+def _check_doc_id(doc_id: str):
+    if not re.fullmatch(r"[0-9a-f]{64}", doc_id):
+        raise HTTPException(400, "Invalid document id")
+
+
+@router.post("/search-index")
+async def create_search_index(file: UploadFile = File(...)):
+    """
+    Build (or reuse) the full-text index of the uploaded PDF.
+    Scanned pages are indexed from OCR text. Returns the document id to query.
+    """
+    from ..services.pdf_search import build_and_store, loaded_indexes, summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = os.path.join(tmp, "in.pdf")
+        upload = await spool_upload(file, tmp_path)
+
+        index = await asyncio.to_thread(loaded_indexes.get, upload.sha256)
+        if index is not None:
+            info = summary(index)
+        else:
+            info = await run_conversion("pdf-search-index", build_and_store, tmp_path, upload.sha256)
+
+    return {"doc_id": upload.sha256, **info}
+
+
+@router.get("/search/{doc_id}")
+async def search_document(doc_id: str, q: str, limit: int = 100):
+    """
+    Find a word or phrase; returns hit rectangles (PDF points, top-left origin) per page.
+    """
+    _check_doc_id(doc_id)
+    if limit < 1:
+        raise HTTPException(400, "limit must be positive")
+    from ..services.pdf_search import search_document as run_search
+
+    # Loading the index and matching long postings lists are both blocking work
+    result = await asyncio.to_thread(run_search, doc_id, q, limit)
+    if result is None:
+        raise HTTPException(404, "No search index for this document; POST it to /pdf-edit/search-index")
+    return result
+
+
+# ---------------------- Edit sessions ----------------------
+# Upload once, then extract / update / download against the parsed document
+# kept on the server, instead of re-sending the whole PDF on every call.
+
+async def _in_session(method, session_id: str, *args):
+    try:
+        return await asyncio.to_thread(method, session_id, *args)
+    except KeyError:
+        raise HTTPException(404, "Edit session not found or expired")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+@router.post("/sessions")
+async def create_session(file: UploadFile = File(...)):
+    """
+    Start an edit session for the uploaded PDF.
+    """
+    session_id, path = edit_sessions.reserve()
+    try:
+        await spool_upload(file, path)
+        return await asyncio.to_thread(edit_sessions.register, session_id, file.filename or "document.pdf")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+        raise
+
+
+@router.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    return await _in_session(edit_sessions.info, session_id)
+
+
+@router.get("/sessions/{session_id}/text")
+async def session_text(session_id: str, first_page: int = 1, last_page: int | None = None, compact: bool = False):
+    """
+    Text of the session's current document, for a window of pages (see /extract).
+    """
+    _check_window(first_page, last_page)
+    from ..services.pdf_edit import extract_window
+    return await _in_session(edit_sessions.read, session_id, extract_window, first_page, last_page, compact)
+
+
+@router.post("/sessions/{session_id}/updates")
+async def session_updates(session_id: str, updates: List[dict] = Body(...)):
+    """
+    Apply a batch of text updates (same format as /update) to the session's document.
+    """
+    from ..services.pdf_edit import apply_updates
+    _, version = await _in_session(edit_sessions.edit, session_id, apply_updates, updates)
+    return {"applied": len(updates), "version": version}
+
+
+@router.get("/sessions/{session_id}/download")
+async def session_download(request: Request, session_id: str, delivery: str | None = None):
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "out.pdf")
+        filename = await _in_session(edit_sessions.export, session_id, out_path)
+        return deliver_file(request, delivery, out_path, f"edited_{Path(filename).name}")
+
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    if not await asyncio.to_thread(edit_sessions.delete, session_id):
+        raise HTTPException(404, "Edit session not found or expired")
+    return {"success": True}
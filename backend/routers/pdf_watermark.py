@@ -7,8 +7,10 @@ from tempfile import NamedTemporaryFile
 import os
 import json
 
-from backend.services.pdf_watermark import add_watermark_to_pdf
-from backend.schemas.pdf_watermark import WatermarkRequest, TextWatermark, ImageWatermark, GridOptions, InsertOptions
+from backend.core.uploads import spool_upload, MAX_IMAGE_UPLOAD_BYTES
+from backend.core.executor import run_conversion
+from backend.core.jobs import wants_async, enqueue_conversion
+from backend.schemas.pdf_watermark import parse_watermark_payload
 
 router = APIRouter(prefix="/api/convert/pdf-watermark", tags=["PDF Watermark"])
 
@@ -18,6 +20,7 @@ async def watermark_pdf(
     file: UploadFile = File(...),
     payload: str = Form(...),  # JSON string containing watermark + placement
     image: UploadFile | None = File(None),
+    mode: str | None = None,
 ):
     """
     Apply a text or image watermark to an uploaded PDF.
@@ -27,44 +30,42 @@ async def watermark_pdf(
 
     # Save uploaded PDF
     with NamedTemporaryFile(delete=False, suffix=".pdf") as input_pdf:
-        input_pdf.write(await file.read())
         input_pdf_path = input_pdf.name
+    await spool_upload(file, input_pdf_path)
 
     # Save optional watermark image
     image_path = None
     if image:
         ext = os.path.splitext(image.filename)[1]
         with NamedTemporaryFile(delete=False, suffix=ext) as img:
-            img.write(await image.read())
             image_path = img.name
+        await spool_upload(image, image_path, max_bytes=MAX_IMAGE_UPLOAD_BYTES)
 
-    # Parse JSON payload
+    # Parse JSON payload into watermark + placement objects
     try:
         payload_data = json.loads(payload)
-        watermark_data = payload_data["watermark"]
-        placement_data = payload_data["placement"]
-    except (json.JSONDecodeError, KeyError):
+        watermark, placement = parse_watermark_payload(payload_data)
+    except json.JSONDecodeError:
         return {"error": "Invalid payload structure"}
+    except ValueError as e:
+        return {"error": str(e)}
 
-    # Create watermark object
-    if watermark_data["type"] == "text":
-        watermark = TextWatermark(**watermark_data)
-    elif watermark_data["type"] == "image":
-        watermark = ImageWatermark(**watermark_data)
-    else:
-        return {"error": "Invalid watermark type"}
-
-    # Create placement object
-    if placement_data.get("mode") == "grid":
-        placement = GridOptions(**placement_data)
-    else:
-        placement = InsertOptions(**placement_data)
+    if wants_async(mode):
+        inputs = [input_pdf_path] + ([image_path] if image_path else [])
+        try:
+            return await enqueue_conversion("pdf-watermark", inputs, file.filename, {"payload": payload_data})
+        finally:
+            for path in inputs:
+                os.remove(path)
 
     # Output PDF path
     output_pdf_path = NamedTemporaryFile(delete=False, suffix=".pdf").name
 
     # Add watermark
-    add_watermark_to_pdf(
+    from backend.services.pdf_watermark import add_watermark_to_pdf
+    await run_conversion(
+        "pdf-watermark",
+        add_watermark_to_pdf,
         input_pdf=input_pdf_path,
         output_pdf=output_pdf_path,
         watermark=watermark,
@@ -42,3 +42,29 @@ class InsertOptions(BaseModel):
 class WatermarkRequest(BaseModel):
     watermark: TextWatermark | ImageWatermark
     placement: GridOptions | InsertOptions
+
+
+def parse_watermark_payload(payload: dict) -> tuple[TextWatermark | ImageWatermark, GridOptions | InsertOptions]:
+    """
+    Build watermark + placement models from the endpoint's JSON payload.
+    Raises ValueError for a malformed payload.
+    """
+    try:
+        watermark_data = payload["watermark"]
+        placement_data = payload["placement"]
+    except (KeyError, TypeError):
+        raise ValueError("Invalid payload structure")
+
+    if watermark_data.get("type") == "text":
+        watermark = TextWatermark(**watermark_data)
+    elif watermark_data.get("type") == "image":
+        watermark = ImageWatermark(**watermark_data)
+    else:
+        raise ValueError("Invalid watermark type")
+
+    if placement_data.get("mode") == "grid":
+        placement = GridOptions(**placement_data)
+    else:
+        placement = InsertOptions(**placement_data)
+
+    return watermark, placement
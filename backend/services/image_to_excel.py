@@ -1,12 +1,13 @@
 # backend/services/image_to_excel.py
 
 from PIL import Image
-import pytesseract
 from openpyxl import Workbook
 import cv2
 import numpy as np
 from collections import defaultdict
 
+from backend.utils.ocr_utils import ocr_image_with_data
+
 def preprocess_image(pil_image: Image.Image) -> np.ndarray:
     """Grayscale, denoise, threshold, and shadow removal for robust OCR."""
     img_cv = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2GRAY)
@@ -36,7 +37,7 @@ def image_to_excel(image_path: str, output_path: str) -> None:
     img_cv = preprocess_image(pil_image)
 
     # OCR with bounding box info
-    data = pytesseract.image_to_data(img_cv, output_type=pytesseract.Output.DICT)
+    data = ocr_image_with_data(img_cv)
 
     # Collect positions for clustering
     tops, lefts = [], []
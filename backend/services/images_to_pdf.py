@@ -6,11 +6,11 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from backend.utils.file_utils import encode_file_to_base64
 
-def convert_images_to_pdf(image_paths, pdf_path):
+def convert_images_to_pdf(image_paths, pdf_path, encode: bool = True):
     """
     Convert a list of images to a PDF.
     Images are scaled to fit the page while maintaining aspect ratio and centered.
-    Returns the PDF as a base64-encoded string.
+    Returns the PDF as a base64-encoded string, or the PDF path when encode=False.
     """
     c = canvas.Canvas(pdf_path, pagesize=letter)
     page_width, page_height = letter
@@ -41,4 +41,6 @@ def convert_images_to_pdf(image_paths, pdf_path):
         c.showPage()
 
     c.save()
+    if not encode:
+        return pdf_path
     return encode_file_to_base64(pdf_path)
@@ -4,8 +4,26 @@ import pikepdf
 import subprocess
 import os
 import io
+import math
+import logging
+import multiprocessing
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PIL import Image, ImageFile
 
+from backend.core.config import (
+    COMPRESS_WORKERS,
+    COMPRESS_MIN_IMAGE_PIXELS,
+    COMPRESS_TARGET_DPI,
+    GS_CHUNKED,
+    GS_CHUNK_MIN_PAGES,
+)
+from backend.utils.pdf_utils import dedupe_resources
+
+logger = logging.getLogger(__name__)
+
 # Allow Pillow to load truncated images (common in scanned PDFs)
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
@@ -43,23 +61,464 @@ def _run_ghostscript(input_pdf: Path, output_pdf: Path, compression_level: str =
     ]
     subprocess.run(cmd, check=True)
 
-def _recompress_images(pdf_path: Path, output_path: Path, quality: int = IMAGE_QUALITY):
-    """Recompress images inside PDF using Pillow"""
+# -----------------------
+# Chunked Ghostscript
+# -----------------------
+# Ghostscript processes running at once in this process, across all compressions
+_gs_slots = threading.BoundedSemaphore(COMPRESS_WORKERS)
+
+
+def _run_ghostscript_slot(input_pdf: Path, output_pdf: Path, compression_level: str):
+    with _gs_slots:
+        _run_ghostscript(input_pdf, output_pdf, compression_level)
+
+
+def _run_ghostscript_chunked(input_pdf: Path, output_pdf: Path, compression_level: str, workers: int):
+    """
+    Split into at most `workers` page chunks, compress the chunks with
+    concurrent Ghostscript processes (no more than COMPRESS_WORKERS at once in
+    this process), then stitch them back together with shared resources
+    deduplicated.
+    """
+    workdir = Path(tempfile.mkdtemp(dir=output_pdf.parent))
+    try:
+        with pikepdf.open(input_pdf) as pdf:
+            total = len(pdf.pages)
+            chunks = min(workers, max(total // (GS_CHUNK_MIN_PAGES // 2 or 1), 1))
+            size = -(-total // chunks)
+            parts = []
+            for i, start in enumerate(range(0, total, size)):
+                part = pikepdf.Pdf.new()
+                part.pages.extend(pdf.pages[start:start + size])
+                src = workdir / f"chunk_{i}.pdf"
+                part.save(src)
+                parts.append((src, workdir / f"chunk_{i}.gs.pdf"))
+
+        with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+            futures = [
+                pool.submit(_run_ghostscript_slot, src, dst, compression_level)
+                for src, dst in parts
+            ]
+            for future in futures:
+                future.result()
+
+        compressed = [pikepdf.open(dst) for _, dst in parts]
+        try:
+            # Swap the compressed content into the original document's pages, so
+            # outlines, page labels, /Names, forms and metadata (which point at
+            # those page objects) survive as they do in the single-pass path
+            with pikepdf.open(input_pdf) as out:
+                gs_pages = [(part, page) for part in compressed for page in part.pages]
+                if len(gs_pages) != len(out.pages):
+                    raise RuntimeError("Ghostscript changed the page count")
+                for page, (part, gs_page) in zip(out.pages, gs_pages):
+                    _swap_page_content(out, page, part, gs_page)
+                dedupe_resources(out.pages)
+                out.save(output_pdf, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        finally:
+            for part in compressed:
+                part.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Page entries taken from the Ghostscript output; everything else on the page
+# (annotations, structure parents, ...) is left as it was
+PAGE_CONTENT_KEYS = ("/Contents", "/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def _swap_page_content(pdf: pikepdf.Pdf, page: pikepdf.Page, source_pdf: pikepdf.Pdf, source: pikepdf.Page):
+    for key in PAGE_CONTENT_KEYS:
+        if key not in source.obj:
+            if key in page.obj:
+                del page.obj[key]
+            continue
+        value = source.obj[key]
+        if isinstance(value, (pikepdf.Dictionary, pikepdf.Array)) and not value.is_indirect:
+            # copy_foreign only takes indirect objects
+            value = source_pdf.make_indirect(value)
+        page.obj[key] = pdf.copy_foreign(value) if isinstance(value, pikepdf.Object) else value
+
+
+def _compress_with_ghostscript(input_pdf: Path, output_pdf: Path, compression_level: str, chunked: bool):
+    if chunked and COMPRESS_WORKERS > 1:
+        with pikepdf.open(input_pdf) as pdf:
+            pages = len(pdf.pages)
+        if pages >= GS_CHUNK_MIN_PAGES:
+            _run_ghostscript_chunked(input_pdf, output_pdf, compression_level, COMPRESS_WORKERS)
+            return
+    _run_ghostscript(input_pdf, output_pdf, compression_level=compression_level)
+
+
+# -----------------------
+# Image recompression
+# -----------------------
+# Fewer images than this are recompressed in-process (pool start-up isn't worth it)
+PARALLEL_MIN_IMAGES = 8
+
+
+def _iter_image_xobjects(resources, seen: set):
+    """
+    Yield image XObjects reachable from a resource dictionary, descending into
+    Form XObjects. Each object is yielded once.
+    """
+    xobjects = resources.get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return
+    for _, obj in xobjects.items():
+        if not isinstance(obj, pikepdf.Stream) or obj.objgen in seen:
+            continue
+        seen.add(obj.objgen)
+        subtype = obj.get("/Subtype")
+        if subtype == pikepdf.Name.Image:
+            yield obj
+        elif subtype == pikepdf.Name.Form:
+            yield from _iter_image_xobjects(obj.get("/Resources"), seen)
+
+
+def _worth_recompressing(obj: pikepdf.Stream) -> bool:
+    if obj.get("/ImageMask", False):
+        return False
+    # Bilevel / low bit-depth images are already tiny and JPEG would ruin them
+    if int(obj.get("/BitsPerComponent", 8)) < 8:
+        return False
+    return int(obj.get("/Width", 0)) * int(obj.get("/Height", 0)) >= COMPRESS_MIN_IMAGE_PIXELS
+
+
+def _unique_images(pdf: pikepdf.Pdf) -> list[tuple[int, int]]:
+    """
+    Object ids of the images worth recompressing, each listed once however
+    many pages use it. Soft masks and stencil masks are excluded.
+    """
+    seen, masks, images = set(), set(), []
+    for page in pdf.pages:
+        for obj in _iter_image_xobjects(page.obj.get("/Resources"), seen):
+            for key in ("/SMask", "/Mask"):
+                mask = obj.get(key)
+                if isinstance(mask, pikepdf.Stream):
+                    masks.add(mask.objgen)
+            images.append(obj)
+    return [obj.objgen for obj in images if obj.objgen not in masks and _worth_recompressing(obj)]
+
+
+# -----------------------
+# Placement-aware downsampling
+# -----------------------
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+# Only downsample when the image exceeds the target DPI by this factor
+DOWNSAMPLE_THRESHOLD = 1.5
+# Nesting limit for Form XObjects (guards against reference cycles)
+MAX_FORM_DEPTH = 8
+
+
+def _parse_target_dpi(spec: str) -> dict[str, int]:
+    """
+    Parse "light=300,medium=150,max=96" into {"light": 300, ...}.
+    """
+    targets = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        level, value = part.split("=", 1)
+        try:
+            targets[level.strip()] = int(value)
+        except ValueError:
+            logger.warning("Ignoring invalid target DPI %r", part)
+    return targets
+
+
+TARGET_DPI = _parse_target_dpi(COMPRESS_TARGET_DPI)
+
+
+def _multiply(m1: tuple, m2: tuple) -> tuple:
+    # PDF matrices [a b c d e f]; m1 applied first, then m2
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2,
+    )
+
+
+def _walk_placements(owner, resources, ctm: tuple, depth: int, sizes: dict, unknown: set):
+    """
+    Follow q/Q/cm through a content stream and record, for every image drawn
+    with Do, its largest displayed size in inches. Form XObjects are entered
+    with their /Matrix applied.
+    """
+    xobjects = resources.get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return
+
+    try:
+        instructions = pikepdf.parse_content_stream(owner)
+    except Exception:
+        # Can't tell how these are placed; leave them at full resolution
+        unknown.update(obj.objgen for _, obj in xobjects.items() if isinstance(obj, pikepdf.Stream))
+        return
+
+    stack = []
+    for operands, operator in instructions:
+        op = str(operator)
+        if op == "q":
+            stack.append(ctm)
+        elif op == "Q":
+            ctm = stack.pop() if stack else ctm
+        elif op == "cm" and len(operands) == 6:
+            ctm = _multiply(tuple(float(x) for x in operands), ctm)
+        elif op == "Do" and operands:
+            xobj = xobjects.get(operands[0])
+            if not isinstance(xobj, pikepdf.Stream):
+                continue
+            subtype = xobj.get("/Subtype")
+            if subtype == pikepdf.Name.Image:
+                # The image fills the unit square; its sides map to the CTM's axes
+                width = math.hypot(ctm[0], ctm[1]) / 72
+                height = math.hypot(ctm[2], ctm[3]) / 72
+                prev_w, prev_h = sizes.get(xobj.objgen, (0.0, 0.0))
+                sizes[xobj.objgen] = (max(prev_w, width), max(prev_h, height))
+            elif subtype == pikepdf.Name.Form and depth < MAX_FORM_DEPTH:
+                matrix = tuple(float(x) for x in xobj.get("/Matrix", IDENTITY))
+                _walk_placements(
+                    xobj, xobj.get("/Resources", resources), _multiply(matrix, ctm), depth + 1, sizes, unknown
+                )
+
+
+def _placement_scales(pdf: pikepdf.Pdf, objgens: list[tuple[int, int]], target_dpi: int) -> dict:
+    """
+    Downsample factor per image so that, at its largest placement in the
+    document, it is rendered at about `target_dpi`. Images whose placement
+    is unknown (or never drawn from a page) keep their resolution.
+    """
+    sizes, unknown = {}, set()
+    for page in pdf.pages:
+        _walk_placements(page, page.resources, IDENTITY, 0, sizes, unknown)
+
+    scales = {}
+    for objgen in objgens:
+        if objgen in unknown or objgen not in sizes:
+            continue
+        width_in, height_in = sizes[objgen]
+        if width_in <= 0 or height_in <= 0:
+            continue
+        obj = pdf.get_object(objgen)
+        # Effective DPI along the less dense axis
+        dpi = min(int(obj.Width) / width_in, int(obj.Height) / height_in)
+        if dpi > target_dpi * DOWNSAMPLE_THRESHOLD:
+            scales[objgen] = target_dpi / dpi
+    return scales
+
+
+def _encode_jpeg(pil_img: Image.Image, quality: int, scale: float = 1.0) -> tuple[bytes, str, tuple[int, int]]:
+    """
+    JPEG-encode an image, downsampled by `scale` first.
+    Returns (data, PIL mode, (width, height)).
+    """
+    if pil_img.mode not in ("RGB", "L"):
+        pil_img = pil_img.convert("RGB")
+    if scale < 1.0:
+        size = (max(1, round(pil_img.width * scale)), max(1, round(pil_img.height * scale)))
+        pil_img = pil_img.resize(size, Image.LANCZOS)
+    buf = io.BytesIO()
+    pil_img.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue(), pil_img.mode, pil_img.size
+
+
+def _recompress_batch(pdf_path: str, items: list[tuple], quality: int) -> list[tuple]:
+    """
+    Re-encode a batch of (objgen, scale) images as JPEG (runs in a worker process).
+    Returns (objgen, jpeg bytes, PIL mode, size) only for images that got smaller.
+    """
+    results = []
     with pikepdf.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            images = dict(page.images)
-            for name, img_obj in images.items():
-                try:
-                    img = pikepdf.PdfImage(img_obj)
-                    pil_img = img.as_pil_image()
-                    buf = io.BytesIO()
-                    pil_img.save(buf, format="JPEG", quality=quality, optimize=True)
-                    buf.seek(0)
-                    img_obj.stream = buf.read()
-                except Exception as e:
-                    # Skip images that Pillow cannot process
-                    print(f"Warning: Failed to recompress an image: {e}")
-        pdf.save(output_path)
+        for objgen, scale in items:
+            try:
+                obj = pdf.get_object(objgen)
+                pil_img = pikepdf.PdfImage(obj).as_pil_image()
+                data, mode, size = _encode_jpeg(pil_img, quality, scale)
+                if len(data) < len(obj.read_raw_bytes()):
+                    results.append((objgen, data, mode, size))
+            except Exception as e:
+                # Skip images that Pillow cannot process
+                logger.warning("Failed to recompress image %s: %s", objgen, e)
+    return results
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _recompress_pool() -> ProcessPoolExecutor:
+    """
+    This process's image recompression pool (COMPRESS_WORKERS processes),
+    created on first use and reused by every later compression.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=COMPRESS_WORKERS, mp_context=_mp_context())
+        return _pool
+
+
+def _recompress_all(pdf_path: Path, items: list[tuple], quality: int) -> list[tuple]:
+    workers = min(COMPRESS_WORKERS, len(items))
+    if workers <= 1 or len(items) < PARALLEL_MIN_IMAGES:
+        return _recompress_batch(str(pdf_path), items, quality)
+
+    # A few batches per worker so one slow image doesn't hold up a whole share
+    size = max(1, -(-len(items) // (workers * 4)))
+    batches = [items[i:i + size] for i in range(0, len(items), size)]
+    results = []
+    n = len(batches)
+    for batch in _recompress_pool().map(_recompress_batch, [str(pdf_path)] * n, batches, [quality] * n):
+        results.extend(batch)
+    return results
+
+
+def _recompress_images(
+    pdf_path: Path,
+    output_path: Path,
+    quality: int = IMAGE_QUALITY,
+    scale: float = 1.0,
+    target_dpi: int | None = None,
+):
+    """
+    Recompress the document's images as JPEG.
+    Each image object is processed once (shared logos and backgrounds are not
+    re-encoded per page), batches run in the process's recompression pool
+    when COMPRESS_WORKERS > 1, and the new stream is
+    kept only when it is smaller than the original.
+    Images are downsampled by `scale`, and further to `target_dpi` at their
+    largest displayed size when given.
+    """
+    with pikepdf.open(pdf_path) as pdf:
+        objgens = _unique_images(pdf)
+        placement = _placement_scales(pdf, objgens, target_dpi) if target_dpi else {}
+        items = [(og, min(scale, placement.get(og, 1.0))) for og in objgens]
+        for objgen, data, mode, (width, height) in _recompress_all(pdf_path, items, quality):
+            obj = pdf.get_object(objgen)
+            obj.write(data, filter=pikepdf.Name.DCTDecode)
+            obj.ColorSpace = pikepdf.Name.DeviceGray if mode == "L" else pikepdf.Name.DeviceRGB
+            obj.BitsPerComponent = 8
+            obj.Width = width
+            obj.Height = height
+            for key in ("/DecodeParms", "/Decode"):
+                if key in obj:
+                    del obj[key]
+        pdf.save(output_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+
+# -----------------------
+# Target-size mode
+# -----------------------
+# (JPEG quality, downsample factor, cap at the level's placement DPI), least lossy
+# first: quality alone, then placement-based downsampling, then further scaling
+TARGET_SETTINGS = [
+    (85, 1.0, False), (75, 1.0, False), (65, 1.0, False), (50, 1.0, False),
+    (50, 1.0, True), (50, 0.75, True), (40, 0.75, True), (35, 0.5, True), (25, 0.5, True), (20, 0.35, True),
+]
+# Images encoded per setting to estimate the whole document
+TARGET_SAMPLE_IMAGES = 12
+# Aim a little under the target; the estimate is extrapolated from a sample
+TARGET_MARGIN = 0.95
+
+
+def _choose_setting(pdf_path: Path, target_bytes: int, target_dpi: int | None = None) -> int:
+    """
+    Index into TARGET_SETTINGS of the least lossy setting expected to bring
+    the file under `target_bytes`, by encoding a size-spread sample of its
+    images at each setting and extrapolating to all images. Non-image bytes
+    are assumed fixed. Settings that cap images at `target_dpi` (their
+    placement-based resolution) include it in the estimate.
+    """
+    file_size = pdf_path.stat().st_size
+    encoded = [0] * len(TARGET_SETTINGS)
+    sample_bytes = 0
+    with pikepdf.open(pdf_path) as pdf:
+        objgens = _unique_images(pdf)
+        placement = _placement_scales(pdf, objgens, target_dpi) if target_dpi else {}
+        raw = {og: len(pdf.get_object(og).read_raw_bytes()) for og in objgens}
+        image_bytes = sum(raw.values())
+        fixed_bytes = file_size - image_bytes
+
+        # Spread the sample across small to large images, always including the largest
+        ordered = sorted(objgens, key=raw.get)
+        step = max(len(ordered) // TARGET_SAMPLE_IMAGES, 1)
+        sample = set(ordered[::step][:TARGET_SAMPLE_IMAGES - 1] + ordered[-1:])
+
+        # One decoded image at a time: encode it at every setting, then drop it
+        for og in sample:
+            try:
+                img = pikepdf.PdfImage(pdf.get_object(og)).as_pil_image()
+            except Exception:
+                continue
+            sample_bytes += raw[og]
+            for i, (quality, scale, capped) in enumerate(TARGET_SETTINGS):
+                if capped:
+                    scale = min(scale, placement.get(og, 1.0))
+                # Images that would grow are left as they are
+                size = len(_encode_jpeg(img, quality, scale)[0])
+                encoded[i] += min(size, raw[og])
+            del img
+
+    if not sample_bytes:
+        # No images to work with: only the strongest setting has a chance
+        return len(TARGET_SETTINGS) - 1
+
+    for i, (quality, scale, capped) in enumerate(TARGET_SETTINGS):
+        estimate = fixed_bytes + image_bytes * encoded[i] / sample_bytes
+        if estimate <= target_bytes * TARGET_MARGIN:
+            logger.info(
+                "Target %d bytes: quality=%d scale=%.2f dpi cap=%s (estimate %d)",
+                target_bytes, quality, scale, capped, estimate,
+            )
+            return i
+
+    logger.info("Target %d bytes looks unreachable; using the strongest setting", target_bytes)
+    return len(TARGET_SETTINGS) - 1
+
+
+def _compress_to_target(pdf_path: Path, output_path: Path, target_bytes: int, target_dpi: int | None) -> bool:
+    """
+    Recompress at the estimated setting and measure the result; if it is
+    still over target, make one more full pass at the next stronger setting.
+    A file already under the target is copied as it is.
+    Returns whether the target was met.
+    """
+    if pdf_path.stat().st_size <= target_bytes:
+        shutil.copyfile(pdf_path, output_path)
+        return True
+
+    setting = _choose_setting(pdf_path, target_bytes, target_dpi)
+    for attempt in range(2):
+        quality, scale, capped = TARGET_SETTINGS[setting]
+        _recompress_images(
+            pdf_path, output_path, quality=quality, scale=scale, target_dpi=target_dpi if capped else None
+        )
+        size = output_path.stat().st_size
+        if size <= target_bytes or setting == len(TARGET_SETTINGS) - 1:
+            break
+        if attempt == 0:
+            logger.info("Target %d bytes missed (%d bytes); retrying one setting stronger", target_bytes, size)
+            setting += 1
+
+    if size > target_bytes:
+        logger.warning(
+            "Target %d bytes not reached: %d bytes at quality=%d scale=%.2f dpi cap=%s",
+            target_bytes, size, quality, scale, capped,
+        )
+        return False
+    return True
+
 
 def compress_pdf(
     input_path: str,
@@ -68,16 +527,35 @@ def compress_pdf(
     select_pages: str = "",
     recompress_images: bool = True,
     compression_level: str = "max",  # light | medium | max
+    chunked: bool | None = None,
+    target_bytes: int | None = None,
 ):
     """
     Compress PDF for maximum file reduction.
     Steps:
     1. Remove metadata & annotations (PikePDF)
     2. Optional image recompression
-    3. Ghostscript compression
+    3. Ghostscript compression (in parallel page chunks for large documents
+       unless chunked=False; defaults to GS_CHUNKED)
+
+    With target_bytes, steps 2-3 are replaced by image recompression at the
+    least lossy setting estimated to fit the target (see _choose_setting),
+    checked against the real size and retried once one setting stronger.
+    Lowering JPEG quality is tried before the level's placement DPI cap, and
+    a document already under the target is returned unchanged.
+    The result can still exceed an unreachable target (logged as a warning).
+    Target mode works by recompressing images, so it requires
+    recompress_images=True.
     """
+    if target_bytes and not recompress_images:
+        raise ValueError("target_bytes requires recompress_images")
+
     input_path = Path(input_path)
     output_path = Path(output_path)
+
+    # Already small enough: nothing to trade quality for
+    if target_bytes and not select_pages and input_path.stat().st_size <= target_bytes:
+        return str(input_path), input_path.stat().st_size
     tmp_pdf = output_path.with_suffix(".tmp.pdf")
 
     # -----------------------
@@ -120,12 +598,22 @@ def compress_pdf(
 
         pdf.save(tmp_pdf)
 
+    # -----------------------
+    # Target-size mode
+    # -----------------------
+    target_dpi = TARGET_DPI.get(compression_level)
+
+    if target_bytes:
+        _compress_to_target(tmp_pdf, output_path, target_bytes, target_dpi)
+        tmp_pdf.unlink(missing_ok=True)
+        return _smaller_of(input_path, output_path)
+
     # -----------------------
     # Optional image recompression
     # -----------------------
     if recompress_images:
         tmp_recomp = output_path.with_suffix(".recomp.pdf")
-        _recompress_images(tmp_pdf, tmp_recomp, quality=IMAGE_QUALITY)
+        _recompress_images(tmp_pdf, tmp_recomp, quality=IMAGE_QUALITY, target_dpi=target_dpi)
         tmp_pdf.unlink(missing_ok=True)
         tmp_pdf = tmp_recomp
 
@@ -133,16 +621,23 @@ def compress_pdf(
     # Ghostscript compression
     # -----------------------
     try:
-        _run_ghostscript(tmp_pdf, output_path, compression_level=compression_level)
+        _compress_with_ghostscript(
+            tmp_pdf, output_path, compression_level, GS_CHUNKED if chunked is None else chunked
+        )
         tmp_pdf.unlink(missing_ok=True)
     except Exception as e:
         # fallback to PikePDF-compressed PDF if Ghostscript fails
-        print(f"Warning: Ghostscript compression failed: {e}")
+        logger.warning("Ghostscript compression failed: %s", e)
         output_path = tmp_pdf
 
-    # -----------------------
-    # Size check
-    # -----------------------
+    return _smaller_of(input_path, output_path)
+
+
+def _smaller_of(input_path: Path, output_path: Path):
+    """
+    Size check: (path, size) of the output, or of the input when compressing
+    didn't make it smaller.
+    """
     in_size = input_path.stat().st_size
     out_size = output_path.stat().st_size
 
@@ -3,36 +3,101 @@
 import fitz  # PyMuPDF
 from typing import List
 
-def get_pdf_text(file_path: str):
+from backend.utils.pdf_utils import open_for_update
+
+# Text only: leave out image blocks (and their decoded bytes)
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Order of the fields in a compact span
+SPAN_FIELDS = ["text", "x0", "y0", "x1", "y1", "font", "size"]
+
+
+def page_spans(page: fitz.Page) -> list[list]:
     """
-    Extract text and coordinates from PDF.
-    Returns a list of pages, each containing text blocks with bbox, font, and size.
+    Text spans of one page as compact arrays (see SPAN_FIELDS).
     """
-    doc = fitz.open(file_path)
-    pages = []
+    spans = []
+    for b in page.get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+        for line in b.get("lines", ()):
+            for span in line["spans"]:
+                x0, y0, x1, y1 = span["bbox"]
+                spans.append([
+                    span["text"],
+                    round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2),
+                    span.get("font", "helv"),
+                    round(span.get("size", 12), 2),
+                ])
+    return spans
+
 
-    for page_num, page in enumerate(doc):
-        blocks = page.get_text("dict")["blocks"]
-        page_blocks = []
-
-        for b in blocks:
-            if "lines" in b:
-                for line in b["lines"]:
-                    for span in line["spans"]:
-                        page_blocks.append({
-                            "text": span["text"],
-                            "bbox": span["bbox"],
-                            "font": span.get("font", "helv"),
-                            "size": span.get("size", 12)
-                        })
-        pages.append(page_blocks)
+def expand_spans(spans: list[list]) -> list[dict]:
+    """
+    Compact spans back to the original {"text", "bbox", "font", "size"} form.
+    """
+    return [
+        {"text": text, "bbox": [x0, y0, x1, y1], "font": font, "size": size}
+        for text, x0, y0, x1, y1, font, size in spans
+    ]
+
+
+def _window(doc: fitz.Document, first_page: int, last_page: int | None) -> range:
+    # 1-indexed, inclusive, clamped to the document
+    return range(max(first_page, 1), min(last_page or doc.page_count, doc.page_count) + 1)
+
+
+def extract_pages(doc: fitz.Document, first_page: int = 1, last_page: int | None = None, compact: bool = False):
+    """
+    Text spans of pages first_page..last_page (1-indexed, inclusive) of an open document.
+    """
+    pages = []
+    for page_num in _window(doc, first_page, last_page):
+        spans = page_spans(doc[page_num - 1])
+        pages.append(spans if compact else expand_spans(spans))
     return pages
 
 
+def extract_window(doc: fitz.Document, first_page: int = 1, last_page: int | None = None, compact: bool = False):
+    """
+    extract_pages with the window and page count, in the /extract response shape.
+    """
+    window = _window(doc, first_page, last_page)
+    return {
+        "pages": extract_pages(doc, first_page, last_page, compact),
+        "first_page": first_page,
+        "last_page": window.stop - 1,
+        "page_count": doc.page_count,
+    }
+
+
+def get_pdf_text(file_path: str, first_page: int = 1, last_page: int | None = None, compact: bool = False):
+    """
+    Extract text and coordinates from PDF.
+    Returns a list of pages, each containing text blocks with bbox, font, and size
+    (or compact [text, x0, y0, x1, y1, font, size] arrays).
+    """
+    with fitz.open(file_path) as doc:
+        return extract_pages(doc, first_page, last_page, compact)
+
+
+def extract_page_spans(
+    file_path: str, first_page: int = 1, last_page: int | None = None, skip: list[int] = ()
+) -> tuple[int, dict[int, list]]:
+    """
+    (page count, {page: compact spans}) for the window, leaving out the pages
+    in `skip` (already cached by the caller).
+    """
+    skip = set(skip)
+    with fitz.open(file_path) as doc:
+        return doc.page_count, {
+            p: page_spans(doc[p - 1]) for p in _window(doc, first_page, last_page) if p not in skip
+        }
+
+
 def update_pdf_text(
     file_path: str,
     updates: List[dict],
     output_path: str,
+    incremental: bool = True,
 ):
     """
     updates = [
@@ -44,8 +109,28 @@ def update_pdf_text(
             "size": 12       # optional
         },
     ]
+    incremental: append only the changed pages to the original bytes
+    instead of rewriting the whole file.
     """
-    doc = fitz.open(file_path)
+    with open_for_update(file_path, output_path, incremental=incremental) as doc:
+        apply_updates(doc, updates)
+    return output_path
+
+
+def apply_updates(doc: fitz.Document, updates: List[dict]):
+    """
+    Apply text updates (see update_pdf_text) to an open document.
+    The whole batch is validated before anything is drawn.
+    """
+    if not isinstance(updates, list):
+        raise ValueError("Updates must be a list")
+    for u in updates:
+        if not isinstance(u, dict):
+            raise ValueError("Each update must be an object")
+        if not isinstance(u.get("page"), int) or not 0 <= u["page"] < doc.page_count:
+            raise ValueError(f"Invalid page {u.get('page')!r}")
+        if len(u.get("bbox") or ()) != 4 or "text" not in u:
+            raise ValueError("Each update needs a bbox [x0, y0, x1, y1] and text")
 
     for u in updates:
         page = doc[u["page"]]
@@ -66,6 +151,3 @@ def update_pdf_text(
             color=(0, 0, 0),
             align=0  # left-aligned
         )
-
-    doc.save(output_path)
-    return output_path
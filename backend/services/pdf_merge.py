@@ -1,8 +1,153 @@
-from PyPDF2 import PdfMerger
+# backend/services/pdf_merge.py
+
+import logging
+import shutil
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+
+import pikepdf
+
+from backend.core.config import MERGE_BATCH_SIZE
+from backend.utils.pdf_utils import dedupe_resources
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_CATEGORIES = ("/Font", "/XObject")
+
+
+def _foreign(merged: pikepdf.Pdf, src: pikepdf.Pdf, obj):
+    """
+    Copy `obj` from `src` into the merged file. References to pages already
+    appended resolve to their merged copies.
+    """
+    if not isinstance(obj, pikepdf.Object):
+        return obj
+    if not obj.is_indirect:
+        # copy_foreign only takes indirect objects; this only touches the open source
+        obj = src.make_indirect(obj)
+    return merged.copy_foreign(obj)
+
+
+def _copy_outline(merged: pikepdf.Pdf, src: pikepdf.Pdf, item: pikepdf.OutlineItem) -> pikepdf.OutlineItem:
+    destination = item.destination
+    if isinstance(destination, pikepdf.Array):
+        destination = _foreign(merged, src, destination)
+    copy = pikepdf.OutlineItem(
+        item.title,
+        destination=destination,
+        action=_foreign(merged, src, item.action) if item.action is not None else None,
+    )
+    copy.is_closed = item.is_closed
+    copy.children.extend(_copy_outline(merged, src, child) for child in item.children)
+    return copy
+
+
+def _named_destinations(pdf: pikepdf.Pdf):
+    """
+    (name, destination) pairs from the name tree and the legacy /Dests dictionary.
+    """
+    names = pdf.Root.get("/Names")
+    if names is not None and "/Dests" in names:
+        yield from pikepdf.NameTree(names.Dests).items()
+    if "/Dests" in pdf.Root:
+        yield from ((str(key)[1:], value) for key, value in pdf.Root.Dests.items())
+
+
+def _copy_named_destinations(merged: pikepdf.Pdf, src: pikepdf.Pdf, dests: dict):
+    """
+    Collect the source's named destinations into `dests`.
+    The first input to define a name keeps it.
+    """
+    for name, value in _named_destinations(src):
+        if name in dests:
+            logger.debug("Named destination %r already merged; keeping the first", name)
+            continue
+        dests[name] = _foreign(merged, src, value)
+
+
+def _write_navigation(merged: pikepdf.Pdf, outline_items: list, dests: dict):
+    if outline_items:
+        with merged.open_outline() as outline:
+            outline.root.extend(outline_items)
+    if dests:
+        tree = pikepdf.NameTree.new(merged)
+        for name, value in dests.items():
+            tree[name] = value
+        merged.Root.Names = pikepdf.Dictionary(Dests=tree.obj)
+
+
+def _resource_locations(merged: pikepdf.Pdf, canonical: dict) -> dict:
+    """
+    Where each canonical font / XObject is used, as (page index, category, name),
+    so it can be found again once the merged file is saved and reopened.
+    """
+    found = {}
+    for index, page in enumerate(merged.pages):
+        resources = page.obj.get("/Resources")
+        if resources is None:
+            continue
+        for category in RESOURCE_CATEGORIES:
+            for name, obj in (resources.get(category) or {}).items():
+                if obj.is_indirect:
+                    found.setdefault(obj.objgen, (index, category, name))
+    return {key: found[obj.objgen] for key, obj in canonical.items() if obj.objgen in found}
+
+
+def _resolve_locations(merged: pikepdf.Pdf, locations: dict) -> dict:
+    return {
+        key: merged.pages[index].obj.Resources[category][name]
+        for key, (index, category, name) in locations.items()
+    }
+
 
 def merge_pdfs(pdf_paths: list[str], out_path: str):
-    merger = PdfMerger()
-    for path in pdf_paths:
-        merger.append(path)
-    merger.write(out_path)
-    merger.close()
+    """
+    Append the inputs in order, keeping their outlines (bookmarks, pointed
+    at the merged pages) and named destinations. Fonts and images identical
+    to ones already merged are shared instead of copied again, and the output
+    is written with object streams.
+
+    Inputs are merged MERGE_BATCH_SIZE at a time: stream data is copied from
+    the open sources while saving, so after each batch the merged pages are
+    written to a temporary file and reopened, and the batch's sources are
+    closed. At most one batch of inputs is open at once, however many there are.
+    """
+    batches = [pdf_paths[i:i + MERGE_BATCH_SIZE] for i in range(0, len(pdf_paths), MERGE_BATCH_SIZE)] or [[]]
+    workdir = Path(tempfile.mkdtemp(dir=Path(out_path).parent))
+    memo, canonical, dests = {}, {}, {}
+    merged = pikepdf.Pdf.new()
+    try:
+        for n, batch in enumerate(batches):
+            last = n == len(batches) - 1
+            outline_items = []
+            with ExitStack() as stack:
+                for path in batch:
+                    src = stack.enter_context(pikepdf.open(path))
+                    start = len(merged.pages)
+                    merged.pages.extend(src.pages)
+                    dedupe_resources(merged.pages[start:], memo, canonical)
+
+                    with src.open_outline() as outline:
+                        outline_items.extend(_copy_outline(merged, src, item) for item in outline.root)
+                    _copy_named_destinations(merged, src, dests)
+
+                _write_navigation(merged, outline_items, dests)
+                if last:
+                    merged.save(out_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+                    break
+
+                locations = _resource_locations(merged, canonical)
+                spill = workdir / f"merged_{n}.pdf"
+                merged.save(spill)
+
+            # The batch's sources are closed; continue from the saved pages
+            merged.close()
+            merged = pikepdf.open(spill)
+            if n:
+                (workdir / f"merged_{n - 1}.pdf").unlink()
+            canonical, memo = _resolve_locations(merged, locations), {}
+            dests = dict(_named_destinations(merged))
+    finally:
+        merged.close()
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -1,36 +1,102 @@
 #  backend\services\pdf_rotate.py
 
+import json
 from pathlib import Path
-from PyPDF2 import PdfReader, PdfWriter
 
-def rotate_pdf(input_path: str, output_path: str, angle: int = 90) -> str:
+import fitz
+
+from backend.utils.pdf_utils import open_for_update
+
+ANGLES = (90, 180, 270)
+
+
+def parse_rotation_spec(spec: dict | str) -> dict[str, int]:
+    """
+    Validate a per-page rotation spec such as {"1-3": 90, "7": 180}
+    (a dict or its JSON string). Keys are 1-indexed pages or inclusive ranges.
+    """
+    if isinstance(spec, str):
+        try:
+            spec = json.loads(spec)
+        except json.JSONDecodeError:
+            raise ValueError("Page rotations must be a JSON object")
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError("Page rotations must be a non-empty object")
+
+    rotations = {}
+    for key, angle in spec.items():
+        start, _, end = str(key).partition("-")
+        try:
+            first, last = int(start), int(end or start)
+            angle = int(angle)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid page rotation {key!r}: {angle!r}")
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range {key!r}")
+        if angle not in ANGLES:
+            raise ValueError("Rotation angle must be 90, 180, or 270 degrees")
+        rotations[f"{first}-{last}"] = angle
+    return rotations
+
+
+def _page_angles(rotations: dict[str, int], page_count: int) -> dict[int, int]:
+    # Later entries win where ranges overlap
+    angles = {}
+    for key, angle in rotations.items():
+        first, last = map(int, key.split("-"))
+        if last > page_count:
+            raise ValueError(f"Page range {key} is outside the document (1-{page_count})")
+        for page in range(first, last + 1):
+            angles[page - 1] = angle
+    return angles
+
+
+def check_rotation_pages(rotations: dict[str, int], pdf_path: str):
+    """
+    Raise ValueError if a range in `rotations` goes past the last page of the PDF.
     """
-    Rotate all pages of a PDF by a specified angle.
+    with fitz.open(pdf_path) as doc:
+        _page_angles(rotations, doc.page_count)
+
+
+def rotate_pdf(
+    input_path: str,
+    output_path: str,
+    angle: int = 90,
+    pages: dict | str | None = None,
+    incremental: bool = True,
+) -> str:
+    """
+    Rotate the pages of a PDF.
 
     Args:
         input_path (str): Path to the input PDF.
         output_path (str): Path to save the rotated PDF.
-        angle (int): Rotation angle (90, 180, 270 degrees).
+        angle (int): Rotation angle (90, 180, 270 degrees) applied to every page
+            when `pages` is not given.
+        pages: Per-page rotations, e.g. {"1-3": 90, "7": 180}; other pages are left as-is.
+        incremental (bool): Append only the changed page objects to the original
+            bytes instead of rewriting the document.
 
     Returns:
         str: Path to the rotated PDF.
     """
-    if angle not in (90, 180, 270):
+    rotations = parse_rotation_spec(pages) if pages else None
+    if rotations is None and angle not in ANGLES:
         raise ValueError("Rotation angle must be 90, 180, or 270 degrees")
 
     input_path = Path(input_path)
     output_path = Path(output_path)
 
-    reader = PdfReader(str(input_path))
-    writer = PdfWriter()
-
-    for page in reader.pages:
-        # Rotate page
-        page.rotate(angle)
-        writer.add_page(page)
+    with open_for_update(input_path, output_path, incremental=incremental) as doc:
+        if rotations is None:
+            angles = dict.fromkeys(range(doc.page_count), angle)
+        else:
+            angles = _page_angles(rotations, doc.page_count)
 
-    # Save rotated PDF
-    with open(output_path, "wb") as f_out:
-        writer.write(f_out)
+        for index, page_angle in angles.items():
+            # Clockwise, on top of any rotation the page already has
+            page = doc[index]
+            page.set_rotation((page.rotation + page_angle) % 360)
 
     return str(output_path)
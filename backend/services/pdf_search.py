@@ -0,0 +1,184 @@
+# backend/services/pdf_search.py
+
+import json
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from backend.core.config import SEARCH_INDEX_DIR, SEARCH_INDEX_MEMORY
+from backend.utils.pdf_utils import DocumentSession, render_pdf_images
+
+INDEX_VERSION = 1
+OCR_DPI = 200
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ----------------------
+# Building
+# ----------------------
+# An index maps each term to its occurrences as a flat [page, token, page, token, ...]
+# list, and keeps every page's token boxes as a flat [x0, y0, x1, y1, ...] list
+# (PDF points, top-left origin, like the editor's text spans). Token numbers are
+# in reading order, so a phrase is a run of consecutive tokens on one page.
+
+def tokenize(text: str) -> list[str]:
+    return [t.lower() for t in TOKEN_RE.findall(text)]
+
+
+def _text_words(page) -> list[tuple]:
+    # (x0, y0, x1, y1, word) in reading order
+    return [w[:5] for w in page.get_text("words", sort=True)]
+
+
+def _ocr_words(data: dict, scale: float) -> list[tuple]:
+    words = []
+    for text, left, top, width, height in zip(
+        data["text"], data["left"], data["top"], data["width"], data["height"]
+    ):
+        if text.strip():
+            words.append((left * scale, top * scale, (left + width) * scale, (top + height) * scale, text))
+    return words
+
+
+def _page_words(session: DocumentSession) -> list[list[tuple]]:
+    """
+    Words of every page from the text layer; pages without one are OCRed.
+    """
+    pages = [_text_words(page) for page in session.fitz_doc]
+    scanned = [i for i, words in enumerate(pages) if not words]
+    if scanned:
+        from backend.utils.ocr_utils import imap_ocr, ocr_image_with_data
+
+        images = (
+            next(render_pdf_images(session, dpi=OCR_DPI, first_page=i + 1, last_page=i + 1, grayscale=True))
+            for i in scanned
+        )
+        for i, data in zip(scanned, imap_ocr(ocr_image_with_data, images)):
+            pages[i] = _ocr_words(data, 72 / OCR_DPI)
+    return pages
+
+
+def build_index(pdf_path: str) -> dict:
+    with DocumentSession(pdf_path) as session:
+        page_words = _page_words(session)
+
+    terms: dict[str, list[int]] = {}
+    boxes = []
+    for page_num, words in enumerate(page_words, start=1):
+        page_boxes = []
+        for x0, y0, x1, y1, word in words:
+            # "don't," -> "don", "t"; each token keeps its word's box
+            for token in tokenize(word):
+                terms.setdefault(token, []).extend((page_num, len(page_boxes) // 4))
+                page_boxes.extend((round(x0, 1), round(y0, 1), round(x1, 1), round(y1, 1)))
+        boxes.append(page_boxes)
+
+    return {"version": INDEX_VERSION, "page_count": len(page_words), "boxes": boxes, "terms": terms}
+
+
+# ----------------------
+# Storage
+# ----------------------
+def index_path(doc_hash: str) -> str:
+    return os.path.join(SEARCH_INDEX_DIR, doc_hash[:2], f"{doc_hash}.json.z")
+
+
+def build_and_store(pdf_path: str, doc_hash: str) -> dict:
+    """
+    Build the index for a document and write it (zlib-compressed JSON) under
+    its content hash. Returns the index summary.
+    """
+    index = build_index(pdf_path)
+    path = index_path(doc_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(json.dumps(index, separators=(",", ":")).encode("utf-8")))
+    os.replace(tmp, path)
+    return summary(index)
+
+
+def summary(index: dict) -> dict:
+    return {"page_count": index["page_count"], "terms": len(index["terms"])}
+
+
+class _LoadedIndexes:
+    """
+    Recently queried indexes, kept parsed in memory so queries are dict lookups.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._indexes: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, doc_hash: str) -> dict | None:
+        with self._lock:
+            index = self._indexes.get(doc_hash)
+            if index is not None:
+                self._indexes.move_to_end(doc_hash)
+                return index
+
+        try:
+            with open(index_path(doc_hash), "rb") as f:
+                index = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        if index.get("version") != INDEX_VERSION:
+            return None
+
+        with self._lock:
+            self._indexes[doc_hash] = index
+            while len(self._indexes) > self.max_entries:
+                self._indexes.popitem(last=False)
+        return index
+
+
+loaded_indexes = _LoadedIndexes(SEARCH_INDEX_MEMORY)
+
+
+# ----------------------
+# Querying
+# ----------------------
+def search(index: dict, query: str, limit: int = 100) -> dict:
+    """
+    Hits for a word or phrase, grouped by page, with one rectangle per
+    matched token. At most `limit` hits are returned.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return {"query": query, "total": 0, "pages": []}
+
+    postings = [index["terms"].get(t) for t in tokens]
+    if not all(postings):
+        return {"query": query, "total": 0, "pages": []}
+
+    first = postings[0]
+    starts = [(first[i], first[i + 1]) for i in range(0, len(first), 2)]
+    for offset, posting in enumerate(postings[1:], start=1):
+        following = {(posting[i], posting[i + 1] - offset) for i in range(0, len(posting), 2)}
+        starts = [s for s in starts if s in following]
+
+    pages: dict[int, list] = {}
+    for page, token in starts[:limit]:
+        boxes = index["boxes"][page - 1]
+        pages.setdefault(page, []).append(
+            [boxes[(token + k) * 4:(token + k) * 4 + 4] for k in range(len(tokens))]
+        )
+
+    return {
+        "query": query,
+        "total": len(starts),
+        "pages": [{"page": page, "hits": hits} for page, hits in pages.items()],
+    }
+
+
+def search_document(doc_hash: str, query: str, limit: int = 100) -> dict | None:
+    """
+    Load (or reuse) a document's index and search it; None when it has no index.
+    Blocking: call it off the event loop.
+    """
+    index = loaded_indexes.get(doc_hash)
+    return None if index is None else search(index, query, limit)
@@ -3,98 +3,173 @@
 import base64
 import io
 import os
-import tempfile
-from copy import copy
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
 
-from PyPDF2 import PdfReader, PdfWriter, Transformation
-from reportlab.pdfgen import canvas
+import pikepdf
 from PIL import Image
 
+EVERY_PAGE = -1
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    Where to draw the signature: 1-indexed page (EVERY_PAGE for initials on
+    every page) and a box in points measured from the page's top-left corner.
+    """
+    page: int = 1
+    x: float = 50
+    y: float = 50
+    width: float = 100
+    height: float = 50
+
+
+@dataclass(frozen=True)
+class PreparedSignature:
+    """
+    A decoded signature image, Flate-compressed and ready to be embedded as
+    an Image XObject. Prepare once and reuse it for any number of documents.
+    """
+    width: int
+    height: int
+    rgb: bytes
+    alpha: bytes | None
+
+
+def prepare_signature(image_base64: str) -> PreparedSignature:
+    """
+    Decode a (data URL or plain) base64 signature image.
+    """
+    _, encoded = image_base64.split(",", 1) if "," in image_base64 else (None, image_base64)
+    img = Image.open(io.BytesIO(base64.b64decode(encoded)))
+    img.load()
+
+    alpha = None
+    if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+        img = img.convert("RGBA")
+        alpha_band = img.getchannel("A")
+        # Fully opaque masks are dropped
+        if alpha_band.getextrema()[0] < 255:
+            alpha = zlib.compress(alpha_band.tobytes())
+    rgb = img.convert("RGB")
+
+    return PreparedSignature(
+        width=rgb.width,
+        height=rgb.height,
+        rgb=zlib.compress(rgb.tobytes()),
+        alpha=alpha,
+    )
 
-def png_to_pdf(png_bytes: bytes, output_path: str | None = None) -> str:
-    if output_path is None:
-        tmp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        output_path = tmp_pdf.name
-        tmp_pdf.close()
 
-    img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
-    c = canvas.Canvas(output_path, pagesize=(img.width, img.height))
-    c.drawInlineImage(img, 0, 0, width=img.width, height=img.height)
-    c.showPage()
-    c.save()
+def _embed(pdf: pikepdf.Pdf, signature: PreparedSignature) -> pikepdf.Stream:
+    # Stream data is already Flate-encoded, so it is written as-is
+    image = pikepdf.Stream(pdf, signature.rgb)
+    image.Type = pikepdf.Name.XObject
+    image.Subtype = pikepdf.Name.Image
+    image.Width = signature.width
+    image.Height = signature.height
+    image.ColorSpace = pikepdf.Name.DeviceRGB
+    image.BitsPerComponent = 8
+    image.Filter = pikepdf.Name.FlateDecode
+
+    if signature.alpha is not None:
+        mask = pikepdf.Stream(pdf, signature.alpha)
+        mask.Type = pikepdf.Name.XObject
+        mask.Subtype = pikepdf.Name.Image
+        mask.Width = signature.width
+        mask.Height = signature.height
+        mask.ColorSpace = pikepdf.Name.DeviceGray
+        mask.BitsPerComponent = 8
+        mask.Filter = pikepdf.Name.FlateDecode
+        image.SMask = mask
+
+    return pdf.make_indirect(image)
+
+
+def stamp_signature(pdf: pikepdf.Pdf, signature: PreparedSignature, placements: list[Placement]):
+    """
+    Draw the signature at every placement in one pass over the open document.
+    The image is embedded once and every page references the same XObject.
+    """
+    page_count = len(pdf.pages)
+    by_page: dict[int, list[Placement]] = {}
+    for placement in placements:
+        if placement.page == EVERY_PAGE:
+            targets = range(page_count)
+        elif 1 <= placement.page <= page_count:
+            targets = [placement.page - 1]
+        else:
+            raise ValueError(f"Page {placement.page} is outside the document (1-{page_count})")
+        for index in targets:
+            by_page.setdefault(index, []).append(placement)
 
-    print(f"[DEBUG] PNG converted to PDF at {output_path}")
-    return output_path
+    if not by_page:
+        return
 
+    image = _embed(pdf, signature)
+    for index, page_placements in by_page.items():
+        page = pdf.pages[index]
+        name = page.add_resource(image, pikepdf.Name.XObject, prefix="Sig")
+        x0, _, _, y1 = (float(v) for v in page.mediabox)
 
-def overlay_pdf(
-    base_pdf: str,
-    overlay_pdf_path: str,
-    out_path: str,
-    page: int = 0,
-    x: int = 0,
-    y: int = 0,
-    width: int | None = None,
-    height: int | None = None,
-):
-    reader = PdfReader(base_pdf)
-    overlay_reader = PdfReader(overlay_pdf_path)
-    overlay_page = overlay_reader.pages[0]
-    writer = PdfWriter()
-
-    for i, base_page in enumerate(reader.pages):
-        if page == -1 or i == page:
-            base_height = float(base_page.mediabox.height)
-            overlay_width = float(overlay_page.mediabox.width)
-            overlay_height = float(overlay_page.mediabox.height)
-
-            scale_x = (width / overlay_width) if width else 1
-            scale_y = (height / overlay_height) if height else 1
-            final_height = height if height else overlay_height * scale_y
-            flipped_y = base_height - y - final_height
-
-            transformation = Transformation().scale(scale_x, scale_y).translate(x, flipped_y)
-            overlay_copy = copy(overlay_page)
-            overlay_copy.add_transformation(transformation)
-            base_copy = copy(base_page)
-            base_copy.merge_page(overlay_copy)
-            writer.add_page(base_copy)
-        else:
-            writer.add_page(base_page)
+        ops = []
+        for p in page_placements:
+            # Flip from top-left coordinates to PDF user space
+            left = x0 + p.x
+            bottom = y1 - p.y - p.height
+            ops.append(f"q {p.width:g} 0 0 {p.height:g} {left:g} {bottom:g} cm {name} Do Q")
+
+        # Isolate the existing content so its graphics state can't leak into ours
+        page.contents_add(pikepdf.Stream(pdf, b"q\n"), prepend=True)
+        page.contents_add(pikepdf.Stream(pdf, ("Q\n" + "\n".join(ops) + "\n").encode()))
 
-    with open(out_path, "wb") as f:
-        writer.write(f)
 
-    print(f"[DEBUG] Overlay applied. Output saved at {out_path}")
+def _as_signature(signature: PreparedSignature | str) -> PreparedSignature:
+    return signature if isinstance(signature, PreparedSignature) else prepare_signature(signature)
 
 
 def sign_pdf(
     pdf_path: str,
-    image_base64: str,
+    image_base64: PreparedSignature | str,
     out_path: str,
-    page: int = 0,
+    page: int = 1,
     x: int = 50,
     y: int = 50,
     width: int = 100,
     height: int = 50,
+    placements: list[Placement] | None = None,
 ):
-    page = max(0, page - 1)
-    _, encoded = image_base64.split(",", 1) if "," in image_base64 else (None, image_base64)
-    signature_bytes = base64.b64decode(encoded)
-    tmp_overlay = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    tmp_overlay.close()
-    overlay_pdf_path = png_to_pdf(signature_bytes, tmp_overlay.name)
-
-    overlay_pdf(
-        base_pdf=pdf_path,
-        overlay_pdf_path=overlay_pdf_path,
-        out_path=out_path,
-        page=page,
-        x=x,
-        y=y,
-        width=width,
-        height=height,
-    )
-
-    os.remove(overlay_pdf_path)
-    print(f"[DEBUG] Signed PDF saved at {out_path}")
+    """
+    Stamp a signature image onto a PDF, entirely in memory.
+    Either a single box (page/x/y/width/height) or a list of placements.
+    """
+    signature = _as_signature(image_base64)
+    if placements is None:
+        placements = [Placement(page=max(1, page), x=x, y=y, width=width, height=height)]
+
+    with pikepdf.open(pdf_path) as pdf:
+        stamp_signature(pdf, signature, placements)
+        pdf.save(out_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    return out_path
+
+
+def sign_pdfs(
+    pdf_paths: list[str],
+    image_base64: PreparedSignature | str,
+    out_dir: str,
+    placements: list[Placement],
+) -> list[str]:
+    """
+    Apply the same signature to many documents. The image is decoded and
+    compressed once; each output is written as <n>_signed_<name> in `out_dir`
+    (n is the input's position, so inputs with the same name don't collide).
+    """
+    signature = _as_signature(image_base64)
+    width = len(str(len(pdf_paths)))
+    outputs = []
+    for n, path in enumerate(pdf_paths, start=1):
+        out_path = os.path.join(out_dir, f"{n:0{width}d}_signed_{Path(path).name}")
+        outputs.append(sign_pdf(path, signature, out_path, placements=placements))
+    return outputs
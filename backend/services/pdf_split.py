@@ -1,19 +1,114 @@
 # backend/services/pdf_split.py
 
+import io
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from PyPDF2 import PdfReader, PdfWriter
 from fpdf import FPDF
-import pytesseract
 
-from backend.utils.pdf_utils import is_scanned_pdf, render_pdf_images
-from backend.utils.file_utils import encode_file_to_base64
+from backend.utils.ocr_utils import iter_ocr
+from backend.utils.pdf_utils import DocumentSession
+from backend.utils.file_utils import encode_file_to_base64, iter_zip
 
 # Path to a TTF font that supports UTF-8
 UTF8_FONT_PATH = Path(__file__).parent.parent / "assets/fonts/DejaVuSans.ttf"
 
 
-def split_pdf(pdf_path: str, out_dir: str, start: int = 1, end: int | None = None) -> Tuple[List[str], int]:
+def open_split(
+    pdf_path: str, start: int = 1, end: int | None = None, session: DocumentSession | None = None
+) -> Tuple[int, Iterator[Tuple[str, bytes]]]:
+    """
+    Validate the page range and return a lazy page iterator.
+    Handles both normal and scanned PDFs.
+
+    Args:
+        pdf_path (str): Path to the input PDF.
+        start (int, optional): Start page number (1-indexed). Defaults to 1.
+        end (int | None, optional): End page number. Defaults to last page.
+        session (DocumentSession | None, optional): Already-open document to reuse.
+            When omitted, one is opened and closed once the iterator is exhausted.
+
+    Returns:
+        Tuple[int, Iterator[Tuple[str, bytes]]]: Total pages in PDF, and an iterator
+        yielding (filename, PDF bytes) one page at a time from a single reader.
+    """
+    owned = session is None
+    session = session or DocumentSession(pdf_path)
+    try:
+        scanned = session.is_scanned()
+        total_pages = session.page_count
+        end = end or total_pages
+
+        if start < 1 or end > total_pages or start > end:
+            raise ValueError(f"Invalid start/end: start={start}, end={end}, total={total_pages}")
+    except Exception:
+        if owned:
+            session.close()
+        raise
+
+    stem = Path(session.path).stem
+    if not scanned:
+        pages = _iter_pages(session.reader, stem, start, end)
+    else:
+        pages = _iter_ocr_pages(session, stem, start, end)
+    return total_pages, (_closing(pages, session) if owned else pages)
+
+
+def _closing(pages: Iterator[Tuple[str, bytes]], session: DocumentSession) -> Iterator[Tuple[str, bytes]]:
+    try:
+        yield from pages
+    finally:
+        session.close()
+
+
+def _iter_pages(reader: PdfReader, stem: str, start: int, end: int) -> Iterator[Tuple[str, bytes]]:
+    # Standard PDF: split normally
+    for i in range(start - 1, end):
+        writer = PdfWriter()
+        writer.add_page(reader.pages[i])
+        buf = io.BytesIO()
+        writer.write(buf)
+        yield f"{stem}_page_{i+1}.pdf", buf.getvalue()
+
+
+def _text_to_pdf(text: str) -> bytes:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    # Use UTF-8 font if available
+    if UTF8_FONT_PATH.exists():
+        pdf.add_font("DejaVu", "", str(UTF8_FONT_PATH), uni=True)
+        pdf.set_font("DejaVu", size=12)
+    else:
+        # Fallback: core font (may fail for non-latin chars)
+        pdf.set_font("Helvetica", size=12)
+
+    try:
+        pdf.multi_cell(0, 10, text)
+    except Exception:
+        # Fallback: replace unsupported characters
+        safe_text = text.encode("latin-1", "replace").decode("latin-1")
+        pdf.multi_cell(0, 10, safe_text)
+
+    return bytes(pdf.output())
+
+
+def _iter_ocr_pages(session: DocumentSession, stem: str, start: int, end: int) -> Iterator[Tuple[str, bytes]]:
+    """
+    Scanned PDF: convert each requested page to a PDF with OCR text.
+    Only pages start..end are rasterized, one at a time as the OCR pool has
+    room; text is OCR'd in parallel and pages are yielded in order.
+    """
+    pages = range(start, end + 1)
+    images = session.render(first_page=start, last_page=end, grayscale=True)
+    for page, text in zip(pages, iter_ocr(images)):
+        yield f"{stem}_page_{page}_ocr.pdf", _text_to_pdf(text)
+
+
+def split_pdf(
+    pdf_path: str, out_dir: str, start: int = 1, end: int | None = None, session: DocumentSession | None = None
+) -> Tuple[List[str], int]:
     """
     Split a PDF into individual pages.
     Handles both normal and scanned PDFs.
@@ -23,64 +118,21 @@ def split_pdf(pdf_path: str, out_dir: str, start: int = 1, end: int | None = Non
         out_dir (str): Directory to save split pages.
         start (int, optional): Start page number (1-indexed). Defaults to 1.
         end (int | None, optional): End page number. Defaults to last page.
+        session (DocumentSession | None, optional): Already-open document to reuse.
 
     Returns:
         Tuple[List[str], int]: List of file paths of split pages, total pages in PDF.
     """
-    pdf_path = Path(pdf_path)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    scanned = is_scanned_pdf(pdf_path)
-
-    # Read PDF
-    reader = PdfReader(str(pdf_path))
-    total_pages = len(reader.pages)
-    end = end or total_pages
-
-    if start < 1 or end > total_pages or start > end:
-        raise ValueError(f"Invalid start/end: start={start}, end={end}, total={total_pages}")
+    total_pages, pages = open_split(pdf_path, start, end, session=session)
 
     split_files: List[str] = []
-
-    if not scanned:
-        # Standard PDF: split normally
-        for i in range(start - 1, end):
-            writer = PdfWriter()
-            writer.add_page(reader.pages[i])
-            out_file = out_dir / f"{pdf_path.stem}_page_{i+1}.pdf"
-            with open(out_file, "wb") as f:
-                writer.write(f)
-            split_files.append(str(out_file))
-    else:
-        # Scanned PDF: convert each page to PDF with OCR text
-        for i, img in enumerate(render_pdf_images(pdf_path), start=1):
-            if i < start or i > end:
-                continue
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-
-            # Use UTF-8 font if available
-            if UTF8_FONT_PATH.exists():
-                pdf.add_font("DejaVu", "", str(UTF8_FONT_PATH), uni=True)
-                pdf.set_font("DejaVu", size=12)
-            else:
-                # Fallback: core font (may fail for non-latin chars)
-                pdf.set_font("Helvetica", size=12)
-
-            text = pytesseract.image_to_string(img)
-
-            try:
-                pdf.multi_cell(0, 10, text)
-            except Exception:
-                # Fallback: replace unsupported characters
-                safe_text = text.encode("latin-1", "replace").decode("latin-1")
-                pdf.multi_cell(0, 10, safe_text)
-
-            out_file = out_dir / f"{pdf_path.stem}_page_{i}_ocr.pdf"
-            pdf.output(str(out_file))
-            split_files.append(str(out_file))
+    for name, data in pages:
+        out_file = out_dir / name
+        out_file.write_bytes(data)
+        split_files.append(str(out_file))
 
     return split_files, total_pages
 
@@ -106,3 +158,18 @@ def split_pdf_base64(pdf_path: str, out_dir: str, start: int = 1, end: int | Non
         "returned_pages": len(encoded_files),
         "files": encoded_files
     }
+
+
+def split_pdf_zip(pdf_path: str, zip_path: str, start: int = 1, end: int | None = None) -> int:
+    """
+    Write the split pages to a ZIP archive at `zip_path`, one page in memory
+    at a time. Runs in the conversion pool; the router streams the file.
+
+    Returns:
+        int: Total pages in PDF.
+    """
+    total_pages, pages = open_split(pdf_path, start, end)
+    with open(zip_path, "wb") as f:
+        for chunk in iter_zip(pages):
+            f.write(chunk)
+    return total_pages
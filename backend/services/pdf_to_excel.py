@@ -1,19 +1,31 @@
 # backend/services/pdf_to_excel.py
 
-import pdfplumber  # Ensure pdfplumber is imported
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter  # Ensure get_column_letter is imported
 from pathlib import Path
-from backend.utils.file_utils import encode_file_to_base64
+from concurrent.futures import ProcessPoolExecutor
+from backend.core.config import EXCEL_WORKERS, EXCEL_PARALLEL_MIN_PAGES
+from backend.utils.file_utils import file_result
+from backend.utils.pdf_utils import DocumentSession
 import logging
+import multiprocessing
+import threading
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def convert_pdf_to_excel(pdf_path: str, out_path: str, original_name: str):
+def convert_pdf_to_excel(
+    pdf_path: str, out_path: str, original_name: str, encode: bool = True,
+    session: DocumentSession | None = None,
+):
     """
-    Convert a PDF file to Excel using pdfplumber for both text and table extraction.
-    Returns a dictionary containing success, filename, and base64-encoded file.
+    Convert a PDF file to Excel.
+    Text and tables are extracted together in one pass per page (PyMuPDF, with
+    pdfplumber for pages its table finder can't handle). With EXCEL_WORKERS set,
+    large documents are split into page ranges extracted in parallel and
+    merged in page order.
+    Returns a dictionary containing success, filename, and base64-encoded file
+    (or the output path when encode=False).
     """
     try:
         # Create a new workbook and worksheet
@@ -21,10 +33,11 @@ def convert_pdf_to_excel(pdf_path: str, out_path: str, original_name: str):
         ws = wb.active
         ws.title = f"Content_{Path(pdf_path).stem}"
 
-        # Extract text and table data using pdfplumber
-        text_content = extract_text_from_pdf(pdf_path)
-        table_data = extract_tables_from_pdf(pdf_path)
-        
+        pages = extract_pdf(pdf_path, session)
+        text_content = "\n".join(text for text, _ in pages)
+        table_data = [table for _, tables in pages for table in tables]
+        logging.info(f"Extracted {len(text_content)} characters and {len(table_data)} table(s) from {pdf_path}")
+
         # Write extracted text content to Excel
         current_row = write_text_to_excel(ws, text_content)
 
@@ -35,14 +48,8 @@ def convert_pdf_to_excel(pdf_path: str, out_path: str, original_name: str):
         wb.save(out_path)
         logging.info(f"Excel file saved to {out_path}")
 
-        # Encode the output Excel file to base64 for frontend use
-        encoded_file = encode_file_to_base64(out_path)
-
-        return {
-            "success": True,
-            "filename": f"{Path(original_name).stem}.xlsx",
-            "file": encoded_file
-        }
+        # Encode the output Excel file to base64 for frontend use (unless the caller streams it)
+        return file_result(out_path, f"{Path(original_name).stem}.xlsx", encode=encode)
     except Exception as e:
         logging.error(f"Error in convert_pdf_to_excel: {e}")
         return {
@@ -50,35 +57,92 @@ def convert_pdf_to_excel(pdf_path: str, out_path: str, original_name: str):
             "message": f"An error occurred: {e}"
         }
 
-def extract_text_from_pdf(pdf_path: str):
+# ----------------------
+# Page extraction
+# ----------------------
+# Fall back to pdfplumber when more than this share of a page's table cells is empty
+MAX_EMPTY_CELLS = 0.5
+
+
+def _mostly_empty(tables) -> bool:
+    cells = [cell for table in tables for row in table for cell in row]
+    empty = sum(1 for cell in cells if cell in (None, ""))
+    return not cells or empty / len(cells) > MAX_EMPTY_CELLS
+
+
+def extract_page(session: DocumentSession, index: int):
     """
-    Extract text from the PDF using pdfplumber.
-    The text will be placed into rows in the Excel file, trying to preserve the original layout.
+    (text, tables) of one page (0-indexed). Tables come from PyMuPDF's table
+    finder; only pages where it fails or finds mostly-empty grids are re-read
+    with pdfplumber (pages without tables never open it).
     """
-    text_content = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text_content += page.extract_text() or ""  # Avoid NoneType errors
-    logging.info(f"Extracted {len(text_content)} characters of text from {pdf_path}")
-    return text_content
-
-def extract_tables_from_pdf(pdf_path: str):
+    page = session.fitz_doc[index]
+    text = page.get_text("text", sort=True)
+
+    try:
+        tables = [table.extract() for table in page.find_tables().tables]
+        if not tables or not _mostly_empty(tables):
+            return text, tables
+    except Exception as e:
+        logging.info(f"PyMuPDF table finder failed on page {index + 1}: {e}")
+
+    # Hard page: pdfplumber is slower but handles more layouts
+    tables = session.plumber.pages[index].extract_tables()
+    return text, tables
+
+
+def _extract_range(pdf_path: str, first: int, last: int):
     """
-    Extract tables from all pages of a PDF file using pdfplumber.
-    Each table is then mapped to Excel rows and columns.
+    Extract pages first..last-1 (runs in a worker process).
     """
-    table_data = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extract tables from each page
-            tables = page.extract_tables()
-
-            if tables:
-                logging.info(f"Found {len(tables)} table(s) on page {page.page_number}")
-                table_data.extend(tables)
-            else:
-                logging.info(f"No tables found on page {page.page_number}")
-    return table_data
+    with DocumentSession(pdf_path) as session:
+        return [extract_page(session, i) for i in range(first, last)]
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _extraction_pool() -> ProcessPoolExecutor:
+    """
+    This process's page extraction pool (EXCEL_WORKERS processes), created on
+    first use and reused by every later conversion.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXCEL_WORKERS, mp_context=_mp_context())
+        return _pool
+
+
+def extract_pdf(pdf_path: str, session: DocumentSession | None = None):
+    """
+    [(text, tables)] for every page, in page order.
+    """
+    owned = session is None
+    session = session or DocumentSession(pdf_path)
+    try:
+        page_count = session.page_count
+        workers = min(EXCEL_WORKERS, page_count)
+        if workers <= 1 or page_count < EXCEL_PARALLEL_MIN_PAGES:
+            return [extract_page(session, i) for i in range(page_count)]
+    finally:
+        if owned:
+            session.close()
+
+    # A few ranges per worker so one dense page range doesn't hold up the rest
+    size = max(1, -(-page_count // (workers * 4)))
+    starts = list(range(0, page_count, size))
+    ends = [min(start + size, page_count) for start in starts]
+    pages = []
+    for chunk in _extraction_pool().map(_extract_range, [str(pdf_path)] * len(starts), starts, ends):
+        pages.extend(chunk)
+    return pages
 
 def write_text_to_excel(ws, text_content):
     """
@@ -99,6 +163,9 @@ def write_tables_to_excel(ws, table_data, starting_row):
     Write extracted table data to the Excel worksheet, preserving the table structure.
     Tables from the PDF will be mapped to the corresponding rows and columns.
     """
+    if not table_data:
+        return
+
     row_offset = starting_row
     for table_index, table in enumerate(table_data):
         for r, row in enumerate(table):
@@ -108,7 +175,8 @@ def write_tables_to_excel(ws, table_data, starting_row):
         row_offset += len(table) + 2  # Leave a space between tables
 
     # Adjust column widths dynamically for each table based on the content length
-    for col in range(1, len(table_data[0][0]) + 1):  # Iterate over columns
+    columns = max((len(row) for table in table_data for row in table), default=0)
+    for col in range(1, columns + 1):  # Iterate over columns
         max_length = 0
         for row in ws.iter_rows(min_row=starting_row, max_row=row_offset, min_col=col, max_col=col):
             for cell in row:
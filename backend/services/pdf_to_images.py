@@ -2,10 +2,11 @@ import os
 from backend.utils.pdf_utils import render_pdf_images
 from backend.utils.file_utils import encode_file_to_base64
 
-def convert_pdf_to_images(pdf_path: str, tmp: str):
+def convert_pdf_to_images(pdf_path: str, tmp: str, encode: bool = True):
     images = []
+    # Pages are rendered one at a time; only the current bitmap is in memory
     for i, img in enumerate(render_pdf_images(pdf_path)):
         path = os.path.join(tmp, f"page_{i+1}.png")
-        img.convert("RGB").save(path, "PNG")
-        images.append(encode_file_to_base64(path))
+        img.save(path, "PNG")
+        images.append(encode_file_to_base64(path) if encode else path)
     return images
@@ -3,18 +3,13 @@
 from pathlib import Path
 import os
 from pptx import Presentation
-from backend.utils.file_utils import encode_file_to_base64
+from backend.utils.file_utils import file_result
+from backend.core.model_registry import model_registry
 import pymupdf
 from pptx.util import Inches
-from paddleocr import PaddleOCR, PPStructureV3 as PPStructure
-from PIL import Image
-import io
-import numpy as np
 from pptx.dml.color import RGBColor
 from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
 from pptx.util import Pt
-from sklearn.mixture import GaussianMixture
-from sklearn.model_selection import GridSearchCV
 
 class Converter:
     def __init__(self, default_font: str | None = None, enable_ocr: bool = False,
@@ -22,13 +17,19 @@ class Converter:
         self.default_font = default_font
         self.enable_ocr = enable_ocr  # Default to False for OCR Disabled
         self.enforce_default_font = enforce_default_font
-
-        # Initialize PaddleOCR for OCR processing if enable_ocr is True
-        self.ocr = PaddleOCR(lang=lang) if self.enable_ocr else None
-        
-        # PPStructure initialization (no `table` argument)
-        self.layout_engine = (
-            PPStructure(layout_score_threshold=image_retention_level)
+        self.lang = lang
+        self.image_retention_level = image_retention_level
+
+    # OCR models come from the process-wide registry: loaded once, reused across requests
+    @property
+    def ocr(self):
+        return model_registry.get("paddleocr", lang=self.lang) if self.enable_ocr else None
+
+    @property
+    def layout_engine(self):
+        # PPStructure (no `table` argument)
+        return (
+            model_registry.get("ppstructure", layout_score_threshold=self.image_retention_level)
             if self.enable_ocr else None
         )
 
@@ -76,8 +77,9 @@ class Converter:
     def _construct_pptx(self, pdf_document, all_contents, pptx_output, scanned_document):
         if scanned_document:
             # OCR is only used if `scanned_document` is true
-            ocr_results = [self.ocr.ocr(pdf_document[page_num].get_pixmap(dpi=300).tobytes(), cls=False)
-                           for page_num in range(len(pdf_document))]
+            with model_registry.use("paddleocr", lang=self.lang) as ocr:
+                ocr_results = [ocr.ocr(pdf_document[page_num].get_pixmap(dpi=300).tobytes(), cls=False)
+                               for page_num in range(len(pdf_document))]
         for page_num, pdf_page in enumerate(pdf_document):
             slide = pptx_output.slides.add_slide(pptx_output.slide_layouts[6])
             page_content = all_contents[page_num]
@@ -127,7 +129,7 @@ class Converter:
 # ------------------------------
 
 def convert_pdf_to_powerpoint(pdf_path: str, out_path: str, original_name: str,
-                       enable_ocr: bool = False, default_font: str = "Arial"):
+                       enable_ocr: bool = False, default_font: str = "Arial", encode: bool = True):
     try:
         # Set enable_ocr to False by default to disable OCR unless explicitly enabled
         converter = Converter(default_font=default_font, enable_ocr=enable_ocr, enforce_default_font=True)
@@ -135,13 +137,7 @@ def convert_pdf_to_powerpoint(pdf_path: str, out_path: str, original_name: str,
 
         filename_suffix = "_ocr" if enable_ocr else ""
         # Encode the PPTX file into base64 for easy storage or transfer
-        encoded_file = encode_file_to_base64(out_path)
-
-        return {
-            "success": True,
-            "filename": Path(original_name).stem + filename_suffix + ".pptx",
-            "file": encoded_file
-        }
+        return file_result(out_path, Path(original_name).stem + filename_suffix + ".pptx", encode=encode)
 
     except Exception as e:
         return {
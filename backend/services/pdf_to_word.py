@@ -3,25 +3,38 @@
 from pathlib import Path
 from pdf2docx import Converter
 from docx import Document
-import pytesseract
-from backend.utils.pdf_utils import is_scanned_pdf, render_pdf_images
-from backend.utils.file_utils import encode_file_to_base64
+from backend.utils.pdf_utils import DocumentSession
+from backend.utils.file_utils import file_result
+from backend.utils.ocr_utils import iter_ocr
 
-def convert_pdf_to_word(pdf_path: str, out_path: str, original_name: str):
-    scanned = is_scanned_pdf(pdf_path)
+def convert_pdf_to_word(
+    pdf_path: str, out_path: str, original_name: str, encode: bool = True,
+    session: DocumentSession | None = None,
+):
+    owned = session is None
+    session = session or DocumentSession(pdf_path)
+    try:
+        scanned = session.is_scanned()
 
-    if not scanned:
-        cv = Converter(pdf_path)
-        cv.convert(out_path)
-        cv.close()
-    else:
-        doc = Document()
-        for img in render_pdf_images(pdf_path):
-            doc.add_paragraph(pytesseract.image_to_string(img))
-        doc.save(out_path)
+        if not scanned:
+            # pdf2docx parses the file itself
+            session.close()
+            cv = Converter(pdf_path)
+            cv.convert(out_path)
+            cv.close()
+        else:
+            doc = Document()
+            # Pages are rendered lazily from the open document, OCR'd in parallel
+            # and come back in page order
+            for text in iter_ocr(session.render(grayscale=True)):
+                doc.add_paragraph(text)
+            doc.save(out_path)
+    finally:
+        if owned:
+            session.close()
 
-    return {
-        "success": True,
-        "filename": Path(original_name).stem + (".docx" if not scanned else "_ocr.docx"),
-        "file": encode_file_to_base64(out_path)
-    }
+    return file_result(
+        out_path,
+        Path(original_name).stem + (".docx" if not scanned else "_ocr.docx"),
+        encode=encode,
+    )
@@ -1,8 +1,10 @@
 #  backend\services\pdf_watermark.py
 
-import pypdf
-from tempfile import NamedTemporaryFile
+import os
+import tempfile
 from typing import Union
+
+import pikepdf
 from reportlab.lib.colors import HexColor
 from reportlab.pdfgen import canvas
 
@@ -16,54 +18,72 @@ from backend.utils.watermark_utils import draw_watermarks
 from backend.utils.pdf_utils import convert_content_to_images
 
 
-def add_watermark_to_pdf(
-    input_pdf: str,
-    output_pdf: str,
+def _render_watermark_page(
+    path: str,
+    size: tuple[float, float],
     watermark: Union[TextWatermark, ImageWatermark],
     placement: Union[GridOptions, InsertOptions],
-    image_path: str | None = None,
+    image_path: str | None,
 ):
-    reader = pypdf.PdfReader(input_pdf)
-    writer = pypdf.PdfWriter()
+    """
+    Draw the watermark for one page size into a single-page PDF.
+    """
+    c = canvas.Canvas(path, pagesize=size)
 
-    page_sizes = [(p.mediabox.width, p.mediabox.height) for p in reader.pages]
-    processed = {}
+    if watermark.type == "text":
+        c.setFont(watermark.font, watermark.font_size)
+        c.setFillColor(
+            HexColor(watermark.color),
+            alpha=watermark.opacity,
+        )
+    else:
+        c.setFillAlpha(watermark.opacity)
+        c.setStrokeAlpha(watermark.opacity)
 
-    for index, page in enumerate(reader.pages):
-        size = page_sizes[index]
+    draw_watermarks(
+        canvas=c,
+        width=size[0],
+        height=size[1],
+        watermark=watermark,
+        placement=placement,
+        image=image_path,
+        # Text stays vector unless the caller asked for a flattened watermark
+        vector=not watermark.save_as_image,
+    )
 
-        if size not in processed:
-            with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                c = canvas.Canvas(tmp.name, pagesize=size)
+    c.save()
 
-                if watermark.type == "text":
-                    c.setFont(watermark.font, watermark.font_size)
-                    c.setFillColor(
-                        HexColor(watermark.color),
-                        alpha=watermark.opacity,
-                    )
-                else:
-                    c.setFillAlpha(watermark.opacity)
-                    c.setStrokeAlpha(watermark.opacity)
+    if watermark.save_as_image:
+        convert_content_to_images(path, watermark.dpi)
 
-                draw_watermarks(
-                    canvas=c,
-                    width=size[0],
-                    height=size[1],
-                    watermark=watermark,
-                    placement=placement,
-                    image=image_path,
-                )
 
-                c.save()
+def add_watermark_to_pdf(
+    input_pdf: str,
+    output_pdf: str,
+    watermark: Union[TextWatermark, ImageWatermark],
+    placement: Union[GridOptions, InsertOptions],
+    image_path: str | None = None,
+):
+    """
+    Stamp the watermark on every page.
+    The watermark is built once per page size as a Form XObject and each page's
+    content only references it, so the output grows by one shared object per
+    size rather than a copy of the watermark per page.
+    """
+    with tempfile.TemporaryDirectory() as tmp, pikepdf.open(input_pdf) as pdf:
+        stamps = {}
 
-                if watermark.save_as_image:
-                    convert_content_to_images(tmp.name, watermark.dpi)
+        for page in pdf.pages:
+            box = pikepdf.Rectangle(page.mediabox)
+            size = (box.width, box.height)
 
-                processed[size] = pypdf.PdfReader(tmp.name)
+            if size not in stamps:
+                wm_path = os.path.join(tmp, f"watermark_{len(stamps)}.pdf")
+                _render_watermark_page(wm_path, size, watermark, placement, image_path)
+                with pikepdf.open(wm_path) as wm:
+                    stamps[size] = pdf.copy_foreign(wm.pages[0].as_form_xobject())
 
-        page.merge_page(processed[size].pages[0])
-        writer.add_page(page)
+            # Appends "q /Fx Do Q" to the page; existing content is wrapped in q/Q
+            page.add_overlay(stamps[size], box)
 
-    with open(output_pdf, "wb") as f:
-        writer.write(f)
+        pdf.save(output_pdf, object_stream_mode=pikepdf.ObjectStreamMode.generate)
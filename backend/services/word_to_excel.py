@@ -2,9 +2,9 @@ import os
 from openpyxl import Workbook
 from docx import Document
 from pathlib import Path
-from backend.utils.file_utils import encode_file_to_base64
+from backend.utils.file_utils import file_result
 
-def convert_word_to_excel(word_path: str, out_path: str, original_name: str):
+def convert_word_to_excel(word_path: str, out_path: str, original_name: str, encode: bool = True):
     doc = Document(word_path)
     wb = Workbook()
     ws = wb.active
@@ -17,8 +17,4 @@ def convert_word_to_excel(word_path: str, out_path: str, original_name: str):
 
     wb.save(out_path)
 
-    return {
-        "success": True,
-        "filename": Path(original_name).stem + ".xlsx",
-        "file": encode_file_to_base64(out_path)
-    }
+    return file_result(out_path, Path(original_name).stem + ".xlsx", encode=encode)
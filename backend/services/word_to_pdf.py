@@ -4,9 +4,9 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from pathlib import Path
 
-from backend.utils.file_utils import encode_file_to_base64
+from backend.utils.file_utils import file_result
 
-def convert_word_to_pdf(docx_path: str, pdf_path: str, original_name: str):
+def convert_word_to_pdf(docx_path: str, pdf_path: str, original_name: str, encode: bool = True):
     doc = Document(docx_path)
     c = canvas.Canvas(pdf_path, pagesize=letter)
     y = letter[1] - inch
@@ -21,8 +21,4 @@ def convert_word_to_pdf(docx_path: str, pdf_path: str, original_name: str):
 
     c.save()
 
-    return {
-        "success": True,
-        "filename": Path(original_name).stem + ".pdf",
-        "file": encode_file_to_base64(pdf_path)
-    }
+    return file_result(pdf_path, Path(original_name).stem + ".pdf", encode=encode)
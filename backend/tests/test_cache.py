@@ -0,0 +1,59 @@
+# backend/tests/test_cache.py
+
+import hashlib
+import os
+
+from backend.core import cache as cache_module
+from backend.core.cache import ResultCache, cache_key, hash_file
+
+A, B = "a" * 64, "b" * 64
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key("pdf-rotate", [A], {"angle": 90, "pages": {"1-2": 90}}) == cache_key(
+        "pdf-rotate", [A], {"pages": {"1-2": 90}, "angle": 90}
+    )
+    assert cache_key("pdf-merge", [A]) == cache_key("pdf-merge", [A], {})
+
+
+def test_cache_key_changes_with_each_part():
+    base = cache_key("pdf-rotate", [A], {"angle": 90})
+    assert cache_key("pdf-compress", [A], {"angle": 90}) != base
+    assert cache_key("pdf-rotate", [B], {"angle": 90}) != base
+    assert cache_key("pdf-rotate", [A], {"angle": 180}) != base
+    # Merge order is part of the result
+    assert cache_key("pdf-merge", [A, B]) != cache_key("pdf-merge", [B, A])
+
+
+def test_cache_key_changes_with_operation_version(monkeypatch):
+    before = cache_key("pdf-rotate", [A], {"angle": 90})
+    monkeypatch.setitem(cache_module.OPERATION_VERSIONS, "pdf-rotate", "99")
+    assert cache_key("pdf-rotate", [A], {"angle": 90}) != before
+
+
+def test_hash_file(tmp_path):
+    path = tmp_path / "data.bin"
+    data = os.urandom(300_000)
+    path.write_bytes(data)
+    assert hash_file(path) == hashlib.sha256(data).hexdigest()
+
+
+def test_result_cache_round_trip_and_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1500)
+    src = tmp_path / "out.pdf"
+    src.write_bytes(b"x" * 1000)
+
+    first, second = cache_key("pdf-merge", [A]), cache_key("pdf-merge", [B])
+    assert cache.get(first, str(tmp_path / "miss")) is None
+
+    cache.put(first, str(src), "merged.pdf")
+    path, filename = cache.get(first, str(tmp_path / "hit"))
+    assert filename == "merged.pdf"
+    assert open(path, "rb").read() == b"x" * 1000
+
+    # A second entry pushes the total over max_bytes; the older one goes
+    os.utime(cache._entry(first) / cache_module.META_FILE, (0, 0))
+    cache.put(second, str(src), "merged.pdf")
+    assert cache.get(first, str(tmp_path / "evicted")) is None
+    assert cache.get(second, str(tmp_path / "kept")) is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,115 @@
+# backend/tests/test_edit_sessions.py
+
+import os
+import shutil
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from backend.core import edit_sessions as sessions_module
+from backend.core.edit_sessions import EditSessionStore
+from backend.services.pdf_edit import apply_updates, extract_window
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sessions_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "source.pdf"
+    doc = fitz.open()
+    doc.new_page()
+    doc.new_page()
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _start(store: EditSessionStore, pdf_file) -> str:
+    session_id, path = store.reserve()
+    shutil.copyfile(pdf_file, path)
+    store.register(session_id, "doc.pdf")
+    return session_id
+
+
+def test_idle_session_expires_on_access(tmp_path, clock, pdf_file):
+    store = EditSessionStore(str(tmp_path / "sessions"), max_open=2, ttl=60)
+    session_id = _start(store, pdf_file)
+    workdir = tmp_path / "sessions" / session_id
+
+    clock.now += 59
+    assert store.info(session_id)["page_count"] == 2
+
+    # Each use restarts the idle timer
+    clock.now += 61
+    with pytest.raises(KeyError):
+        store.info(session_id)
+    assert not workdir.exists()
+    assert store.stats()["sessions"] == 0
+
+
+def test_expire_sweeps_only_idle_sessions(tmp_path, clock, pdf_file):
+    store = EditSessionStore(str(tmp_path / "sessions"), max_open=1, ttl=60)
+    idle = _start(store, pdf_file)
+    clock.now += 30
+    active = _start(store, pdf_file)
+
+    clock.now += 45
+    store.expire()
+
+    assert store.stats()["sessions"] == 1
+    assert not os.path.exists(tmp_path / "sessions" / idle)
+    assert store.info(active)["session_id"] == active
+
+
+def test_apply_updates_rejects_malformed_items(pdf_file):
+    with fitz.open(pdf_file) as doc:
+        with pytest.raises(ValueError, match="must be an object"):
+            apply_updates(doc, ["not an update"])
+        with pytest.raises(ValueError, match="must be a list"):
+            apply_updates(doc, {"page": 0})
+        with pytest.raises(ValueError, match="Invalid page"):
+            apply_updates(doc, [{"page": 5, "bbox": [0, 0, 10, 10], "text": "x"}])
+
+
+def _add_text(doc, text):
+    apply_updates(doc, [{"page": 0, "bbox": [72, 72, 400, 120], "text": text}])
+
+
+def test_spilled_edits_are_appended_and_reloaded(tmp_path, clock, pdf_file):
+    store = EditSessionStore(str(tmp_path / "sessions"), max_open=1, ttl=60)
+    first = _start(store, pdf_file)
+    store.edit(first, _add_text, "Signed off")
+    size_before = os.path.getsize(tmp_path / "sessions" / first / "document.pdf")
+
+    # Opening a second session spills the first: its edit is appended to its file
+    _start(store, pdf_file)
+    path = tmp_path / "sessions" / first / "document.pdf"
+    assert os.path.getsize(path) > size_before
+    with open(path, "rb") as f:
+        assert f.read().count(b"%%EOF") == 2
+
+    window = store.read(first, extract_window, 1, None, False)
+    assert window["page_count"] == window["last_page"] == 2
+    assert any(span["text"] == "Signed off" for span in window["pages"][0])
+
+
+def test_session_text_matches_extract_shape(tmp_path, clock, pdf_file):
+    store = EditSessionStore(str(tmp_path / "sessions"), max_open=2, ttl=60)
+    session_id = _start(store, pdf_file)
+
+    window = store.read(session_id, extract_window, 2, 9, True)
+    assert window == {"pages": [[]], "first_page": 2, "last_page": 2, "page_count": 2}
@@ -0,0 +1,58 @@
+# backend/tests/test_model_registry.py
+
+import pytest
+
+from backend.core import model_registry as registry_module
+from backend.core.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    A registry whose loaders return placeholder objects (same signatures as
+    the real ones), also installed as the module-level registry.
+    """
+    def fake_paddleocr(lang: str = "ch"):
+        return object()
+
+    def fake_ppstructure(layout_score_threshold: float = 1.0):
+        return object()
+
+    monkeypatch.setitem(registry_module.LOADERS, "paddleocr", (fake_paddleocr, "lang"))
+    monkeypatch.setitem(registry_module.LOADERS, "ppstructure", (fake_ppstructure, "layout_score_threshold"))
+    registry = ModelRegistry(max_bytes=1 << 40, default_size=1)
+    monkeypatch.setattr(registry_module, "model_registry", registry)
+    return registry
+
+
+def test_defaults_are_part_of_the_key(registry):
+    assert registry.get("paddleocr") is registry.get("paddleocr", lang="ch")
+    assert registry.get("paddleocr", lang="en") is not registry.get("paddleocr")
+    assert registry.loads == 2
+
+
+def test_preloaded_models_are_reused(registry):
+    registry.preload(["paddleocr", "ppstructure:1"])
+    assert registry.loads == 2
+
+    registry.get("paddleocr", lang="ch")
+    registry.get("ppstructure", layout_score_threshold=1.0)
+    assert registry.loads == 2
+
+
+def test_converter_hits_preloaded_models(registry, monkeypatch):
+    pdf_to_powerpoint = pytest.importorskip("backend.services.pdf_to_powerpoint")
+    monkeypatch.setattr(pdf_to_powerpoint, "model_registry", registry)
+
+    registry.preload(["paddleocr:ch", "ppstructure"])
+    converter = pdf_to_powerpoint.Converter(enable_ocr=True)
+    converter.ocr
+    converter.layout_engine
+
+    assert registry.loads == 2
+    assert registry.hits == 2
+
+
+def test_unknown_kind_is_rejected(registry):
+    with pytest.raises(ValueError):
+        registry.get("nope")
@@ -0,0 +1,227 @@
+# backend/tests/test_pdf_compress.py
+
+import shutil
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+
+from backend.services import pdf_compress
+
+
+def _fake_ghostscript(input_pdf, output_pdf, compression_level="max"):
+    # Stand-in for the gs binary: the "compressed" chunk is a plain copy
+    shutil.copyfile(input_pdf, output_pdf)
+
+
+@pytest.fixture
+def structured_pdf(tmp_path):
+    """
+    Six pages with an outline, page labels, a named destination and metadata.
+    """
+    path = tmp_path / "structured.pdf"
+    with pikepdf.new() as pdf:
+        for _ in range(6):
+            pdf.add_blank_page(page_size=(300, 400))
+        with pdf.open_outline() as outline:
+            for i in (0, 3, 5):
+                outline.root.append(pikepdf.OutlineItem(f"Chapter {i + 1}", i))
+        pdf.Root.PageLabels = pdf.make_indirect(pikepdf.Dictionary(
+            Nums=pikepdf.Array([0, pikepdf.Dictionary(S=pikepdf.Name.r)])
+        ))
+        pdf.Root.Names = pdf.make_indirect(pikepdf.Dictionary(Dests=pikepdf.Dictionary(
+            Names=pikepdf.Array(["appendix", pikepdf.Array([pdf.pages[4].obj, pikepdf.Name.Fit])])
+        )))
+        pdf.docinfo["/Title"] = "Annual report"
+        pdf.save(path)
+    return path
+
+
+def test_chunked_ghostscript_keeps_document_structure(tmp_path, structured_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_compress, "_run_ghostscript", _fake_ghostscript)
+    monkeypatch.setattr(pdf_compress, "GS_CHUNK_MIN_PAGES", 2)
+
+    out = tmp_path / "out.pdf"
+    pdf_compress._run_ghostscript_chunked(structured_pdf, out, "max", workers=3)
+
+    with pikepdf.open(out) as pdf:
+        assert len(pdf.pages) == 6
+        assert str(pdf.docinfo["/Title"]) == "Annual report"
+        assert "/PageLabels" in pdf.Root
+
+        page_index = {page.objgen: i for i, page in enumerate(pdf.pages)}
+        with pdf.open_outline() as outline:
+            targets = [(item.title, page_index[item.destination[0].objgen]) for item in outline.root]
+        assert targets == [("Chapter 1", 0), ("Chapter 4", 3), ("Chapter 6", 5)]
+
+        _, dest = list(pdf.Root.Names.Dests.Names)
+        assert page_index[dest[0].objgen] == 4
+
+
+def test_chunked_ghostscript_runs_at_most_the_allowed_processes(tmp_path, structured_pdf, monkeypatch):
+    import threading
+    import time
+
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_ghostscript(input_pdf, output_pdf, compression_level="max"):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        _fake_ghostscript(input_pdf, output_pdf, compression_level)
+        with lock:
+            running[0] -= 1
+
+    monkeypatch.setattr(pdf_compress, "_run_ghostscript", slow_ghostscript)
+    monkeypatch.setattr(pdf_compress, "_gs_slots", threading.BoundedSemaphore(2))
+    monkeypatch.setattr(pdf_compress, "GS_CHUNK_MIN_PAGES", 2)
+
+    pdf_compress._run_ghostscript_chunked(structured_pdf, tmp_path / "out.pdf", "max", workers=6)
+    assert peak[0] == 2
+
+
+def test_ghostscript_command_has_no_rendering_threads(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(pdf_compress, "GS_PATH", str(tmp_path / "gs"))
+    (tmp_path / "gs").touch()
+    monkeypatch.setattr(pdf_compress.subprocess, "run", lambda cmd, check: calls.append(cmd))
+
+    pdf_compress._run_ghostscript(tmp_path / "in.pdf", tmp_path / "out.pdf", "medium")
+    assert "-dPDFSETTINGS=/ebook" in calls[0]
+    assert not any(arg.startswith("-dNumRenderingThreads") for arg in calls[0])
+
+
+# ----------------------
+# Target-size mode
+# ----------------------
+def _fake_recompress(sizes):
+    """
+    _recompress_images stand-in writing a file whose size depends on the setting.
+    """
+    calls = []
+
+    def recompress(pdf_path, output_path, quality, scale, target_dpi=None):
+        setting = (quality, scale, target_dpi is not None)
+        calls.append(setting)
+        output_path.write_bytes(b"x" * sizes[setting])
+
+    return recompress, calls
+
+
+@pytest.mark.parametrize("start, sizes, target, expected_calls, met", [
+    # Estimate was right: one pass
+    (0, {(85, 1.0, False): 900}, 1000, [(85, 1.0, False)], True),
+    # Over target: one retry a setting stronger, which fits
+    (0, {(85, 1.0, False): 1200, (75, 1.0, False): 800}, 1000, [(85, 1.0, False), (75, 1.0, False)], True),
+    # Still over after the retry: stop and report the miss
+    (0, {(85, 1.0, False): 1500, (75, 1.0, False): 1200}, 1000, [(85, 1.0, False), (75, 1.0, False)], False),
+    # Quality alone isn't enough: the retry turns on the placement DPI cap
+    (3, {(50, 1.0, False): 1200, (50, 1.0, True): 800}, 1000, [(50, 1.0, False), (50, 1.0, True)], True),
+])
+def test_target_mode_checks_real_size(tmp_path, monkeypatch, start, sizes, target, expected_calls, met):
+    recompress, calls = _fake_recompress(sizes)
+    monkeypatch.setattr(pdf_compress, "_choose_setting", lambda *args: start)
+    monkeypatch.setattr(pdf_compress, "_recompress_images", recompress)
+    src = tmp_path / "in.pdf"
+    src.write_bytes(b"x" * 5000)
+
+    out = tmp_path / "out.pdf"
+    assert pdf_compress._compress_to_target(src, out, target, 96) is met
+    assert calls == expected_calls
+
+
+def test_target_mode_returns_small_files_unchanged(tmp_path, monkeypatch):
+    recompress, calls = _fake_recompress({})
+    monkeypatch.setattr(pdf_compress, "_recompress_images", recompress)
+    src = tmp_path / "in.pdf"
+    src.write_bytes(b"%PDF-1.4 small")
+
+    assert pdf_compress.compress_pdf(src, tmp_path / "out.pdf", target_bytes=1000) == (str(src), src.stat().st_size)
+    assert pdf_compress._compress_to_target(src, tmp_path / "out.pdf", 1000, 96) is True
+    assert (tmp_path / "out.pdf").read_bytes() == src.read_bytes()
+    assert calls == []
+
+
+def test_target_mode_requires_image_recompression(tmp_path):
+    with pytest.raises(ValueError):
+        pdf_compress.compress_pdf(tmp_path / "in.pdf", tmp_path / "out.pdf", recompress_images=False, target_bytes=1000)
+
+
+def test_choose_setting_on_real_images(tmp_path):
+    from PIL import Image
+
+    path = tmp_path / "photos.pdf"
+    with pikepdf.new() as pdf:
+        for seed in range(3):
+            img = Image.effect_noise((400, 300), 40 + seed * 20).convert("RGB")
+            page = pdf.add_blank_page(page_size=(400, 300))
+            image = pikepdf.Stream(pdf, img.tobytes())
+            image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+            image.Width, image.Height, image.BitsPerComponent = 400, 300, 8
+            image.ColorSpace = pikepdf.Name.DeviceRGB
+            page.add_resource(image, pikepdf.Name.XObject, "/Im0")
+            page.contents_add(pikepdf.Stream(pdf, b"q 400 0 0 300 0 0 cm /Im0 Do Q"))
+        pdf.save(path)
+
+    size = path.stat().st_size
+    assert pdf_compress._choose_setting(path, size * 10) == 0
+    assert pdf_compress._choose_setting(path, 1) == len(pdf_compress.TARGET_SETTINGS) - 1
+
+
+# ----------------------
+# Placement-aware downsampling
+# ----------------------
+def test_placement_scales_use_displayed_size():
+    with pikepdf.new() as pdf:
+        page = pdf.add_blank_page(page_size=(612, 792))
+        image = pikepdf.Stream(pdf, b"\0" * (600 * 300 * 3))
+        image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+        image.Width, image.Height, image.BitsPerComponent = 600, 300, 8
+        image.ColorSpace = pikepdf.Name.DeviceRGB
+        image = pdf.make_indirect(image)
+        page.add_resource(image, pikepdf.Name.XObject, "/Im0")
+        # 2 x 1 inches, nested in a scaled q/Q block: 300 DPI
+        page.contents_add(pikepdf.Stream(pdf, b"q 2 0 0 2 0 0 cm q 72 0 0 36 10 10 cm /Im0 Do Q Q"))
+
+        scales = pdf_compress._placement_scales(pdf, [image.objgen], 96)
+        assert scales[image.objgen] == pytest.approx(96 / 300)
+        # Within DOWNSAMPLE_THRESHOLD of the target: left alone
+        assert pdf_compress._placement_scales(pdf, [image.objgen], 250) == {}
+
+
+# ----------------------
+# Image recompression pool
+# ----------------------
+def test_recompression_reuses_one_pool(tmp_path, monkeypatch):
+    from PIL import Image
+
+    path = tmp_path / "photos.pdf"
+    with pikepdf.new() as pdf:
+        page = pdf.add_blank_page(page_size=(400, 300))
+        for i in range(pdf_compress.PARALLEL_MIN_IMAGES):
+            img = Image.effect_noise((200, 150), 30).convert("RGB")
+            image = pikepdf.Stream(pdf, img.tobytes())
+            image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+            image.Width, image.Height, image.BitsPerComponent = 200, 150, 8
+            image.ColorSpace = pikepdf.Name.DeviceRGB
+            page.add_resource(image, pikepdf.Name.XObject, f"/Im{i}")
+        pdf.save(path)
+
+    monkeypatch.setattr(pdf_compress, "COMPRESS_WORKERS", 2)
+    monkeypatch.setattr(pdf_compress, "_pool", None)
+    try:
+        first = pdf_compress._recompress_all(path, [(og, 1.0) for og in _image_objgens(path)], 25)
+        pool = pdf_compress._pool
+        second = pdf_compress._recompress_all(path, [(og, 1.0) for og in _image_objgens(path)], 25)
+        assert pool is not None and pdf_compress._pool is pool
+        assert len(first) == len(second) == pdf_compress.PARALLEL_MIN_IMAGES
+    finally:
+        if pdf_compress._pool is not None:
+            pdf_compress._pool.shutdown()
+
+
+def _image_objgens(path):
+    with pikepdf.open(path) as pdf:
+        return pdf_compress._unique_images(pdf)
@@ -0,0 +1,117 @@
+# backend/tests/test_pdf_merge.py
+
+import os
+from pathlib import Path
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+
+from backend.services import pdf_merge
+from backend.services.pdf_merge import merge_pdfs
+
+
+def _make_input(path, pages: int, chapters: list[int], dest_name: str, dest_page: int):
+    with pikepdf.new() as pdf:
+        for _ in range(pages):
+            pdf.add_blank_page(page_size=(300, 400))
+        with pdf.open_outline() as outline:
+            for i in chapters:
+                item = pikepdf.OutlineItem(f"{path.stem} {i + 1}", i)
+                item.children.append(pikepdf.OutlineItem(f"{path.stem} {i + 1}.1", i))
+                outline.root.append(item)
+        pdf.Root.Names = pdf.make_indirect(pikepdf.Dictionary(Dests=pikepdf.Dictionary(
+            Names=pikepdf.Array([dest_name, pikepdf.Array([pdf.pages[dest_page].obj, pikepdf.Name.Fit])])
+        )))
+        pdf.save(path)
+    return str(path)
+
+
+def _page_index(pdf, destination) -> int:
+    return [p.objgen for p in pdf.pages].index(destination[0].objgen)
+
+
+def test_merge_keeps_outlines_and_named_destinations(tmp_path):
+    a = _make_input(tmp_path / "a.pdf", 3, [0, 2], "intro", 1)
+    b = _make_input(tmp_path / "b.pdf", 4, [1, 3], "appendix", 3)
+    out = tmp_path / "merged.pdf"
+
+    merge_pdfs([a, b], str(out))
+
+    with pikepdf.open(out) as pdf:
+        assert len(pdf.pages) == 7
+        with pdf.open_outline() as outline:
+            items = list(outline.root)
+            assert [i.title for i in items] == ["a 1", "a 3", "b 2", "b 4"]
+            # Second input's bookmarks are offset by the first input's page count
+            assert [_page_index(pdf, i.destination) for i in items] == [0, 2, 4, 6]
+            assert [_page_index(pdf, i.children[0].destination) for i in items] == [0, 2, 4, 6]
+
+        dests = pikepdf.NameTree(pdf.Root.Names.Dests)
+        assert _page_index(pdf, dests["intro"]) == 1
+        assert _page_index(pdf, dests["appendix"]) == 6
+
+
+def test_merge_keeps_first_named_destination(tmp_path):
+    a = _make_input(tmp_path / "a.pdf", 2, [0], "toc", 1)
+    b = _make_input(tmp_path / "b.pdf", 2, [0], "toc", 0)
+    out = tmp_path / "merged.pdf"
+
+    merge_pdfs([a, b], str(out))
+
+    with pikepdf.open(out) as pdf:
+        assert _page_index(pdf, pikepdf.NameTree(pdf.Root.Names.Dests)["toc"]) == 1
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def _make_with_logo(path, logo: bytes):
+    with pikepdf.new() as pdf:
+        page = pdf.add_blank_page(page_size=(300, 400))
+        image = pikepdf.Stream(pdf, logo)
+        image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+        image.Width, image.Height, image.BitsPerComponent = 16, 16, 8
+        image.ColorSpace = pikepdf.Name.DeviceGray
+        page.add_resource(image, pikepdf.Name.XObject, "/Logo")
+        with pdf.open_outline() as outline:
+            outline.root.append(pikepdf.OutlineItem(path.stem, 0))
+        pdf.save(path)
+    return str(path)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_merge_keeps_at_most_one_batch_of_inputs_open(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_merge, "MERGE_BATCH_SIZE", 3)
+    logo = bytes(range(256))
+    inputs = [_make_with_logo(tmp_path / f"in{i:02d}.pdf", logo) for i in range(11)]
+
+    baseline = _open_fds()
+    peak = [0]
+    real_open = pikepdf.open
+
+    def tracking_open(*args, **kwargs):
+        pdf = real_open(*args, **kwargs)
+        peak[0] = max(peak[0], _open_fds() - baseline)
+        return pdf
+
+    monkeypatch.setattr(pdf_merge.pikepdf, "open", tracking_open)
+    out = tmp_path / "merged.pdf"
+    merge_pdfs(inputs, str(out))
+    monkeypatch.undo()
+
+    # One batch of sources plus the reopened merged file
+    assert peak[0] <= 3 + 1
+    assert _open_fds() == baseline
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([Path(p).name for p in inputs] + ["merged.pdf"])
+
+    with pikepdf.open(out) as pdf:
+        assert len(pdf.pages) == 11
+        with pdf.open_outline() as outline:
+            items = list(outline.root)
+            assert [i.title for i in items] == [f"in{i:02d}" for i in range(11)]
+            assert [_page_index(pdf, i.destination) for i in items] == list(range(11))
+        # The identical logo is shared across batches
+        logos = {page.Resources.XObject.Logo.objgen for page in pdf.pages}
+        assert len(logos) == 1
@@ -0,0 +1,52 @@
+# backend/tests/test_pdf_rotate.py
+
+import io
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+pytest.importorskip("fitz")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.services.pdf_rotate import check_rotation_pages, parse_rotation_spec
+
+
+def _pdf_bytes(pages: int) -> bytes:
+    out = io.BytesIO()
+    with pikepdf.new() as pdf:
+        for _ in range(pages):
+            pdf.add_blank_page(page_size=(300, 400))
+        pdf.save(out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def client():
+    from backend.core.limiter import limiter
+    from backend.routers import pdf
+
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(pdf.router)
+    return TestClient(app)
+
+
+def test_check_rotation_pages(tmp_path):
+    path = tmp_path / "in.pdf"
+    path.write_bytes(_pdf_bytes(3))
+
+    check_rotation_pages(parse_rotation_spec({"1-3": 90}), str(path))
+    with pytest.raises(ValueError, match="outside the document"):
+        check_rotation_pages(parse_rotation_spec({"2-5": 90}), str(path))
+
+
+def test_rotate_endpoint_rejects_pages_past_the_end(client):
+    response = client.post(
+        "/api/convert/pdf-rotate",
+        files={"file": ("in.pdf", _pdf_bytes(3), "application/pdf")},
+        params={"pages": '{"7": 90}'},
+    )
+    assert response.status_code == 400
+    assert "outside the document" in response.json()["detail"]
@@ -0,0 +1,75 @@
+# backend/tests/test_pdf_search.py
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from backend.services.pdf_search import build_index, search
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    lines = [
+        ["The quick brown fox", "jumps over the lazy dog."],
+        ["A brown dog, not a quick fox.", "The quick brown fox again!"],
+    ]
+    for page_lines in lines:
+        page = doc.new_page()
+        for i, line in enumerate(page_lines):
+            page.insert_text((72, 72 + 20 * i), line, fontsize=12)
+    doc.save(path)
+    doc.close()
+    return build_index(str(path))
+
+
+def _hits(result) -> list[tuple[int, int]]:
+    return [(page["page"], len(page["hits"])) for page in result["pages"]]
+
+
+def test_word_search_is_case_insensitive(index):
+    result = search(index, "FOX")
+    assert result["total"] == 3
+    assert _hits(result) == [(1, 1), (2, 2)]
+
+
+def test_phrase_matches_consecutive_tokens_only(index):
+    result = search(index, "quick brown fox")
+    assert result["total"] == 2
+    assert _hits(result) == [(1, 1), (2, 1)]
+    # One rectangle per matched token
+    assert all(len(hit) == 3 for page in result["pages"] for hit in page["hits"])
+
+    # Both words occur on page 2, but never next to each other in this order
+    assert search(index, "brown quick")["total"] == 0
+
+
+def test_phrase_spans_lines_in_reading_order(index):
+    assert search(index, "fox jumps")["total"] == 1
+    assert search(index, "fox, the")["total"] == 1
+
+
+def test_search_limit_and_empty_queries(index):
+    result = search(index, "the", limit=1)
+    assert result["total"] == 3
+    assert sum(len(page["hits"]) for page in result["pages"]) == 1
+    assert search(index, "!!!")["total"] == 0
+    assert search(index, "unicorn")["total"] == 0
+
+
+def test_search_document_loads_stored_index(tmp_path, monkeypatch):
+    from backend.services import pdf_search
+
+    monkeypatch.setattr(pdf_search, "SEARCH_INDEX_DIR", str(tmp_path / "indexes"))
+    monkeypatch.setattr(pdf_search, "loaded_indexes", pdf_search._LoadedIndexes(4))
+    path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Search me, then search again", fontsize=12)
+    doc.save(path)
+    doc.close()
+
+    doc_hash = "ab" * 32
+    assert pdf_search.search_document(doc_hash, "search") is None
+    pdf_search.build_and_store(str(path), doc_hash)
+    assert pdf_search.search_document(doc_hash, "search")["total"] == 2
@@ -0,0 +1,56 @@
+# backend/tests/test_pdf_sign.py
+
+import base64
+import io
+import os
+
+import pytest
+
+pikepdf = pytest.importorskip("pikepdf")
+
+from PIL import Image
+
+from backend.services.pdf_sign import EVERY_PAGE, Placement, sign_pdfs
+
+
+def _signature_base64() -> str:
+    out = io.BytesIO()
+    Image.new("RGBA", (40, 20), (0, 0, 255, 128)).save(out, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(out.getvalue()).decode()
+
+
+def _make_pdf(path, pages: int):
+    os.makedirs(path.parent, exist_ok=True)
+    with pikepdf.new() as pdf:
+        for _ in range(pages):
+            pdf.add_blank_page(page_size=(300, 400))
+        pdf.save(path)
+    return str(path)
+
+
+def test_sign_pdfs_keeps_inputs_with_the_same_name_apart(tmp_path):
+    inputs = [
+        _make_pdf(tmp_path / "a" / "contract.pdf", 1),
+        _make_pdf(tmp_path / "b" / "contract.pdf", 2),
+        _make_pdf(tmp_path / "c" / "other.pdf", 3),
+    ]
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    outputs = sign_pdfs(inputs, _signature_base64(), str(out_dir), [Placement(page=EVERY_PAGE)])
+
+    assert [os.path.basename(p) for p in outputs] == [
+        "1_signed_contract.pdf",
+        "2_signed_contract.pdf",
+        "3_signed_other.pdf",
+    ]
+    for out, pages in zip(outputs, (1, 2, 3)):
+        with pikepdf.open(out) as pdf:
+            assert len(pdf.pages) == pages
+            # One embedded image shared by every page
+            images = {
+                xobj.objgen
+                for page in pdf.pages
+                for xobj in page.Resources.XObject.values()
+            }
+            assert len(images) == 1
@@ -0,0 +1,81 @@
+# backend/tests/test_pdf_split.py
+
+import io
+import zipfile
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("fpdf")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.core import executor
+from backend.services.pdf_split import split_pdf_zip
+
+
+def _pdf_bytes(pages: int) -> bytes:
+    # Pages with a text layer, so the split doesn't take the OCR path
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} of the test document")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from backend.core.limiter import limiter
+    from backend.routers import pdf
+
+    calls = []
+    run_conversion = executor.run_conversion
+
+    async def recording_run_conversion(operation, fn, *args, **kwargs):
+        calls.append((operation, fn.__name__))
+        return await run_conversion(operation, fn, *args, **kwargs)
+
+    # No process pool in tests: conversions run on a worker thread
+    monkeypatch.setattr(executor, "start_pool", lambda: None)
+    monkeypatch.setattr(pdf, "run_conversion", recording_run_conversion)
+
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(pdf.router)
+    client = TestClient(app)
+    client.conversions = calls
+    return client
+
+
+def test_split_pdf_zip(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(_pdf_bytes(4))
+    zip_path = tmp_path / "pages.zip"
+
+    assert split_pdf_zip(str(path), str(zip_path), 2, 3) == 4
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.namelist() == ["doc_page_2.pdf", "doc_page_3.pdf"]
+
+
+def test_split_zip_is_produced_in_the_conversion_pool(client):
+    response = client.post(
+        "/api/convert/pdf-split",
+        files={"file": ("doc.pdf", _pdf_bytes(3), "application/pdf")},
+        params={"delivery": "zip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-total-pages"] == "3"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        assert len(zf.namelist()) == 3
+    assert client.conversions == [("pdf-split", "split_pdf_zip")]
+
+
+def test_split_zip_rejects_bad_range(client):
+    response = client.post(
+        "/api/convert/pdf-split",
+        files={"file": ("doc.pdf", _pdf_bytes(3), "application/pdf")},
+        params={"delivery": "zip", "start": 2, "end": 9},
+    )
+    assert response.status_code == 400
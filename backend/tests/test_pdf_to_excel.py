@@ -0,0 +1,79 @@
+# backend/tests/test_pdf_to_excel.py
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("pdfplumber")
+
+from backend.services import pdf_to_excel
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    for i in range(6):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} text", fontsize=12)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def no_shared_pool(monkeypatch):
+    monkeypatch.setattr(pdf_to_excel, "_pool", None)
+    yield
+    if pdf_to_excel._pool is not None:
+        pdf_to_excel._pool.shutdown()
+
+
+def test_default_extracts_in_process(pdf_file, monkeypatch):
+    monkeypatch.setattr(pdf_to_excel, "EXCEL_WORKERS", 0)
+    monkeypatch.setattr(pdf_to_excel, "EXCEL_PARALLEL_MIN_PAGES", 2)
+
+    pages = pdf_to_excel.extract_pdf(pdf_file)
+
+    assert [text.strip() for text, _ in pages] == [f"Page {i} text" for i in range(1, 7)]
+    assert pdf_to_excel._pool is None
+
+
+def test_parallel_extraction_reuses_one_pool(pdf_file, monkeypatch):
+    monkeypatch.setattr(pdf_to_excel, "EXCEL_WORKERS", 2)
+    monkeypatch.setattr(pdf_to_excel, "EXCEL_PARALLEL_MIN_PAGES", 2)
+
+    first = pdf_to_excel.extract_pdf(pdf_file)
+    pool = pdf_to_excel._pool
+    second = pdf_to_excel.extract_pdf(pdf_file)
+
+    assert pool is not None and pdf_to_excel._pool is pool
+    assert first == second
+    assert [text.strip() for text, _ in first] == [f"Page {i} text" for i in range(1, 7)]
+
+
+def test_prose_pages_never_open_pdfplumber(pdf_file, monkeypatch):
+    from backend.utils.pdf_utils import DocumentSession
+
+    def no_plumber(self):
+        raise AssertionError("pdfplumber opened for a page without tables")
+
+    monkeypatch.setattr(DocumentSession, "plumber", property(no_plumber))
+    monkeypatch.setattr(pdf_to_excel, "EXCEL_WORKERS", 0)
+
+    pages = pdf_to_excel.extract_pdf(pdf_file)
+    assert [tables for _, tables in pages] == [[]] * 6
+
+
+def test_failed_table_finder_falls_back_to_pdfplumber(pdf_file, monkeypatch):
+    import fitz as pymupdf
+
+    def broken_find_tables(self, *args, **kwargs):
+        raise RuntimeError("table finder failed")
+
+    monkeypatch.setattr(pymupdf.Page, "find_tables", broken_find_tables)
+    from backend.utils.pdf_utils import DocumentSession
+
+    with DocumentSession(pdf_file) as session:
+        text, tables = pdf_to_excel.extract_page(session, 0)
+        assert text.strip() == "Page 1 text"
+        assert tables == []
+        assert session._plumber is not None
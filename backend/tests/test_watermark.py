@@ -0,0 +1,112 @@
+# backend/tests/test_watermark.py
+
+import pytest
+
+from backend.schemas.pdf_watermark import (
+    GridOptions,
+    InsertOptions,
+    TextWatermark,
+    ImageWatermark,
+    parse_watermark_payload,
+)
+
+
+# ----------------------
+# Payload parsing
+# ----------------------
+def test_parse_text_grid():
+    watermark, placement = parse_watermark_payload({
+        "watermark": {"type": "text", "text": "DRAFT", "opacity": 0.3},
+        "placement": {"mode": "grid", "tile_type": "diagonal"},
+    })
+    assert isinstance(watermark, TextWatermark)
+    assert watermark.text == "DRAFT" and watermark.opacity == 0.3
+    assert isinstance(placement, GridOptions) and placement.tile_type == "diagonal"
+
+
+def test_parse_image_defaults_to_insert():
+    watermark, placement = parse_watermark_payload({
+        "watermark": {"type": "image", "image_scale": 0.5},
+        "placement": {"x": 0.2, "y": 0.8},
+    })
+    assert isinstance(watermark, ImageWatermark)
+    assert isinstance(placement, InsertOptions) and (placement.x, placement.y) == (0.2, 0.8)
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    None,
+    {"watermark": {"type": "video"}, "placement": {}},
+])
+def test_parse_rejects_malformed(payload):
+    with pytest.raises(ValueError):
+        parse_watermark_payload(payload)
+
+
+# ----------------------
+# Tile cache
+# ----------------------
+def test_text_tile_is_keyed_on_font():
+    pytest.importorskip("reportlab")
+    from backend.utils.watermark_utils import get_tile
+
+    helvetica = TextWatermark(text="key-on-font", font="Helvetica")
+    dejavu = TextWatermark(text="key-on-font", font="DejaVuSans.ttf")
+
+    assert get_tile(helvetica, None, 0.5) is get_tile(helvetica, None, 0.5)
+    assert get_tile(helvetica, None, 0.5) is not get_tile(dejavu, None, 0.5)
+
+
+# ----------------------
+# Stamping
+# ----------------------
+def _fill_alphas(pdf) -> set[float]:
+    """
+    Every /ca (fill alpha) in the graphics states reachable from the pages.
+    """
+    import pikepdf
+
+    alphas, seen, stack = set(), set(), [page.obj for page in pdf.pages]
+    while stack:
+        obj = stack.pop()
+        if not isinstance(obj, pikepdf.Object):
+            continue
+        if obj.is_indirect:
+            if obj.objgen in seen:
+                continue
+            seen.add(obj.objgen)
+        if isinstance(obj, pikepdf.Stream):
+            stack.append(obj.stream_dict)
+        elif isinstance(obj, pikepdf.Dictionary):
+            if "/ca" in obj:
+                alphas.add(round(float(obj.ca), 3))
+            stack.extend(v for k, v in obj.items() if k != "/Parent")
+        elif isinstance(obj, pikepdf.Array):
+            stack.extend(obj)
+    return alphas
+
+
+@pytest.mark.parametrize("opacity", [0.1, 0.35])
+def test_text_watermark_uses_requested_opacity(tmp_path, opacity):
+    pikepdf = pytest.importorskip("pikepdf")
+    from backend.services.pdf_watermark import add_watermark_to_pdf
+
+    src = tmp_path / "in.pdf"
+    with pikepdf.new() as pdf:
+        pdf.add_blank_page(page_size=(612, 792))
+        pdf.add_blank_page(page_size=(612, 792))
+        pdf.save(src)
+
+    out = tmp_path / "out.pdf"
+    watermark = TextWatermark(text="CONFIDENTIAL", opacity=opacity)
+    add_watermark_to_pdf(str(src), str(out), watermark, GridOptions())
+
+    with pikepdf.open(out) as pdf:
+        assert _fill_alphas(pdf) == {opacity}
+        # Both pages reference one shared stamp
+        stamps = {
+            xobj.objgen
+            for page in pdf.pages
+            for xobj in page.resources.XObject.values()
+        }
+        assert len(stamps) == 1
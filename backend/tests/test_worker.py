@@ -0,0 +1,97 @@
+# backend/tests/test_worker.py
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from backend import worker
+from backend.core.job_backends import QueueMessage
+from backend.core.jobs import STATUS_DONE, STATUS_FAILED, STATUS_PROCESSING
+
+
+class FakeQueue:
+    def __init__(self):
+        self.deleted = []
+
+    def extend(self, message, seconds):
+        pass
+
+    def delete(self, message):
+        self.deleted.append(message)
+
+
+class FakeStore:
+    def __init__(self, fail_get=False):
+        self.fail_get = fail_get
+        self.put_keys = []
+
+    def get(self, key, local_path):
+        if self.fail_get:
+            raise ConnectionError("store unavailable")
+        with open(local_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        return local_path
+
+    def put(self, local_path, key):
+        self.put_keys.append(key)
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(worker, "_set_status", lambda job_id, status, **kw: recorded.append(status))
+    return recorded
+
+
+def _message():
+    return QueueMessage({"job_id": "j1", "operation": "pdf-rotate", "input_keys": ["in/j1/a.pdf"]}, "r1")
+
+
+def _convert_ok(operation, inputs, out_dir, name, params):
+    return inputs[0], "rotated.pdf"
+
+
+def test_finished_job_is_recorded_and_deleted(monkeypatch, statuses):
+    monkeypatch.setattr(worker, "run_cached_operation", _convert_ok)
+    queue, store, message = FakeQueue(), FakeStore(), _message()
+
+    worker.handle_message(queue, store, message)
+
+    assert statuses == [STATUS_PROCESSING, STATUS_DONE]
+    assert queue.deleted == [message]
+    assert len(store.put_keys) == 1
+
+
+def test_conversion_error_is_recorded_and_deleted(monkeypatch, statuses):
+    def convert_fails(*args):
+        raise ValueError("not a PDF")
+
+    monkeypatch.setattr(worker, "run_cached_operation", convert_fails)
+    queue, message = FakeQueue(), _message()
+
+    worker.handle_message(queue, FakeStore(), message)
+
+    assert statuses == [STATUS_PROCESSING, STATUS_FAILED]
+    assert queue.deleted == [message]
+
+
+def test_store_error_leaves_the_message_for_retry(monkeypatch, statuses):
+    monkeypatch.setattr(worker, "run_cached_operation", _convert_ok)
+    queue = FakeQueue()
+
+    worker.handle_message(queue, FakeStore(fail_get=True), _message())
+
+    assert statuses == [STATUS_PROCESSING]
+    assert queue.deleted == []
+
+
+def test_database_error_does_not_escape(monkeypatch):
+    def db_down(*args, **kwargs):
+        raise OSError("database unavailable")
+
+    monkeypatch.setattr(worker, "_set_status", db_down)
+    queue = FakeQueue()
+
+    worker.handle_message(queue, FakeStore(), _message())
+
+    assert queue.deleted == []
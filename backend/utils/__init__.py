@@ -1,5 +1,18 @@
 # backend/utils/__init__.py
 
-from .ocr_utils import CFL
-from .pdf_utils import extract_format_text
-from .file_utils import encode_file_to_base64
+# Re-exports are resolved on first access so importing a light submodule
+# (e.g. backend.utils.file_utils) doesn't pull in the OCR and PDF stacks.
+_EXPORTS = {
+    "CFL": ".ocr_utils",
+    "extract_format_text": ".pdf_utils",
+    "encode_file_to_base64": ".file_utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(_EXPORTS[name], __name__), name)
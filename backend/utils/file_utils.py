@@ -1,6 +1,7 @@
 # backend\utils\file_utils.py
 
 import base64
+import zipfile
 from pathlib import Path
 
 def encode_file_to_base64(file_path: str) -> str:
@@ -14,3 +15,48 @@ def encode_file_to_base64(file_path: str) -> str:
     with open(file_path, "rb") as f:
         encoded_bytes = base64.b64encode(f.read())
     return encoded_bytes.decode("utf-8")  # Ensure string, not bytes
+
+def file_result(file_path: str, filename: str, encode: bool = True) -> dict:
+    """
+    Build the standard service result for a single output file.
+    With encode=False the output path is returned under "path" instead of
+    base64 content, so the caller decides how to deliver it.
+    """
+    result = {"success": True, "filename": filename}
+    if encode:
+        result["file"] = encode_file_to_base64(file_path)
+    else:
+        result["path"] = str(file_path)
+    return result
+
+class _ZipSink:
+    """
+    Write-only buffer for ZipFile on an unseekable stream; drained after each entry.
+    """
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def iter_zip(entries):
+    """
+    Stream a ZIP archive from an iterable of (name, bytes) entries.
+    Yields archive bytes as each entry is added, so memory stays at one entry.
+    Entries are stored uncompressed (PDF pages are already compressed).
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+            yield sink.drain()
+    yield sink.drain()
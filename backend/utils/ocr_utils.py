@@ -3,14 +3,76 @@
 
 # backend/utils/ocr_utils.py
 
+import os
+
+# Each tesseract call runs single-threaded; parallelism comes from the OCR pool.
+# Must be set before tesseract (or tesserocr) starts.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+import numpy as np
 import pytesseract
 from pytesseract import Output
 from PIL import Image
 
+from backend.core.config import OCR_WORKERS, TESSERACT_CMD
+
+pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+try:
+    # Optional: in-process Tesseract API (no subprocess / temp PNG per call)
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_engines = threading.local()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max(OCR_WORKERS, 1), thread_name_prefix="ocr")
+        return _pool
+
+
+def _engine():
+    """
+    Persistent per-thread tesserocr engine, or None when tesserocr is unavailable.
+    """
+    if tesserocr is None:
+        return None
+    api = getattr(_engines, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI()
+        _engines.api = api
+    return api
+
+
+def _as_pil(image) -> Image.Image:
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return image
+
+
 def ocr_image(image: Image.Image) -> str:
     """
     Extracts text from an image using Tesseract OCR.
+    Accepts PIL images or numpy arrays (e.g. OpenCV-preprocessed images).
     """
+    api = _engine()
+    if api is not None:
+        api.SetImage(_as_pil(image))
+        return api.GetUTF8Text()
     return pytesseract.image_to_string(image)
 
 def ocr_image_with_data(image: Image.Image):
@@ -19,9 +81,38 @@ def ocr_image_with_data(image: Image.Image):
     """
     return pytesseract.image_to_data(image, output_type=Output.DICT)
 
+def imap_ocr(fn: Callable[[T], R], items: Iterable[T], workers: int | None = None) -> Iterator[R]:
+    """
+    Apply an OCR-bound function to items on the shared OCR pool.
+    Items are consumed lazily with at most `workers` in flight, and results
+    are yielded in input order.
+    """
+    workers = max(workers or OCR_WORKERS, 1)
+    pool = _get_pool()
+    in_flight = deque()
+
+    for item in items:
+        in_flight.append(pool.submit(fn, item))
+        if len(in_flight) >= workers:
+            yield in_flight.popleft().result()
+
+    while in_flight:
+        yield in_flight.popleft().result()
+
+def iter_ocr(images: Iterable[Image.Image], workers: int | None = None) -> Iterator[str]:
+    """
+    OCR a stream of page images, N pages in flight, text yielded in page order.
+    """
+    return imap_ocr(ocr_image, images, workers)
+
+def ocr_images(images: Iterable[Image.Image], workers: int | None = None) -> List[str]:
+    """
+    OCR a batch of page images and return their text in order.
+    """
+    return list(iter_ocr(images, workers))
+
 def CFL(s: str) -> str:
     """
     Custom function to manipulate strings (example: strip and convert to uppercase).
     """
     return s.strip().upper()
-
@@ -1,9 +1,14 @@
 # backend/utils/pdf_utils.py
 
 import fitz
-from pdf2image import convert_from_path
+import hashlib
+import os
+import shutil
+import pikepdf
+from contextlib import contextmanager
+from pdf2image import convert_from_path, pdfinfo_from_path
 from backend.core.config import POPPLER_PATH
-from typing import List
+from typing import Iterator
 from PIL import Image
 from io import BytesIO
 import pypdf
@@ -11,43 +16,307 @@ from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
 
-def is_scanned_pdf(pdf_path: str, min_chars: int = 20, max_pages: int = 3) -> bool:
+class DocumentSession:
     """
-    Determines if the PDF is a scanned document by checking for text content.
+    One PDF shared by every step of a conversion. Each library's handle
+    (PyMuPDF, PyPDF2, pdfplumber) is opened on first use and kept for the
+    rest of the request, so the file is parsed at most once per library.
+    Use as a context manager, or call close().
     """
-    doc = fitz.open(pdf_path)
-    text_len = 0
 
-    try:
-        for i, page in enumerate(doc):
-            if i >= max_pages:
-                break
-            text_len += len(page.get_text().strip())
+    def __init__(self, pdf_path: str):
+        self.path = str(pdf_path)
+        self._fitz_doc = None
+        self._reader = None
+        self._plumber = None
+        self._page_text: dict[int, str] = {}
+
+    # ---------- handles ----------
+    @property
+    def fitz_doc(self) -> fitz.Document:
+        if self._fitz_doc is None:
+            self._fitz_doc = fitz.open(self.path)
+        return self._fitz_doc
+
+    @property
+    def reader(self):
+        """
+        PyPDF2 reader (page objects that can be copied into a PdfWriter).
+        """
+        if self._reader is None:
+            from PyPDF2 import PdfReader
+            self._reader = PdfReader(self.path)
+        return self._reader
+
+    @property
+    def plumber(self):
+        if self._plumber is None:
+            import pdfplumber
+            self._plumber = pdfplumber.open(self.path)
+        return self._plumber
+
+    # ---------- page info ----------
+    @property
+    def page_count(self) -> int:
+        return self.fitz_doc.page_count
+
+    def page_text(self, index: int) -> str:
+        """
+        Stripped text of a page (0-indexed), extracted once.
+        """
+        if index not in self._page_text:
+            self._page_text[index] = self.fitz_doc[index].get_text().strip()
+        return self._page_text[index]
+
+    def has_text(self, index: int) -> bool:
+        return bool(self.page_text(index))
+
+    def images(self, index: int) -> list:
+        """
+        Image xrefs on a page (0-indexed), as returned by PyMuPDF's get_images.
+        """
+        return self.fitz_doc[index].get_images(full=True)
+
+    def is_scanned(self, min_chars: int = 20, max_pages: int = 3) -> bool:
+        """
+        True when the first pages carry (almost) no text layer.
+        """
+        text_len = 0
+        for i in range(min(max_pages, self.page_count)):
+            text_len += len(self.page_text(i))
             if text_len >= min_chars:
                 return False
         return True
-    finally:
-        doc.close()
 
+    def render(self, **options) -> Iterator[Image.Image]:
+        """
+        Lazily render pages from the already-open document (see render_pdf_images).
+        """
+        return render_pdf_images(self, **options)
 
-def render_pdf_images(
-    pdf_path: str,
-    dpi: int = 300,
-    first_page: int | None = None,
-    last_page: int | None = None,
-) -> List[Image.Image]:
+    # ---------- lifecycle ----------
+    def close(self):
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_scanned_pdf(pdf_path, min_chars: int = 20, max_pages: int = 3) -> bool:
     """
-    Converts PDF to images using the pdf2image library.
+    Determines if the PDF is a scanned document by checking for text content.
+    Accepts a path or an open DocumentSession.
     """
+    if isinstance(pdf_path, DocumentSession):
+        return pdf_path.is_scanned(min_chars, max_pages)
+    with DocumentSession(pdf_path) as session:
+        return session.is_scanned(min_chars, max_pages)
+
+
+# PIL mode for each supported output colorspace
+COLORSPACES = {
+    "rgb": (fitz.csRGB, "RGB"),
+    "gray": (fitz.csGRAY, "L"),
+}
+
+
+def _render_with_poppler(pdf_path: str, page: int, dpi: int, colorspace: str) -> Image.Image:
     return convert_from_path(
         pdf_path,
         poppler_path=POPPLER_PATH,
         dpi=dpi,
         fmt="png",
         use_pdftocairo=True,
-        first_page=first_page,
-        last_page=last_page,
-    )
+        first_page=page,
+        last_page=page,
+        grayscale=colorspace == "gray",
+    )[0]
+
+
+def render_pdf_images(
+    pdf_path,
+    dpi: int = 300,
+    first_page: int | None = None,
+    last_page: int | None = None,
+    grayscale: bool = False,
+    colorspace: str = "rgb",
+) -> Iterator[Image.Image]:
+    """
+    Renders PDF pages to images, yielding one page at a time so only the
+    current bitmap is held in memory. Pages are rendered in-process with
+    PyMuPDF; any page it cannot render falls back to poppler (pdf2image).
+    `pdf_path` may be a DocumentSession to reuse its open document.
+
+    Args:
+        dpi: Render resolution.
+        first_page / last_page: 1-indexed inclusive page range (defaults to all pages).
+        grayscale: Shortcut for colorspace="gray" (what OCR consumers want).
+        colorspace: "rgb" or "gray".
+    """
+    colorspace = "gray" if grayscale else colorspace
+    if colorspace not in COLORSPACES:
+        raise ValueError(f"Unsupported colorspace: {colorspace}")
+    fitz_cs, mode = COLORSPACES[colorspace]
+
+    session = pdf_path if isinstance(pdf_path, DocumentSession) else None
+    pdf_path = session.path if session else str(pdf_path)
+    try:
+        doc = session.fitz_doc if session else fitz.open(pdf_path)
+    except Exception:
+        doc = None
+
+    try:
+        if doc is not None:
+            total = doc.page_count
+        else:
+            total = pdfinfo_from_path(pdf_path, poppler_path=POPPLER_PATH)["Pages"]
+        first = max(first_page or 1, 1)
+        last = min(last_page or total, total)
+
+        for page in range(first, last + 1):
+            try:
+                pix = doc[page - 1].get_pixmap(dpi=dpi, colorspace=fitz_cs, alpha=False)
+                img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+                del pix
+            except Exception:
+                img = _render_with_poppler(pdf_path, page, dpi, colorspace)
+            yield img
+    finally:
+        # A session's document stays open for the session's other steps
+        if doc is not None and session is None:
+            doc.close()
+
+
+def save_document(doc: fitz.Document, output_path: str, incremental: bool = True, **options) -> bool:
+    """
+    Save an open document to `output_path`.
+
+    With incremental=True only the changed objects and a new xref section are
+    appended, to the file the document was opened from (which must be
+    `output_path`). A full save over the document's own file goes through a
+    temporary file and closes the document; `options` are passed to full saves.
+    Returns whether the document was closed.
+    """
+    output_path = str(output_path)
+    if incremental:
+        doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        return False
+    if os.path.abspath(doc.name) == os.path.abspath(output_path):
+        tmp_path = output_path + ".tmp"
+        doc.save(tmp_path, **options)
+        doc.close()
+        os.replace(tmp_path, output_path)
+        return True
+    doc.save(output_path, **options)
+    return False
+
+
+@contextmanager
+def open_for_update(input_path: str, output_path: str, incremental: bool = True) -> Iterator[fitz.Document]:
+    """
+    Open `input_path` for modification; the result is saved to `output_path`
+    (see save_document) when the block exits without error.
+
+    With incremental=True the original bytes are copied to `output_path`
+    (a plain file copy, no parsing) and only the changed objects and a new
+    xref section are appended, instead of re-serializing the whole document.
+    Pass the same path for both to append in place without the copy. Files
+    PyMuPDF can't append to (e.g. repaired on open) fall back to a full save.
+    """
+    input_path, output_path = str(input_path), str(output_path)
+    in_place = os.path.abspath(input_path) == os.path.abspath(output_path)
+
+    doc = None
+    if incremental:
+        if not in_place:
+            shutil.copyfile(input_path, output_path)
+        doc = fitz.open(output_path)
+        if not doc.can_save_incrementally():
+            doc.close()
+            doc = None
+            incremental = False
+    if doc is None:
+        doc = fitz.open(input_path)
+
+    try:
+        yield doc
+        save_document(doc, output_path, incremental)
+    finally:
+        if not doc.is_closed:
+            doc.close()
+
+
+# ---------- pikepdf object helpers ----------
+def content_digest(obj, memo: dict) -> bytes:
+    """
+    Content hash of a PDF object tree, following indirect references.
+    Identical resources from different files (or chunks) hash the same.
+    `memo` caches digests by objgen and must only be shared within one Pdf.
+    """
+    objgen = obj.objgen if isinstance(obj, pikepdf.Object) else (0, 0)
+    if objgen != (0, 0):
+        if objgen in memo:
+            return memo[objgen]
+        memo[objgen] = repr(objgen).encode()  # cycle guard
+
+    h = hashlib.sha256()
+    if isinstance(obj, pikepdf.Stream):
+        h.update(b"S")
+        for key in sorted(obj.keys()):
+            h.update(key.encode() + content_digest(obj[key], memo))
+        h.update(obj.read_raw_bytes())
+    elif isinstance(obj, pikepdf.Dictionary):
+        h.update(b"D")
+        for key in sorted(obj.keys()):
+            h.update(key.encode() + content_digest(obj[key], memo))
+    elif isinstance(obj, pikepdf.Array):
+        h.update(b"A")
+        for item in obj:
+            h.update(content_digest(item, memo))
+    else:
+        h.update(repr(obj).encode())
+
+    digest = h.digest()
+    if objgen != (0, 0):
+        memo[objgen] = digest
+    return digest
+
+
+def dedupe_resources(pages, memo: dict | None = None, canonical: dict | None = None):
+    """
+    Point every page at one copy of each identical font / XObject.
+    Unreferenced duplicates are dropped when the file is saved.
+    Pass the same `memo` and `canonical` dicts to dedupe pages added to a
+    Pdf over several calls.
+    """
+    memo = {} if memo is None else memo
+    canonical = {} if canonical is None else canonical
+    for page in pages:
+        resources = page.obj.get("/Resources")
+        if resources is None:
+            continue
+        for category in ("/Font", "/XObject"):
+            entries = resources.get(category)
+            if entries is None:
+                continue
+            for name in list(entries.keys()):
+                obj = entries[name]
+                if not obj.is_indirect:
+                    continue
+                key = (category, content_digest(obj, memo))
+                if key not in canonical:
+                    canonical[key] = obj
+                elif canonical[key].objgen != obj.objgen:
+                    entries[name] = canonical[key]
 
 
 def extract_format_text(pdf_path: str) -> str:
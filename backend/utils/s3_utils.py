@@ -15,3 +15,6 @@ def download_file(s3_key: str) -> str:
     s3.download_fileobj(JOBS__FILES_S3_BUCKET, s3_key, tmp)
     return tmp.name
 
+def download_file_to(s3_key: str, local_path: str) -> str:
+    s3.download_file(JOBS__FILES_S3_BUCKET, s3_key, local_path)
+    return local_path
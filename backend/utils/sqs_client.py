@@ -19,3 +19,31 @@ def send_job(job: dict, delay_seconds: int = 0):
         MessageBody=json.dumps(job),
         DelaySeconds=delay_seconds
     )
+
+def receive_jobs(wait_seconds: int = 20, visibility_timeout: int = 300, max_messages: int = 1) -> list[dict]:
+    """
+    Long-poll the queue for jobs.
+
+    Returns:
+        list[dict]: Raw SQS messages (with "Body" and "ReceiptHandle").
+    """
+    response = sqs.receive_message(
+        QueueUrl=SQS_QUEUE_URL,
+        MaxNumberOfMessages=max_messages,
+        WaitTimeSeconds=wait_seconds,
+        VisibilityTimeout=visibility_timeout,
+    )
+    return response.get("Messages", [])
+
+def extend_visibility(receipt_handle: str, seconds: int):
+    """
+    Keep a job hidden from other workers while it is still running.
+    """
+    sqs.change_message_visibility(
+        QueueUrl=SQS_QUEUE_URL,
+        ReceiptHandle=receipt_handle,
+        VisibilityTimeout=seconds,
+    )
+
+def delete_job(receipt_handle: str):
+    sqs.delete_message(QueueUrl=SQS_QUEUE_URL, ReceiptHandle=receipt_handle)
@@ -6,8 +6,16 @@ from reportlab.lib.utils import ImageReader
 from PIL import Image, ImageDraw, ImageFont
 import io
 from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
 import warnings
 import os
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from backend.core.config import WATERMARK_TILE_CACHE_SIZE
 
 from backend.schemas.pdf_watermark import (
     GridOptions,
@@ -17,6 +25,193 @@ from backend.schemas.pdf_watermark import (
 )
 
 
+# ----------------------
+# Tile cache
+# ----------------------
+# A tile is one rasterized watermark (text or image, with opacity applied).
+# It depends only on what ends up in the pixels; rotation and scaling are
+# applied by the canvas, so one tile serves every cell, page size and request.
+
+@dataclass(frozen=True)
+class Tile:
+    image: ImageReader
+    width: int
+    height: int
+
+
+class _TileCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._tiles: OrderedDict[tuple, Tile] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: tuple, build) -> Tile:
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                self.hits += 1
+                return tile
+            self.misses += 1
+
+        tile = build()
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_entries:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._tiles), "hits": self.hits, "misses": self.misses}
+
+
+tile_cache = _TileCache(WATERMARK_TILE_CACHE_SIZE)
+
+
+def _to_reader(img: Image.Image) -> ImageReader:
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format="PNG")
+    img_byte_arr.seek(0)
+    return ImageReader(img_byte_arr)
+
+
+@lru_cache(maxsize=32)
+def _load_font(font_name: str, font_size: int):
+    # Attempt to load font, fallback if not found
+    try:
+        if os.path.isfile(font_name):
+            return ImageFont.truetype(font_name, font_size)
+        try:
+            # A font name Pillow can find in the system font directories
+            return ImageFont.truetype(font_name, font_size)
+        except OSError:
+            pass
+        # Try system fonts
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
+    except OSError:
+        warnings.warn(f"Cannot open font '{font_name}', using default PIL font.")
+        return ImageFont.load_default()
+
+
+def _text_rgb(text_color) -> tuple[int, int, int]:
+    # Convert color to RGB tuple
+    try:
+        if isinstance(text_color, str):
+            c = colors.toColor(text_color)
+            r, g, b = int(c.red * 255), int(c.green * 255), int(c.blue * 255)
+        else:
+            r, g, b = int(text_color.red * 255), int(text_color.green * 255), int(text_color.blue * 255)
+    except Exception:
+        r, g, b = 0, 0, 0
+
+    # Darken default color if it's black or None
+    if text_color in (None, "black"):
+        factor = 0.15  # 0 = black, 1 = original
+        r = int(r * factor)
+        g = int(g * factor)
+        b = int(b * factor)
+    return r, g, b
+
+
+def _build_text_tile(text: str, font_name: str, font_size: int, text_color, opacity: float) -> Tile:
+    # Render text as an RGBA image to support opacity
+    font = _load_font(font_name, font_size)
+    r, g, b = _text_rgb(text_color)
+
+    # Get bounding box
+    x0, y0, x1, y1 = font.getbbox(text)  # returns (x0, y0, x1, y1)
+    text_width = x1 - x0
+    text_height = y1 - y0
+
+    # Create image with full text including baseline offset
+    img = Image.new("RGBA", (text_width, text_height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    # Ensure minimum alpha for visibility
+    alpha = int(255 * max(opacity, 0.8))
+    draw.text((-x0, -y0), text, font=font, fill=(r, g, b, alpha))
+
+    return Tile(_to_reader(img), text_width, text_height)
+
+
+@dataclass(frozen=True)
+class VectorText:
+    """
+    Text drawn as PDF text operators rather than a bitmap (stays sharp,
+    adds a few bytes instead of an image).
+    """
+    text: str
+    font: str
+    font_size: float
+    rgb: tuple[float, float, float]
+    width: float
+    height: float
+    ascent: float
+    descent: float
+
+
+def _vector_text(watermark: TextWatermark) -> VectorText:
+    font = getattr(watermark, "font", "Helvetica")
+    try:
+        pdfmetrics.getFont(font)
+    except KeyError:
+        warnings.warn(f"Unknown PDF font '{font}', using Helvetica.")
+        font = "Helvetica"
+    font_size = getattr(watermark, "font_size", 20)
+    ascent, descent = pdfmetrics.getAscentDescent(font, font_size)
+    r, g, b = _text_rgb(getattr(watermark, "color", "black"))
+    return VectorText(
+        text=watermark.text,
+        font=font,
+        font_size=font_size,
+        rgb=(r / 255, g / 255, b / 255),
+        width=pdfmetrics.stringWidth(watermark.text, font, font_size),
+        height=ascent - descent,
+        ascent=ascent,
+        descent=descent,
+    )
+
+
+def _build_image_tile(image: str, opacity: float) -> Tile:
+    # Open image and apply opacity
+    pil_img = Image.open(image).convert("RGBA")
+    alpha = pil_img.split()[3].point(lambda p: int(p * opacity))
+    pil_img.putalpha(alpha)
+    return Tile(_to_reader(pil_img), *pil_img.size)
+
+
+def _image_digest(image: str) -> str:
+    hasher = hashlib.sha256()
+    with open(image, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_tile(watermark: Union[TextWatermark, ImageWatermark], image: str | None, opacity: float) -> Tile | None:
+    """
+    The rasterized tile for a watermark, built once and reused across cells,
+    pages and requests. Image tiles are keyed by content, not path.
+    """
+    if watermark.type == "text":
+        font_name = watermark.font
+        font_size = getattr(watermark, "font_size", 20)
+        text_color = getattr(watermark, "color", "black")
+        key = ("text", watermark.text, font_name, font_size, text_color, opacity)
+        return tile_cache.get_or_create(
+            key, lambda: _build_text_tile(watermark.text, font_name, font_size, text_color, opacity)
+        )
+
+    if watermark.type == "image" and image:
+        key = ("image", _image_digest(image), opacity)
+        return tile_cache.get_or_create(key, lambda: _build_image_tile(image, opacity))
+
+    return None
+
+
 def draw_watermarks(
     canvas: Canvas,
     width: float,
@@ -25,11 +220,20 @@ def draw_watermarks(
     placement: Union[GridOptions, InsertOptions],
     image: str | None,
     opacity: float = 0.4,
+    vector: bool = False,
 ):
     """
     Draw watermarks on the canvas with optional opacity.
     opacity: 0.0 (transparent) to 1.0 (fully visible)
+    vector: draw text watermarks as PDF text instead of a rasterized tile
     """
+    if vector and watermark.type == "text":
+        tile = _vector_text(watermark)
+    else:
+        tile = get_tile(watermark, image, opacity)
+    if tile is None:
+        return
+
     if isinstance(placement, InsertOptions):
         x = placement.x * width
         y = placement.y * height
@@ -39,11 +243,10 @@ def draw_watermarks(
             x=x,
             y=y,
             watermark=watermark,
-            image=image,
+            tile=tile,
             rotate=False,
             cell_width=width,
             cell_height=height,
-            opacity=opacity,
         )
         return
 
@@ -64,11 +267,10 @@ def draw_watermarks(
                     x=x,
                     y=y,
                     watermark=watermark,
-                    image=image,
+                    tile=tile,
                     rotate=(placement.tile_type == "diagonal"),
                     cell_width=step_x,
                     cell_height=step_y,
-                    opacity=opacity,
                 )
 
 
@@ -77,11 +279,10 @@ def _draw_single(
     x: float,
     y: float,
     watermark: Union[TextWatermark, ImageWatermark],
-    image: str | None,
+    tile: Union[Tile, VectorText],
     rotate: bool,
     cell_width: float,
     cell_height: float,
-    opacity: float = 0.4,
 ):
     canvas.saveState()
     canvas.translate(x, y)
@@ -89,91 +290,30 @@ def _draw_single(
     if rotate:
         canvas.rotate(getattr(watermark, "angle", 0))
 
+    # Scale to cell if needed
+    max_w = cell_width * 0.8
+    max_h = cell_height * 0.8
+    scale_w = max_w / tile.width
+    scale_h = max_h / tile.height
     if watermark.type == "text":
-        # Render text as an RGBA image to support opacity
-        font_name = getattr(watermark, "font_name", "arial.ttf")
-        font_size = getattr(watermark, "font_size", 20)
-        text_color = getattr(watermark, "color", "black")
-
-        # Convert color to RGB tuple
-        try:
-            if isinstance(text_color, str):
-                c = colors.toColor(text_color)
-                r, g, b = int(c.red * 255), int(c.green * 255), int(c.blue * 255)
-            else:
-                r, g, b = int(text_color.red * 255), int(text_color.green * 255), int(text_color.blue * 255)
-        except Exception:
-            r, g, b = 0, 0, 0
-
-        # Darken default color if it's black or None
-        if text_color in (None, "black"):
-            factor = 0.15  # 0 = black, 1 = original
-            r = int(r * factor)
-            g = int(g * factor)
-            b = int(b * factor)
-
-        # Attempt to load font, fallback if not found
-        try:
-            if os.path.isfile(font_name):
-                font = ImageFont.truetype(font_name, font_size)
-            else:
-                # Try system fonts
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
-        except OSError:
-            warnings.warn(f"Cannot open font '{font_name}', using default PIL font.")
-            font = ImageFont.load_default()
-
-        # Get bounding box
-        bbox = font.getbbox(watermark.text)  # returns (x0, y0, x1, y1)
-        x0, y0, x1, y1 = bbox
-        text_width = x1 - x0
-        text_height = y1 - y0
-
-        # Create image with full text including baseline offset
-        img = Image.new("RGBA", (text_width, text_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        # Ensure minimum alpha for visibility
-        alpha = int(255 * max(opacity, 0.8))
-        draw.text((-x0, -y0), watermark.text, font=font, fill=(r, g, b, alpha))
-
-        # Convert to ReportLab Image
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format="PNG")
-        img_byte_arr.seek(0)
-        rl_img = ImageReader(img_byte_arr)
-
-        # Scale to cell if needed
-        max_w = cell_width * 0.8
-        max_h = cell_height * 0.8
-        scale_w = max_w / text_width
-        scale_h = max_h / text_height
         scale = min(scale_w, scale_h, 1.0)
-        draw_w = text_width * scale
-        draw_h = text_height * scale
-
-        # Draw centered
-        canvas.drawImage(rl_img, -draw_w / 2, -draw_h / 2, width=draw_w, height=draw_h, mask="auto")
-
-    elif watermark.type == "image" and image:
-        # Open image and apply opacity
-        pil_img = Image.open(image).convert("RGBA")
-        alpha = pil_img.split()[3].point(lambda p: int(p * opacity))
-        pil_img.putalpha(alpha)
-
-        img_byte_arr = io.BytesIO()
-        pil_img.save(img_byte_arr, format="PNG")
-        img_byte_arr.seek(0)
-        rl_img = ImageReader(img_byte_arr)
-
-        iw, ih = pil_img.size
-        max_iw = cell_width * 0.8
-        max_ih = cell_height * 0.8
-        scale_w = max_iw / iw
-        scale_h = max_ih / ih
+    else:
         scale = min(scale_w, scale_h, getattr(watermark, "image_scale", 1.0))
-        iw *= scale
-        ih *= scale
 
-        canvas.drawImage(rl_img, -iw / 2, -ih / 2, width=iw, height=ih, mask="auto")
+    if isinstance(tile, VectorText):
+        canvas.scale(scale, scale)
+        canvas.setFont(tile.font, tile.font_size)
+        # No alpha here: the fill alpha (watermark.opacity) set on the canvas applies
+        canvas.setFillColorRGB(*tile.rgb)
+        # Center vertically on the glyph box, not the baseline
+        canvas.drawCentredString(0, -(tile.ascent + tile.descent) / 2, tile.text)
+        canvas.restoreState()
+        return
+
+    draw_w = tile.width * scale
+    draw_h = tile.height * scale
+
+    # Draw centered (the same ImageReader is embedded once per document)
+    canvas.drawImage(tile.image, -draw_w / 2, -draw_h / 2, width=draw_w, height=draw_h, mask="auto")
 
     canvas.restoreState()
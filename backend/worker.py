@@ -0,0 +1,131 @@
+# backend/worker.py
+#
+# Async job consumer. Run with:
+#     python -m backend.worker
+
+import logging
+import signal
+import tempfile
+import threading
+from pathlib import Path
+
+from backend.core.cache import run_cached_operation
+from backend.core.config import JOB_POLL_SECONDS, JOB_VISIBILITY_TIMEOUT
+from backend.core.job_backends import get_queue, get_store
+from backend.core.model_registry import preload_models
+from backend.core.jobs import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_PROCESSING,
+    output_key,
+)
+from backend.db import SessionLocal, init_db
+from backend.db.jobs import update_job
+
+logger = logging.getLogger("backend.worker")
+
+_stop = threading.Event()
+
+
+def _set_status(job_id: str, status: str, output_s3_key: str | None = None, error: str | None = None):
+    db = SessionLocal()
+    try:
+        update_job(db, job_id, status, output_s3_key=output_s3_key, error=error)
+    finally:
+        db.close()
+
+
+def _heartbeat(queue, message, done: threading.Event):
+    """
+    Extend the message's visibility while the job is running so no other
+    worker picks it up.
+    """
+    interval = max(JOB_VISIBILITY_TIMEOUT // 2, 1)
+    while not done.wait(interval):
+        try:
+            queue.extend(message, JOB_VISIBILITY_TIMEOUT)
+        except Exception:
+            logger.exception("Failed to extend visibility")
+
+
+def handle_message(queue, store, message):
+    job = message.body
+    job_id = job["job_id"]
+    logger.info("Processing job %s (%s)", job_id, job["operation"])
+
+    done = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(queue, message, done), daemon=True)
+    heartbeat.start()
+
+    try:
+        _set_status(job_id, STATUS_PROCESSING)
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = []
+            for key in job["input_keys"]:
+                local = str(Path(tmp) / Path(key).name)
+                store.get(key, local)
+                inputs.append(local)
+
+            try:
+                out_path, filename = run_cached_operation(
+                    job["operation"],
+                    inputs,
+                    str(Path(tmp) / "out"),
+                    job.get("filename") or Path(inputs[0]).name,
+                    job.get("params") or {},
+                )
+            except Exception as e:
+                # Conversion errors are deterministic; record and drop instead of retrying
+                logger.exception("Job %s failed", job_id)
+                _set_status(job_id, STATUS_FAILED, error=str(e))
+            else:
+                key = output_key(job_id, filename)
+                store.put(out_path, key)
+                _set_status(job_id, STATUS_DONE, output_s3_key=key)
+                logger.info("Job %s done", job_id)
+    except Exception:
+        # Store, queue or database trouble: keep the message so the job is
+        # retried once its visibility timeout runs out
+        logger.exception("Job %s interrupted; leaving it on the queue", job_id)
+        return
+    finally:
+        done.set()
+        heartbeat.join()
+
+    queue.delete(message)
+
+
+def run():
+    init_db()
+    queue = get_queue()
+    store = get_store()
+    preload_models()
+
+    logger.info("Worker started, polling for jobs")
+    while not _stop.is_set():
+        try:
+            messages = queue.receive(JOB_POLL_SECONDS, JOB_VISIBILITY_TIMEOUT)
+        except Exception:
+            logger.exception("Failed to receive jobs")
+            _stop.wait(5)
+            continue
+
+        for message in messages:
+            try:
+                handle_message(queue, store, message)
+            except Exception:
+                logger.exception("Failed to finish job message")
+
+    logger.info("Worker stopped")
+
+
+def _shutdown(signum, frame):
+    # Finish the current job, then exit
+    _stop.set()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    run()
@@ -221,10 +221,10 @@ export async function pdfEdit(file: File, updates: any[]): Promise<ConvertedFile
   if (!res.ok) throw new Error('Failed to update PDF');
 
   const data = await res.json();
-  const blob = await fetch(data.file_path).then(r => r.blob());
+  const blob = base64ToBlob(data.file, data.filename);
 
   return {
-    name: 'pdf-edit.pdf',
+    name: data.filename || 'pdf-edit.pdf',
     url: URL.createObjectURL(blob),
     blob,
   };